@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+from util.capital_budgeting import efficient_frontier, select_projects
+
+N_PROJECTS = 1000
+
+
+@pytest.fixture
+def portfolio():
+    rng = np.random.default_rng(0)
+    npv = rng.normal(50.0, 40.0, N_PROJECTS)
+    cost = rng.integers(10, 500, N_PROJECTS) * 1000.0
+    # Every four of the first 400 projects are alternatives to each other
+    groups = [f"site {i // 4}" if i < 400 else None for i in range(N_PROJECTS)]
+    return npv, cost, groups
+
+
+@pytest.mark.parametrize("method", ["dp", "milp"])
+def bench_select_projects(benchmark, portfolio, method):
+    npv, cost, groups = portfolio
+    benchmark(select_projects, npv, cost, 2e7, groups, method=method)
+
+
+def bench_select_projects_with_dependencies(benchmark, portfolio):
+    npv, cost, groups = portfolio
+    requires = {i: [i + 1] for i in range(400, 600, 2)}
+    benchmark(select_projects, npv, cost, 2e7, groups, requires)
+
+
+def bench_efficient_frontier(benchmark, portfolio):
+    npv, cost, groups = portfolio
+    budgets = np.arange(0, 2e7 + 1, 5e5)
+    benchmark(efficient_frontier, npv, cost, budgets, groups)
@@ -0,0 +1,25 @@
+import pytest
+
+pytest.importorskip("plotly")
+
+from util.charts import (
+    FIGURE_CACHE,
+    cached_chart,
+    create_waterfall_chart,
+    plot_payback_period,
+)
+
+WACC = 0.1075
+
+
+def bench_create_waterfall_chart(benchmark, cash_flows):
+    benchmark(create_waterfall_chart, cash_flows, WACC)
+
+
+def bench_plot_payback_period(benchmark, cash_flows):
+    benchmark(plot_payback_period, cash_flows)
+
+
+def bench_cached_waterfall_chart(benchmark, cash_flows):
+    FIGURE_CACHE.clear()
+    benchmark(cached_chart, create_waterfall_chart, cash_flows, WACC)
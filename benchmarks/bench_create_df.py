@@ -0,0 +1,41 @@
+from util.create_df import (
+    build_financials,
+    compute_financials_planet,
+    transpose_and_format_planet,
+    compute_financials_beach,
+    transpose_and_format_beach,
+)
+from util.model_spec import get_model
+
+
+def bench_compute_financials_planet(benchmark):
+    benchmark(compute_financials_planet, 770000, 0.3)
+
+
+def bench_compute_financials_beach(benchmark):
+    benchmark(compute_financials_beach, 800000, 0.3)
+
+
+def bench_transpose_and_format_planet(benchmark):
+    df = compute_financials_planet(770000, 0.3)
+    benchmark(transpose_and_format_planet, df)
+
+
+def bench_transpose_and_format_beach(benchmark):
+    df = compute_financials_beach(800000, 0.3)
+    benchmark(transpose_and_format_beach, df)
+
+
+def bench_model_cash_flows_beach(benchmark):
+    model = get_model("beach")
+    benchmark(model.cash_flows, investment=800000, tax=0.3)
+
+
+def bench_build_financials_planet(benchmark):
+    benchmark(build_financials, "planet", investment=770000, tax=0.3)
+
+
+def bench_build_statement_planet(benchmark):
+    benchmark(
+        lambda: build_financials("planet", investment=770000, tax=0.3).to_statement()
+    )
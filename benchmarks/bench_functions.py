@@ -0,0 +1,108 @@
+import numpy as np
+from util.functions import (
+    compute_NPV,
+    compute_NPV_batch,
+    compute_IRR,
+    compute_IRR_batch,
+    compute_payback_period,
+    compute_payback_period_batch,
+    compute_XIRR_batch,
+    compute_XNPV_batch,
+    period_times,
+    Validator,
+    extend_cashflows_for_LCM,
+    calculate_EAA,
+    profitability_index,
+)
+from util.curves import YieldCurve
+from util.incremental import IncrementalValuation
+from util.replacement_chain import chained_npv, compare_with_eaa
+
+WACC = 0.1075
+
+
+def bench_compute_NPV(benchmark, cash_flows):
+    benchmark(compute_NPV, cash_flows, WACC)
+
+
+def bench_compute_NPV_trusted(benchmark, cash_flows):
+    benchmark(compute_NPV, np.asarray(cash_flows), WACC, validate=False)
+
+
+def bench_validate_cash_flows(benchmark, cash_flows):
+    benchmark(Validator.validate_cash_flows, cash_flows)
+
+
+def bench_validate_cash_flow_batch(benchmark, cash_flow_batch):
+    benchmark(Validator.validate_cash_flow_batch, cash_flow_batch)
+
+
+def bench_compute_IRR(benchmark, cash_flows):
+    benchmark(compute_IRR, cash_flows)
+
+
+def bench_compute_payback_period(benchmark, cash_flows):
+    benchmark(compute_payback_period, cash_flows)
+
+
+def bench_profitability_index(benchmark, cash_flows):
+    benchmark(profitability_index, cash_flows, WACC)
+
+
+def bench_calculate_EAA(benchmark, cash_flows):
+    benchmark(calculate_EAA, 1_000_000.0, WACC, len(cash_flows) - 1)
+
+
+def bench_extend_cashflows_for_LCM(benchmark, cash_flows):
+    benchmark(extend_cashflows_for_LCM, cash_flows, 3 * (len(cash_flows) - 1))
+
+
+def bench_chained_npv(benchmark, cash_flows):
+    benchmark(chained_npv, [cash_flows], WACC, 3 * (len(cash_flows) - 1))
+
+
+def bench_compare_with_eaa(benchmark, cash_flow_batch):
+    benchmark(compare_with_eaa, cash_flow_batch, WACC)
+
+
+def bench_compute_NPV_batch(benchmark, cash_flow_batch):
+    benchmark(compute_NPV_batch, cash_flow_batch, [0.05, WACC, 0.15, 0.2])
+
+
+def bench_compute_NPV_batch_curves(benchmark, cash_flow_batch):
+    rates = np.linspace(0.02, 0.06, 5)
+    curves = [YieldCurve([1, 5, 10, 30], rates[:4] + shift) for shift in rates]
+    benchmark(compute_NPV_batch, cash_flow_batch, curves)
+
+
+def bench_compute_XNPV_batch_mid_year(benchmark, cash_flow_batch):
+    times = period_times(cash_flow_batch.shape[1], convention="mid")
+    benchmark(compute_XNPV_batch, cash_flow_batch, times, [0.05, WACC])
+
+
+def bench_compute_XIRR_batch_monthly(benchmark, monthly_batch):
+    benchmark(compute_XIRR_batch, *monthly_batch)
+
+
+def bench_compute_IRR_batch(benchmark, cash_flow_batch):
+    benchmark(compute_IRR_batch, cash_flow_batch)
+
+
+def bench_compute_payback_period_batch(benchmark, cash_flow_batch):
+    benchmark(compute_payback_period_batch, cash_flow_batch)
+
+
+def bench_discounted_payback_period_batch(benchmark, cash_flow_batch):
+    benchmark(
+        compute_payback_period_batch,
+        cash_flow_batch,
+        discount_rates=WACC,
+        fractional=True,
+    )
+
+
+def bench_incremental_update(benchmark, cash_flows):
+    valuation = IncrementalValuation(cash_flows, WACC)
+    middle = len(cash_flows) // 2
+    values = iter([cash_flows[middle] * 1.01, cash_flows[middle]] * 1_000_000)
+    benchmark(lambda: valuation.update(middle, next(values)))
@@ -0,0 +1,10 @@
+from util.global_sensitivity import sobol_indices
+from util.sensitivity import run_sensitivity
+
+
+def bench_run_sensitivity_beach(benchmark):
+    benchmark(run_sensitivity, "beach", n_levels=50, pairs=True)
+
+
+def bench_sobol_indices_beach(benchmark):
+    benchmark(sobol_indices, "beach", n_samples=2**14, workers=1)
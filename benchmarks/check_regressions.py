@@ -0,0 +1,67 @@
+import argparse
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+BENCHMARKS = Path(__file__).resolve().parent
+BASELINE = BENCHMARKS / "baseline.json"
+
+# Slowdown of a benchmark's mean over the baseline that fails the check
+MAX_SLOWDOWN = "mean:15%"
+
+
+def strip_samples(path):
+    """
+    Drop the raw timings of every benchmark from a --benchmark-json report.
+
+    The comparison only reads the summary statistics, so the baseline is kept
+    small enough to check in.
+
+    Parameters:
+    - path (Path): Report written by pytest-benchmark.
+    """
+    with open(path) as f:
+        report = json.load(f)
+    for benchmark in report["benchmarks"]:
+        benchmark["stats"].pop("data", None)
+    with open(path, "w") as f:
+        json.dump(report, f, indent=1)
+        f.write("\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare the benchmark suite against the checked-in baseline and "
+        f"fail when a benchmark is slower than allowed ({MAX_SLOWDOWN} by default)."
+    )
+    parser.add_argument(
+        "--save",
+        action="store_true",
+        help=f"record a new baseline into {BASELINE.relative_to(BENCHMARKS.parent)}",
+    )
+    parser.add_argument(
+        "--threshold",
+        default=MAX_SLOWDOWN,
+        help="pytest-benchmark --benchmark-compare-fail expression",
+    )
+    args, pytest_args = parser.parse_known_args()
+
+    if args.save:
+        options = [f"--benchmark-json={BASELINE}"]
+    elif not BASELINE.exists():
+        sys.exit(f"No baseline at {BASELINE}; record one with --save")
+    else:
+        options = [
+            f"--benchmark-compare={BASELINE}",
+            f"--benchmark-compare-fail={args.threshold}",
+        ]
+    status = pytest.main([str(BENCHMARKS), *options, *pytest_args])
+    if args.save and status == 0:
+        strip_samples(BASELINE)
+    sys.exit(status)
+
+
+if __name__ == "__main__":
+    main()
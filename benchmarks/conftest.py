@@ -0,0 +1,53 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# The app imports its helpers as `util.*` from the src directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+SERIES_LENGTHS = [5, 100, 10_000, 100_000]
+BATCH_SIZES = [1, 100, 10_000]
+BATCH_SERIES_LENGTH = 10
+
+
+def make_cash_flows(n_periods, n_projects=None, seed=0):
+    """
+    Generate conventional cash flows: one investment followed by inflows.
+
+    Parameters:
+    - n_periods (int): Number of inflow periods after the investment.
+    - n_projects (int, optional): Return a (projects x periods) array instead of a list.
+    - seed (int): Random seed.
+
+    Returns:
+    - list or np.ndarray: The generated cash flows.
+    """
+    rng = np.random.default_rng(seed)
+    size = (n_projects or 1, n_periods)
+    inflows = rng.uniform(100.0, 400.0, size=size)
+    investment = -inflows.sum(axis=1, keepdims=True) * rng.uniform(0.3, 0.9)
+    cash_flows = np.hstack([investment, inflows])
+    return cash_flows if n_projects else cash_flows[0].tolist()
+
+
+@pytest.fixture(params=SERIES_LENGTHS, ids=lambda n: f"periods={n}")
+def cash_flows(request):
+    return make_cash_flows(request.param)
+
+
+@pytest.fixture(params=BATCH_SIZES, ids=lambda n: f"batch={n}")
+def cash_flow_batch(request):
+    return make_cash_flows(BATCH_SERIES_LENGTH, n_projects=request.param)
+
+
+@pytest.fixture
+def monthly_batch():
+    # 1000 projects of ten years of monthly cash flows, each starting on a
+    # different day of the year
+    cash_flows = make_cash_flows(120, n_projects=1000)
+    rng = np.random.default_rng(0)
+    starts = np.datetime64("2024-01-01") + rng.integers(0, 365, len(cash_flows))
+    months = (np.arange(cash_flows.shape[1]) * 30.44).astype("timedelta64[D]")
+    return cash_flows, starts[:, None] + months
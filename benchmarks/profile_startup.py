@@ -0,0 +1,121 @@
+import argparse
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+SRC = ROOT / "src"
+PAGES = [SRC / "Home.py", *sorted((SRC / "pages").glob("*.py"))]
+
+# Runs one page headless in a fresh interpreter and prints its timings
+CHILD = """
+import json, sys, time
+start = time.perf_counter()
+sys.path.insert(0, {src!r})
+from streamlit.testing.v1 import AppTest
+imported = time.perf_counter()
+app = AppTest.from_file({page!r}, default_timeout={timeout})
+app.run()
+first_run = time.perf_counter()
+app.run()
+rerun = time.perf_counter()
+print(json.dumps({{
+    "streamlit_import": imported - start,
+    "first_run": first_run - imported,
+    "rerun": rerun - first_run,
+    "errors": [str(e.value) for e in app.exception],
+}}))
+"""
+
+
+def slowest_imports(importtime_log, n=5):
+    """
+    Pick the slowest top-level imports from a -X importtime log.
+
+    Parameters:
+    - importtime_log (str): stderr of a python -X importtime run.
+    - n (int): Number of imports to return.
+
+    Returns:
+    - list: (module, seconds) pairs of the slowest top-level imports.
+    """
+    imports = []
+    for line in importtime_log.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, module = line.split("|")
+        # Nested imports are indented under the module that triggered them
+        if module.startswith("  ") or not cumulative.strip().isdigit():
+            continue
+        imports.append((module.strip(), int(cumulative) / 1e6))
+    return sorted(imports, key=lambda item: item[1], reverse=True)[:n]
+
+
+def profile_page(page, timeout=60):
+    """
+    Measure the cold start and rerun time of one page.
+
+    Parameters:
+    - page (Path): Page script.
+    - timeout (float): Seconds allowed for one script run.
+
+    Returns:
+    - dict: "cold_start" (interpreter start to the end of the first run),
+      "first_run", "rerun", "streamlit_import", "errors" and "slowest_imports".
+    """
+    code = CHILD.format(src=str(SRC), page=str(page), timeout=timeout)
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"{page.name} failed:\n{result.stderr[-2000:]}")
+
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    # The second run reuses the loaded modules, so it does not count
+    timings["cold_start"] = elapsed - timings["rerun"]
+    timings["slowest_imports"] = slowest_imports(result.stderr)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run every Streamlit page headless in a fresh interpreter and "
+        "report its cold start (until the first run completes) and rerun times."
+    )
+    parser.add_argument(
+        "--budget", type=float, default=5.0, help="cold start budget in seconds"
+    )
+    parser.add_argument("--pages", nargs="*", help="page files, default all pages")
+    args = parser.parse_args()
+
+    pages = [Path(page).resolve() for page in args.pages] if args.pages else PAGES
+    over_budget = []
+    for page in pages:
+        timings = profile_page(page)
+        status = "ok" if timings["cold_start"] <= args.budget else "OVER BUDGET"
+        print(
+            f"{page.name:<20} cold start {timings['cold_start']:6.2f}s  "
+            f"first run {timings['first_run']:6.2f}s  "
+            f"rerun {timings['rerun']:6.2f}s  [{status}]"
+        )
+        for module, seconds in timings["slowest_imports"]:
+            print(f"    {module:<40} {seconds:6.3f}s")
+        for error in timings["errors"]:
+            print(f"    error: {error}")
+        if status != "ok" or timings["errors"]:
+            over_budget.append(page.name)
+
+    if over_budget:
+        print(f"Failed the {args.budget:.1f}s budget: {', '.join(over_budget)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
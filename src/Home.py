@@ -4,26 +4,31 @@ from annotated_text import annotated_text
 from streamlit_extras.colored_header import colored_header
 from streamlit_extras.metric_cards import style_metric_cards
 from streamlit_extras.stylable_container import stylable_container
-from st_aggrid import AgGrid, GridOptionsBuilder, GridUpdateMode, DataReturnMode, JsCode
 from streamlit_lottie import st_lottie
+from util.assets import load_lottie, picture_path
 
 st.set_page_config(layout="wide")
 
 # Global variables
-st_lottie(
-    "https://lottie.host/7cf4fc5c-ae1a-44d0-99ee-9eb9230341e8/6xXWRb5Zft.json",
-    height=300,
-    width=600,
-    speed=1,
-    # key="initial",
-)
+# Animations are read from the assets directory and skipped when they have
+# not been fetched
+animation = load_lottie("home")
+if animation:
+    st_lottie(
+        animation,
+        height=300,
+        width=600,
+        speed=1,
+        # key="initial",
+    )
 c0, c1, c2 = st.columns([0.1, 0.1, 3])
 
 with c0:
     st.caption("")
 
     st.image(
-        "./pictures/Financial-analysis-icon-Graphics-29052787-1-580x386.jpg", width=80
+        picture_path("Financial-analysis-icon-Graphics-29052787-1-580x386.jpg"),
+        width=80,
     )
 
 with c2:
@@ -83,13 +88,15 @@ with side:
     )
     for _ in range(5):
         st.text("")
-    st.lottie(
-        "https://lottie.host/9cfe5bca-7b5c-4957-b114-582f81e20201/2idRRfzhi2.json",
-        height=100,
-        width=200,
-        speed=1,
-        key="initial",
-    )
+    animation = load_lottie("about")
+    if animation:
+        st_lottie(
+            animation,
+            height=100,
+            width=200,
+            speed=1,
+            key="initial",
+        )
     st.text("")
     st.text("")
     problem_set_link = ":point_right: Problem Set: [link](https://services.hbsp.harvard.edu/api/courses/1105066/items/HKU145-PDF-ENG/sclinks/8ef206d051509f3cd9efae792113e6b5)"
@@ -141,7 +148,7 @@ st.divider()
 c0, c1, c2 = st.columns([0.9, 1, 4])
 with c0:
     with stylable_container(
-        key="container_with_border",
+        key="container_with_border_2",
         css_styles="""
                 {   background-color: #ADD8E6;
                     color: white;
@@ -182,6 +189,10 @@ project_details = {
     ],
 }
 df = pd.DataFrame(project_details)
+# AgGrid is only needed at the bottom of the page, so it is imported here to
+# let everything above render first
+from st_aggrid import AgGrid, GridOptionsBuilder, JsCode
+
 # st.dataframe(
 #     pd.DataFrame(project_details).set_index("Details"), use_container_width=True
 # )
@@ -212,3 +223,19 @@ response = AgGrid(
     theme="alpine",
     allow_unsafe_jscode=True,
 )
+
+##########################################################################################
+# * Valuation cache
+# Counters of the valuation results shared by the Data, Analysis and Evaluation pages
+with st.expander("Valuation Cache"):
+    from util.valuation import cache_stats
+
+    stats = cache_stats()
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Hit Rate", f"{stats['hit_rate']:.0%}")
+    col2.metric("Hits", stats["hits"])
+    col3.metric("Misses", stats["misses"])
+    col4.metric("Entries", f"{stats['size']} / {stats['maxsize']}")
+    st.caption(
+        f"Evictions: {stats['evictions']}, expirations: {stats['expirations']}"
+    )
@@ -0,0 +1,266 @@
+from datetime import date
+from typing import Annotated, Literal
+
+import numpy as np
+from fastapi import FastAPI, HTTPException
+from pydantic import BaseModel, Field
+from starlette.concurrency import run_in_threadpool
+from util.capital_budgeting import efficient_frontier, select_projects
+from util.curves import YieldCurve
+from util.functions import (
+    pad_cash_flows,
+    compute_NPV_batch,
+    compute_NPV_per_project,
+    compute_IRR_batch,
+    compute_XIRR_batch,
+    compute_XNPV_batch,
+    year_fractions,
+    compute_payback_period_batch,
+    compute_ROI_batch,
+    calculate_EAA,
+    profitability_index_batch,
+)
+from util.replacement_chain import chain_cycles, chain_horizon, chain_npv
+
+app = FastAPI(title="Valuation Service")
+
+FiniteFloat = Annotated[float, Field(allow_inf_nan=False)]
+CashFlowSeries = Annotated[list[FiniteFloat], Field(min_length=1)]
+
+
+class CashFlowBatch(BaseModel):
+    cash_flows: list[CashFlowSeries] = Field(
+        ..., min_length=1, description="One cash-flow series per project"
+    )
+
+
+class DiscountedBatch(CashFlowBatch):
+    discount_rates: list[FiniteFloat] = Field(
+        ..., min_length=1, description="Rates each project is discounted at"
+    )
+
+
+class DatedBatch(CashFlowBatch):
+    dates: list[Annotated[list[date], Field(min_length=1)]] = Field(
+        ..., min_length=1, description="Payment date of every cash flow"
+    )
+
+
+class DatedDiscountedBatch(DatedBatch):
+    discount_rates: list[FiniteFloat] = Field(
+        ..., min_length=1, description="Annually compounded rates"
+    )
+
+
+class CurveSpec(BaseModel):
+    tenors: list[Annotated[float, Field(gt=0)]] = Field(..., min_length=1)
+    rates: list[FiniteFloat] = Field(..., min_length=1)
+    interpolation: Literal["linear", "log_discount"] = "linear"
+
+
+class CurveBatch(CashFlowBatch):
+    curves: list[CurveSpec] = Field(
+        ..., min_length=1, description="Yield curves every project is discounted on"
+    )
+
+
+class LCMBatch(DiscountedBatch):
+    lcm_duration: int | None = Field(
+        None, gt=0, description="Common horizon; defaults to the LCM of the lifespans"
+    )
+    reinvest: bool = Field(
+        False, description="Repeat the initial investment at every cycle"
+    )
+
+
+class EAABatch(BaseModel):
+    npv: list[FiniteFloat] = Field(..., min_length=1)
+    discount_rate: float = Field(..., gt=-1)
+    lifespans: list[Annotated[int, Field(gt=0)]] = Field(..., min_length=1)
+
+
+class PortfolioBatch(DiscountedBatch):
+    budget: float = Field(..., ge=0, description="Capital available")
+    costs: list[Annotated[float, Field(ge=0, allow_inf_nan=False)]] | None = Field(
+        None, description="Capital each project needs; defaults to its initial outlay"
+    )
+    groups: list[str | int | None] | None = Field(
+        None, description="Mutual-exclusion group of each project, null if none"
+    )
+    requires: dict[int, list[int]] | None = Field(
+        None, description="Project index -> indices of the projects it depends on"
+    )
+    frontier_budgets: list[Annotated[float, Field(ge=0)]] | None = Field(
+        None, description="Budget levels of the efficient frontier"
+    )
+
+
+def _to_json(values):
+    # JSON has no NaN, so missing results are returned as null
+    values = np.asarray(values, dtype=float)
+    return np.where(np.isfinite(values), values, None).tolist()
+
+
+async def _run(func, *args):
+    try:
+        return await run_in_threadpool(func, *args)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+
+@app.get("/health")
+async def health():
+    return {"status": "ok"}
+
+
+@app.post("/npv")
+async def npv(body: DiscountedBatch):
+    result = await _run(compute_NPV_batch, body.cash_flows, body.discount_rates)
+    return {"npv": _to_json(result)}
+
+
+def _curve_npv(cash_flows, curves):
+    curves = [
+        YieldCurve(curve.tenors, curve.rates, curve.interpolation) for curve in curves
+    ]
+    return compute_NPV_batch(cash_flows, curves)
+
+
+@app.post("/npv/curves")
+async def npv_curves(body: CurveBatch):
+    result = await _run(_curve_npv, body.cash_flows, body.curves)
+    return {"npv": _to_json(result)}
+
+
+@app.post("/irr")
+async def irr(body: CashFlowBatch):
+    irr, converged, n_roots = await _run(compute_IRR_batch, body.cash_flows)
+    return {
+        "irr": _to_json(irr),
+        "converged": converged.tolist(),
+        "multiple_irr": (n_roots > 1).tolist(),
+    }
+
+
+def _check_dates(cash_flows, dates):
+    if [len(series) for series in cash_flows] != [len(series) for series in dates]:
+        raise ValueError("every cash flow needs exactly one date")
+
+
+def _xnpv(cash_flows, dates, discount_rates):
+    _check_dates(cash_flows, dates)
+    times = year_fractions(dates)
+    return compute_XNPV_batch(cash_flows, times, discount_rates, ~np.isnan(times))
+
+
+def _xirr(cash_flows, dates):
+    _check_dates(cash_flows, dates)
+    return compute_XIRR_batch(cash_flows, dates)
+
+
+@app.post("/xnpv")
+async def xnpv(body: DatedDiscountedBatch):
+    result = await _run(_xnpv, body.cash_flows, body.dates, body.discount_rates)
+    return {"npv": _to_json(result)}
+
+
+@app.post("/xirr")
+async def xirr(body: DatedBatch):
+    xirr, converged, n_roots = await _run(_xirr, body.cash_flows, body.dates)
+    return {
+        "irr": _to_json(xirr),
+        "converged": converged.tolist(),
+        "multiple_irr": (n_roots > 1).tolist(),
+    }
+
+
+@app.post("/payback")
+async def payback(body: CashFlowBatch):
+    result = await _run(compute_payback_period_batch, body.cash_flows)
+    return {"payback_period": _to_json(result)}
+
+
+@app.post("/roi")
+async def roi(body: CashFlowBatch):
+    roi_each_year, mean_roi = await _run(compute_ROI_batch, body.cash_flows)
+    return {"roi_each_year": _to_json(roi_each_year), "mean_roi": _to_json(mean_roi)}
+
+
+@app.post("/pi")
+async def pi(body: DiscountedBatch):
+    result = await _run(profitability_index_batch, body.cash_flows, body.discount_rates)
+    return {"profitability_index": _to_json(result)}
+
+
+@app.post("/eaa")
+async def eaa(body: EAABatch):
+    if len(body.npv) != len(body.lifespans):
+        raise HTTPException(
+            status_code=400, detail="npv and lifespans must have the same length"
+        )
+    result = await _run(
+        calculate_EAA,
+        np.asarray(body.npv),
+        body.discount_rate,
+        np.asarray(body.lifespans),
+    )
+    return {"eaa": _to_json(result)}
+
+
+def _lcm_npv(cash_flows, discount_rates, lcm_duration, reinvest):
+    lifespans = np.array([len(series) - 1 for series in cash_flows])
+    if min(lifespans) < 1:
+        raise ValueError("every series needs at least one period after investment")
+    lcm_duration = lcm_duration or chain_horizon(lifespans)
+    cycles = chain_cycles(lifespans, lcm_duration)
+    padded, mask = pad_cash_flows(cash_flows)
+    npv = compute_NPV_batch(padded, discount_rates, mask)
+    rates = np.asarray(discount_rates, dtype=float)
+    return lcm_duration, chain_npv(
+        npv,
+        padded[:, :1],
+        rates[None, :],
+        lifespans[:, None],
+        cycles[:, None],
+        reinvest,
+    )
+
+
+@app.post("/lcm")
+async def lcm(body: LCMBatch):
+    lcm_duration, result = await _run(
+        _lcm_npv,
+        body.cash_flows,
+        body.discount_rates,
+        body.lcm_duration,
+        body.reinvest,
+    )
+    return {"lcm_duration": lcm_duration, "npv": _to_json(result)}
+
+
+def _portfolio(body):
+    npv = compute_NPV_per_project(body.cash_flows, body.discount_rates)
+    if body.costs is None:
+        cost = [max(-series[0], 0.0) for series in body.cash_flows]
+    else:
+        cost = body.costs
+    if len(cost) != len(npv) or len(body.groups or npv) != len(npv):
+        raise ValueError("costs and groups must have one entry per project")
+    options = dict(groups=body.groups, requires=body.requires)
+    selection = select_projects(npv, cost, body.budget, **options)
+    result = {
+        "npv": _to_json(npv),
+        "selected": np.flatnonzero(selection["selected"]).tolist(),
+        "total_npv": selection["npv"],
+        "total_cost": selection["cost"],
+        "optimal": selection["optimal"],
+    }
+    if body.frontier_budgets:
+        frontier = efficient_frontier(npv, cost, body.frontier_budgets, **options)
+        result["frontier"] = frontier.to_dict(orient="records")
+    return result
+
+
+@app.post("/portfolio")
+async def portfolio(body: PortfolioBatch):
+    return await _run(_portfolio, body)
@@ -0,0 +1,259 @@
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from util.functions import (
+    compute_NPV_per_project,
+    compute_IRR_batch,
+    compute_payback_period_batch,
+    calculate_EAA,
+    profitability_index_from_npv,
+)
+
+
+def read_chunks(path, chunk_size, columns):
+    """
+    Stream a CSV or Parquet file in row chunks.
+
+    Parameters:
+    - path (Path): Input file; ".parquet" files are read with pyarrow, anything
+      else as CSV.
+    - chunk_size (int): Number of rows per chunk.
+    - columns (list): Columns to read.
+
+    Yields:
+    - pd.DataFrame: The next chunk of rows.
+    """
+    if path.suffix == ".parquet":
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(path)
+        for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=columns):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size, usecols=columns)
+
+
+def complete_projects(chunks, id_column):
+    """
+    Regroup row chunks so that no project is split across two chunks.
+
+    The input must be grouped by project: the rows of the last project in a
+    chunk are held back and prepended to the next chunk.
+
+    Parameters:
+    - chunks (iterable): DataFrames of rows in file order.
+    - id_column (str): Project id column.
+
+    Yields:
+    - pd.DataFrame: Chunks holding only complete projects.
+    """
+    carry = None
+    for chunk in chunks:
+        if carry is not None:
+            chunk = pd.concat([carry, chunk], ignore_index=True)
+        is_last = chunk[id_column] == chunk[id_column].iloc[-1]
+        carry = chunk[is_last]
+        if not is_last.all():
+            yield chunk[~is_last]
+    if carry is not None and len(carry):
+        yield carry
+
+
+def value_projects(chunk, columns, discount_rate=None):
+    """
+    Compute NPV, IRR, payback period, PI and EAA of every project in a chunk.
+
+    Periods after a project's last one are padding. A missing, NaN or
+    infinite amount within a project's life is not replaced: the project is
+    flagged in "missing_amounts" and its metrics are NaN.
+
+    Parameters:
+    - chunk (pd.DataFrame): Long-format rows of complete projects.
+    - columns (dict): Names of the "id", "period", "amount" and optional "rate" columns.
+    - discount_rate (float, optional): Rate used when there is no rate column.
+
+    Returns:
+    - pd.DataFrame: One row of metrics per project.
+    """
+    chunk = chunk.astype({columns["period"]: int})
+    wide = chunk.pivot(
+        index=columns["id"], columns=columns["period"], values=columns["amount"]
+    )
+    wide = wide.reindex(columns=range(int(wide.columns.max()) + 1))
+    lifespan = chunk.groupby(columns["id"])[columns["period"]].max().loc[wide.index]
+    values = wide.to_numpy(dtype=float)
+    in_life = wide.columns.to_numpy() <= lifespan.to_numpy()[:, None]
+    missing = (in_life & ~np.isfinite(values)).any(axis=1)
+    # Only the padding is zeroed; flagged projects are valued on zeros and
+    # their metrics blanked below, so the batch functions can trust the input
+    cash_flows = np.where(in_life & ~missing[:, None], values, 0.0)
+
+    if columns.get("rate"):
+        rates = chunk.groupby(columns["id"])[columns["rate"]].first().loc[wide.index]
+        rates = rates.to_numpy(dtype=float)
+    else:
+        rates = np.full(len(wide), discount_rate, dtype=float)
+
+    npv = compute_NPV_per_project(cash_flows, rates, validate=False)
+    irr, _, n_roots = compute_IRR_batch(cash_flows, validate=False)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        eaa = calculate_EAA(npv, rates, lifespan.to_numpy())
+
+    results = pd.DataFrame(
+        {
+            columns["id"]: wide.index,
+            "discount_rate": rates,
+            "npv": npv,
+            "irr": irr,
+            "multiple_irr": n_roots > 1,
+            "payback_period": compute_payback_period_batch(cash_flows, validate=False),
+            "profitability_index": profitability_index_from_npv(npv, cash_flows[:, 0]),
+            "eaa": eaa,
+            "missing_amounts": missing,
+        }
+    )
+    metrics = ["npv", "irr", "payback_period", "profitability_index", "eaa"]
+    results.loc[missing, metrics] = np.nan
+    results.loc[missing, "multiple_irr"] = False
+    return results
+
+
+def _map_bounded(func, chunks, workers, *args):
+    # Like Executor.map but with a bounded number of chunks in flight, so the
+    # input is never read ahead of the workers
+    if workers <= 1:
+        for chunk in chunks:
+            yield func(chunk, *args)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(func, chunk, *args))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def write_results(results, path):
+    """
+    Write result chunks to a CSV or Parquet file as they arrive.
+
+    Parameters:
+    - results (iterable): DataFrames with the same columns.
+    - path (Path): Output file; ".parquet" is written with pyarrow, anything
+      else as CSV.
+
+    Returns:
+    - int: Number of projects written.
+    """
+    n_projects = 0
+    writer = None
+    try:
+        for result in results:
+            if path.suffix == ".parquet":
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+
+                table = pa.Table.from_pandas(result, preserve_index=False)
+                writer = writer or pq.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+            else:
+                result.to_csv(
+                    path,
+                    mode="a" if n_projects else "w",
+                    header=not n_projects,
+                    index=False,
+                )
+            n_projects += len(result)
+    finally:
+        if writer is not None:
+            writer.close()
+    return n_projects
+
+
+def run(
+    input_path,
+    output_path,
+    discount_rate=None,
+    columns=None,
+    chunk_size=1_000_000,
+    workers=1,
+):
+    """
+    Value every project in a long-format cash-flow file.
+
+    Memory use depends on chunk_size and workers, not on the file size.
+
+    Parameters:
+    - input_path (str or Path): CSV or Parquet file with one row per project period,
+      grouped by project.
+    - output_path (str or Path): CSV or Parquet file for the results.
+    - discount_rate (float, optional): Rate for every project; required unless
+      columns has a "rate" column.
+    - columns (dict, optional): Names of the "id", "period", "amount" and "rate" columns.
+    - chunk_size (int): Number of input rows read at once.
+    - workers (int): Number of processes valuing chunks in parallel.
+
+    Returns:
+    - int: Number of projects valued.
+    """
+    columns = {
+        "id": "project_id",
+        "period": "period",
+        "amount": "amount",
+        **(columns or {}),
+    }
+    if discount_rate is None and not columns.get("rate"):
+        raise ValueError("a discount rate or a rate column is required")
+
+    input_path, output_path = Path(input_path), Path(output_path)
+    usecols = [name for name in columns.values() if name]
+    chunks = complete_projects(
+        read_chunks(input_path, chunk_size, usecols), columns["id"]
+    )
+    results = _map_bounded(value_projects, chunks, workers, columns, discount_rate)
+    return write_results(results, output_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compute NPV, IRR, payback, PI and EAA for every project in a "
+        "long-format (project id, period, amount) CSV or Parquet file."
+    )
+    parser.add_argument("input", help="CSV or Parquet file grouped by project")
+    parser.add_argument("output", help="CSV or Parquet file for the results")
+    parser.add_argument("--discount-rate", type=float, help="rate for every project")
+    parser.add_argument("--rate-column", help="column holding each project's rate")
+    parser.add_argument("--id-column", default="project_id")
+    parser.add_argument("--period-column", default="period")
+    parser.add_argument("--amount-column", default="amount")
+    parser.add_argument(
+        "--chunk-size", type=int, default=1_000_000, help="input rows per chunk"
+    )
+    parser.add_argument("--workers", type=int, default=1, help="parallel processes")
+    args = parser.parse_args()
+
+    n_projects = run(
+        args.input,
+        args.output,
+        discount_rate=args.discount_rate,
+        columns={
+            "id": args.id_column,
+            "period": args.period_column,
+            "amount": args.amount_column,
+            "rate": args.rate_column,
+        },
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+    )
+    print(f"Valued {n_projects} projects into {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,41 +1,66 @@
+import numpy as np
 import streamlit as st
 from st_aggrid import AgGrid, GridOptionsBuilder
 from streamlit_extras.stylable_container import stylable_container
-from util.create_df import (
-    compute_financials_planet,
-    transpose_and_format_planet,
-    compute_financials_beach,
-    transpose_and_format_beach,
-)
 from util.sidebar import generate_sidebar
+from util.valuation import get_valuation
+from util.incremental import IncrementalValuation, statement_edits
 
 # st.set_page_config(layout="wide")
 # * Side bar content
 
 # Generate the sidebar and get the values
-(
-    planet_investment_amount,
-    tax,
-    patronage_loss_rate,
-    beach_investment_amount,
-    debt,
-    cost_of_equity,
-    interest_rate,
-) = generate_sidebar()
+sidebar_inputs = generate_sidebar()
+valuation = get_valuation(sidebar_inputs)
+tax = sidebar_inputs[1]
+
+
+def show_edited_metrics(project, response):
+    # Keep one incremental valuation per project in the session, restarting it
+    # whenever the sidebar produces a different base case
+    base = valuation[project]
+    key = f"{project}_incremental_valuation"
+    state = st.session_state.get(key)
+    base_case = (tuple(base["cash_flow"]), valuation["wacc"])
+    if state is None or state[0] != base_case:
+        incremental = IncrementalValuation(base["cash_flow"], valuation["wacc"])
+        state = st.session_state[key] = (base_case, incremental)
+    incremental = state[1]
+    incremental.set_cash_flows(
+        statement_edits(project, base["df_transposed"], response["data"], tax)
+    )
+    if incremental.cash_flows == base["cash_flow"].tolist():
+        return
+
+    c0, c1, c2, c3 = st.columns(4)
+    c0.metric(
+        "NPV (edited)",
+        f"{incremental.npv:,.0f}",
+        f"{incremental.npv - base['npv']:,.0f}",
+    )
+    irr_change = incremental.irr - base["irr"]
+    c1.metric(
+        "IRR (edited)",
+        "n/a" if np.isnan(incremental.irr) else f"{incremental.irr:.2%}",
+        None if np.isnan(irr_change) else f"{irr_change:.2%}",
+    )
+    c2.metric("Profitability Index (edited)", f"{incremental.profitability_index:.2f}")
+    payback = incremental.payback_period
+    c3.metric(
+        "Payback Period (edited)", "-" if payback is None else f"{payback:.2f} years"
+    )
+
+
 ##########################################################################################
 st.text("")
 ##########################################################################################
 # * Cash Flow for Planet Karaoke Pub
 
-df = compute_financials_planet(planet_investment_amount, tax)
-df_transposed = transpose_and_format_planet(df)
+df_transposed = valuation["planet"]["df_transposed"]
 
 
 # * Cash Flow for Beach Karaoke Pub
-df_1 = compute_financials_beach(beach_investment_amount, tax)
-
-
-df_1_transposed = transpose_and_format_beach(df_1)
+df_1_transposed = valuation["beach"]["df_transposed"]
 
 
 c0, c1, c2 = st.columns([1, 1, 3])
@@ -104,15 +129,18 @@ gb.configure_column(
     precision=2,
 )
 response = AgGrid(
-    df_transposed,
+    # AgGrid adds an id column to the frame it is given, and the statement
+    # is shared through the valuation cache
+    df_transposed.copy(),
     editable=True,
     gridOptions=gb.build(),
-    data_return_mode="filtered_and_sorted",
-    update_mode="no_update",
+    data_return_mode="as_input",
+    update_mode="value_changed",
     fit_columns_on_grid_load=True,
     theme="alpine",
     allow_unsafe_jscode=True,
 )
+show_edited_metrics("planet", response)
 st.divider()
 
 gb = GridOptionsBuilder.from_dataframe(df_1_transposed)
@@ -156,7 +184,7 @@ gb.configure_column(
 c0, c1, c2 = st.columns([1, 1, 3])
 with c0:
     with stylable_container(
-        key="container_with_border",
+        key="container_with_border_2",
         css_styles="""
                 {   background-color: #ADD8E6;
                     color: white;
@@ -168,15 +196,16 @@ with c0:
     ):
         st.markdown("##### Beach Karaoke Pub:")
 response_1 = AgGrid(
-    df_1_transposed,
+    df_1_transposed.copy(),
     editable=True,
     gridOptions=gb.build(),
-    data_return_mode="filtered_and_sorted",
-    update_mode="no_update",
+    data_return_mode="as_input",
+    update_mode="value_changed",
     fit_columns_on_grid_load=True,
     theme="alpine",
     allow_unsafe_jscode=True,
 )
+show_edited_metrics("beach", response_1)
 
 
 ##########################################################################################
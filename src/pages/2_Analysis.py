@@ -3,49 +3,22 @@ import numpy as np
 import streamlit as st
 import plotly.graph_objects as go
 from streamlit_pills import pills
-from util.create_df import (
-    compute_financials_planet,
-    transpose_and_format_planet,
-    compute_financials_beach,
-    transpose_and_format_beach,
-)
 from util.sidebar import generate_sidebar
+from util.valuation import get_valuation
 from util.markdown_latex import analysis_description, npv_irr_payback
-from util.functions import compute_NPV, compute_IRR, compute_payback_period
 from util.charts import (
+    cached_chart,
     create_waterfall_chart,
     plot_irr_gauge,
     plot_payback_period,
 )
-from statistics import mean
-
 
 ##########################################################################################
 # * Side bar content
-(
-    planet_investment_amount,
-    tax,
-    patronage_loss_rate,
-    beach_investment_amount,
-    debt,
-    cost_of_equity,
-    interest_rate,
-) = generate_sidebar()
-
-# Calculate WACC
-wacc = (1 - debt) * cost_of_equity + debt * interest_rate * (1 - tax)
-
-
-##########################################################################################
-# * Cash Flow for Planet Karaoke Pub
-
-df = compute_financials_planet(planet_investment_amount, tax)
-df_transposed = transpose_and_format_planet(df)
+sidebar_inputs = generate_sidebar()
+valuation = get_valuation(sidebar_inputs)
 
 
-# * Cash Flow for Beach Karaoke Pub
-df_1 = compute_financials_beach(beach_investment_amount, tax)
-df_1_transposed = transpose_and_format_beach(df_1)
 ##########################################################################################
 
 st.info(analysis_description)
@@ -56,97 +29,73 @@ st.text("")
 st.text("")
 st.text("")
 
-planet_cash_flow = [df_transposed["Year 0"][0]] + df_transposed.iloc[-1:, 2:].values[
-    0
-].tolist()
-
-
-# planet_cash_flow = [ round(elem,2) for elem in planet_cash_flow ]
-
-beach_cash_flow = [df_1_transposed["Year 0"][0]] + df_1_transposed.iloc[-1:, 2:].values[
-    0
-].tolist()
-
-
-# Compte NPV
-planet_npv = compute_NPV(planet_cash_flow, wacc)
-beach_npv = compute_NPV(beach_cash_flow, wacc)
-
-# Compte IRR
-planet_irr = compute_IRR(planet_cash_flow)
-beach_irr = compute_IRR(beach_cash_flow)
-
-
-# Compte Payback Period
-planet_payback_period = compute_payback_period(planet_cash_flow)
-beach_payback_period = compute_payback_period(beach_cash_flow)
-
 # * NPV, IRR, Payback Period
-
-
 st.subheader("Comparisons")
 
 
 selected = pills("", ["NPV", "IRR", "Payback Period", "ROI"], ["💲", "🔣", "💹", "💸"])
 
+# Only the metrics of the selected pill are read from the lazy valuation, so
+# the others are never computed
 if selected == "NPV":
+    wacc = valuation["wacc"]
+    planet_cash_flow = valuation["planet"]["cash_flow"]
+    beach_cash_flow = valuation["beach"]["cash_flow"]
     plot_col1, plot_col2 = st.columns(2)
     with plot_col1:
-        waterfall_fig = create_waterfall_chart(
-            planet_cash_flow, wacc, "Planet Karaoke Pub"
+        waterfall_fig = cached_chart(
+            create_waterfall_chart, planet_cash_flow, wacc, "Planet Karaoke Pub"
         )
         st.plotly_chart(waterfall_fig, use_container_width=True, theme="streamlit")
 
     with plot_col2:
-        waterfall_fig = create_waterfall_chart(
-            beach_cash_flow, wacc, "Beach Karaoke Pub"
+        waterfall_fig = cached_chart(
+            create_waterfall_chart, beach_cash_flow, wacc, "Beach Karaoke Pub"
         )
         st.plotly_chart(waterfall_fig, use_container_width=True, theme="streamlit")
 
 
 if selected == "IRR":
+    planet_irr = valuation["planet"]["irr"]
+    beach_irr = valuation["beach"]["irr"]
     plot_col1, plot_col2 = st.columns(2)
     with plot_col1:
-        irr_fig = plot_irr_gauge(planet_irr, "Planet Karaoke Pub")
+        irr_fig = cached_chart(plot_irr_gauge, planet_irr, "Planet Karaoke Pub")
         st.plotly_chart(irr_fig, use_container_width=True, theme="streamlit")
 
     with plot_col2:
-        irr_fig = plot_irr_gauge(beach_irr, "Beach Karaoke Pub")
+        irr_fig = cached_chart(plot_irr_gauge, beach_irr, "Beach Karaoke Pub")
         st.plotly_chart(irr_fig, use_container_width=True, theme="streamlit")
 
 if selected == "Payback Period":
+    wacc = valuation["wacc"]
+    planet_cash_flow = valuation["planet"]["cash_flow"]
+    beach_cash_flow = valuation["beach"]["cash_flow"]
     plot_col1, plot_col2 = st.columns(2)
     with plot_col1:
-        pp = plot_payback_period(planet_cash_flow, "Planet Karaoke Pub")
+        pp = cached_chart(
+            plot_payback_period,
+            planet_cash_flow,
+            "Planet Karaoke Pub",
+            discount_rate=wacc,
+        )
         st.plotly_chart(pp, use_container_width=True, theme="streamlit")
 
     with plot_col2:
-        pp = plot_payback_period(beach_cash_flow, "Beach Karaoke Pub")
+        pp = cached_chart(
+            plot_payback_period,
+            beach_cash_flow,
+            "Beach Karaoke Pub",
+            discount_rate=wacc,
+        )
         st.plotly_chart(pp, use_container_width=True, theme="streamlit")
 
 if selected == "ROI":
-    initial_investment = planet_cash_flow[0]
-
-    planet_roi_each_year = []
-
-    for i in range(1, len(planet_cash_flow)):
-        roi = (
-            planet_cash_flow[i] / abs(initial_investment)
-        ) * 100  # Using abs() to ensure the initial investment is positive
-        planet_roi_each_year.append(roi)
-    planet_mean_roi = mean(planet_roi_each_year)
-
-    initial_investment = beach_cash_flow[0]
-
-    beach_roi_each_year = []
-
-    for i in range(1, len(beach_cash_flow)):
-        roi = (
-            beach_cash_flow[i] / abs(initial_investment)
-        ) * 100  # Using abs() to ensure the initial investment is positive
-        beach_roi_each_year.append(roi)
+    planet_roi_each_year = valuation["planet"]["roi_each_year"]
+    planet_mean_roi = valuation["planet"]["mean_roi"]
 
-    beach_mean_roi = mean(beach_roi_each_year)
+    beach_roi_each_year = valuation["beach"]["roi_each_year"]
+    beach_mean_roi = valuation["beach"]["mean_roi"]
 
     col1, col2 = st.columns(2)
     with col1:
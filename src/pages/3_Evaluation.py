@@ -1,37 +1,29 @@
+from functools import partial
+
 import pandas as pd
 import streamlit as st
 import plotly.graph_objects as go
-import plotly.express as px
 import numpy as np
 from streamlit_extras.colored_header import colored_header
 from streamlit_lottie import st_lottie
+from util.assets import load_lottie
+from streamlit_pills import pills
 from util.markdown_latex import evaluation_description
 from util.sidebar import generate_sidebar
-from util.functions import (
-    compute_NPV,
-    compute_IRR,
-    compute_payback_period,
-    extend_cashflows_for_LCM,
-    calculate_EAA,
-    profitability_index,
-)
-from util.create_df import (
-    compute_financials_planet,
-    transpose_and_format_planet,
-    compute_financials_beach,
-    transpose_and_format_beach,
-    normalize_values,
-)
-from statistics import mean
+from util.valuation import get_valuation
+from util.functions import compute_NPV_batch
+from util.create_df import normalize_values
 
 # st.set_page_config(layout="wide")
-st_lottie(
-    "https://lottie.host/40f2b045-cfe3-48c1-99fb-8d9d959fad39/HZEetoX5H1.json",
-    height=300,
-    width=600,
-    speed=1,
-    # key="initial",
-)
+animation = load_lottie("evaluation")
+if animation:
+    st_lottie(
+        animation,
+        height=300,
+        width=600,
+        speed=1,
+        # key="initial",
+    )
 
 colored_header(
     label="Evaluation & Recommendation",
@@ -40,6 +32,7 @@ colored_header(
 )
 
 
+sidebar_inputs = generate_sidebar()
 (
     planet_investment_amount,
     tax,
@@ -48,63 +41,25 @@ colored_header(
     debt,
     cost_of_equity,
     interest_rate,
-) = generate_sidebar()
-
-wacc = (1 - debt) * cost_of_equity + debt * interest_rate * (1 - tax)
-
-df = compute_financials_planet(planet_investment_amount, tax)
-df_transposed = transpose_and_format_planet(df)
-
-
-# * Cash Flow for Beach Karaoke Pub
-df_1 = compute_financials_beach(beach_investment_amount, tax)
-df_1_transposed = transpose_and_format_beach(df_1)
-
-
-planet_cash_flow = [df_transposed["Year 0"][0]] + df_transposed.iloc[-1:, 2:].values[
-    0
-].tolist()
-
+) = sidebar_inputs
+valuation = get_valuation(sidebar_inputs)
 
-beach_cash_flow = [df_1_transposed["Year 0"][0]] + df_1_transposed.iloc[-1:, 2:].values[
-    0
-].tolist()
+wacc = valuation["wacc"]
 
-# Compte NPV
-planet_npv = compute_NPV(planet_cash_flow, wacc)
-beach_npv = compute_NPV(beach_cash_flow, wacc)
+planet_cash_flow = valuation["planet"]["cash_flow"]
+beach_cash_flow = valuation["beach"]["cash_flow"]
 
-# Compte IRR
-planet_irr = compute_IRR(planet_cash_flow)
-beach_irr = compute_IRR(beach_cash_flow)
+planet_npv = valuation["planet"]["npv"]
+beach_npv = valuation["beach"]["npv"]
 
+planet_irr = valuation["planet"]["irr"]
+beach_irr = valuation["beach"]["irr"]
 
-# Compte Payback Period
-planet_payback_period = compute_payback_period(planet_cash_flow)
-beach_payback_period = compute_payback_period(beach_cash_flow)
+planet_payback_period = valuation["planet"]["payback_period"]
+beach_payback_period = valuation["beach"]["payback_period"]
 
-initial_investment = planet_cash_flow[0]
-
-planet_roi_each_year = []
-
-for i in range(1, len(planet_cash_flow)):
-    roi = (
-        planet_cash_flow[i] / abs(initial_investment)
-    ) * 100  # Using abs() to ensure the initial investment is positive
-    planet_roi_each_year.append(roi)
-planet_mean_roi = mean(planet_roi_each_year)
-
-initial_investment = beach_cash_flow[0]
-
-beach_roi_each_year = []
-
-for i in range(1, len(beach_cash_flow)):
-    roi = (
-        beach_cash_flow[i] / abs(initial_investment)
-    ) * 100  # Using abs() to ensure the initial investment is positive
-    beach_roi_each_year.append(roi)
-
-beach_mean_roi = mean(beach_roi_each_year)
+planet_mean_roi = valuation["planet"]["mean_roi"]
+beach_mean_roi = valuation["beach"]["mean_roi"]
 
 
 df_normalized = normalize_values(
@@ -126,7 +81,6 @@ df_long = df_normalized.melt(
 )
 
 # Radar chart
-categories = df.columns[1:].tolist()
 fig = go.Figure()
 
 # Loop through unique projects
@@ -152,24 +106,32 @@ st.plotly_chart(fig, use_container_width=True, theme="streamlit")
 st.info(evaluation_description)
 st.text("")
 st.subheader("Other Metrics to Consider")
-tab1, tab2, tab3, tab4 = st.tabs(
+# Only the selected view is evaluated, unlike st.tabs which runs every tab
+selected = pills(
+    "",
     [
         "Sensitivity Analysis",
         "Least Common Multiple",
         "Equivalent Annual Annuity",
         "Profitability Index",
-    ]
+        "Monte Carlo Simulation",
+    ],
+    ["📉", "🔁", "📆", "➗", "🎲"],
 )
 
-with tab1:
+# Modules used by a single view are imported inside it, so they are only
+# loaded once that view is opened
+if selected == "Sensitivity Analysis":
+    from util.charts import cached_chart, plot_tornado
+    from util.global_sensitivity import sobol_indices, default_ranges
+    from util.sensitivity import run_sensitivity
+
     wacc_values = np.linspace(0.05, 0.2, 100)  # WACC range from 5% to 20%
-    npvs_project1 = []
-    npvs_project2 = []
 
-    # Compute NPV for each WACC for both projects
-    for w in wacc_values:
-        npvs_project1.append(compute_NPV(planet_cash_flow, w))
-        npvs_project2.append(compute_NPV(beach_cash_flow, w))
+    # Compute NPV for each WACC for both projects in one pass
+    npvs_project1, npvs_project2 = compute_NPV_batch(
+        [planet_cash_flow, beach_cash_flow], wacc_values
+    )
 
     # Plot with Plotly for both projects
     fig = go.Figure()
@@ -222,12 +184,83 @@ In conclusion, based on the provided graph, **Beach Karaoke Pub's NPV is more se
 """
     )
 
-with tab2:
-    extended_planet_cashflows = extend_cashflows_for_LCM(planet_cash_flow, 12)
-    extended_beach_cashflows = extend_cashflows_for_LCM(beach_cash_flow, 12)
+    spread = st.slider("Range of each factor (+/-)", 0.05, 0.5, 0.2, step=0.05)
+    financing = dict(
+        debt=debt, cost_of_equity=cost_of_equity, interest_rate=interest_rate
+    )
+    sensitivities = {
+        "Planet Karaoke Pub": run_sensitivity(
+            "planet",
+            base_inputs=dict(
+                investment=planet_investment_amount,
+                tax=tax,
+                patronage_loss=patronage_loss_rate,
+            ),
+            financing=financing,
+            spread=spread,
+            pairs=False,
+        ),
+        "Beach Karaoke Pub": run_sensitivity(
+            "beach",
+            base_inputs=dict(
+                investment=beach_investment_amount,
+                tax=tax,
+                patronage_loss=patronage_loss_rate,
+            ),
+            financing=financing,
+            spread=spread,
+            pairs=False,
+        ),
+    }
+    for project, sensitivity in sensitivities.items():
+        st.plotly_chart(
+            cached_chart(
+                plot_tornado,
+                sensitivity["tornado"],
+                sensitivity["base_npv"],
+                project,
+            ),
+            use_container_width=True,
+            theme="streamlit",
+        )
+        st.dataframe(
+            sensitivity["tornado"].set_index("factor"), use_container_width=True
+        )
+    st.markdown(
+        """Each input, financing assumption and line item of the financial
+        statements is moved across its range one at a time while everything else
+        stays at the sidebar values. The longest bars are the assumptions the NPV
+        depends on most; the elasticity is the percentage change in NPV for a 1%
+        change in the factor."""
+    )
+
+    global_indices = {}
+    for project, key, investment in (
+        ("Planet Karaoke Pub", "planet", planet_investment_amount),
+        ("Beach Karaoke Pub", "beach", beach_investment_amount),
+    ):
+        base_inputs = dict(
+            investment=investment, tax=tax, patronage_loss=patronage_loss_rate
+        )
+        ranges = default_ranges(key, base_inputs, wacc=wacc, spread=spread)
+        global_indices[project] = sobol_indices(
+            key, ranges, n_samples=2**12, base_inputs=base_inputs
+        )["indices"].set_index("factor")
+    st.dataframe(
+        pd.concat(global_indices, axis=1).round(3), use_container_width=True
+    )
+    st.markdown(
+        """When all inputs vary together across the same ranges, the first-order
+        Sobol index (S1) is the share of the NPV variance explained by a factor on
+        its own, and the total-effect index (ST) adds its interactions with the
+        other factors."""
+    )
+
+if selected == "Least Common Multiple":
+    import plotly.express as px
 
-    planet_npv_extended = compute_NPV(extended_planet_cashflows, wacc)
-    beach_npv_extended = compute_NPV(extended_beach_cashflows, wacc)
+    planet_npv_extended = valuation["planet"]["npv_lcm"]
+    beach_npv_extended = valuation["beach"]["npv_lcm"]
 
     df_long = pd.DataFrame(
         {
@@ -264,9 +297,11 @@ we can see that **Beach Karaoke Pub** has a higher NPV than **Planet Karaoke Pub
 """
     )
 
-with tab3:
-    planet_eaa = calculate_EAA(planet_npv, wacc, 4)
-    beach_eaa = calculate_EAA(beach_npv, wacc, 6)
+if selected == "Equivalent Annual Annuity":
+    import plotly.express as px
+
+    planet_eaa = valuation["planet"]["eaa"]
+    beach_eaa = valuation["beach"]["eaa"]
     df_plot = pd.DataFrame(
         {
             "Project": ["Planet Karaoke Pub", "Beach Karaoke Pub"],
@@ -291,9 +326,9 @@ with tab3:
             it does not capture the risk profile of each project, and since it
             is a derived metric from NPV, it is also subject to the same limitations"""
     )
-with tab4:
-    planet_pi = profitability_index(planet_cash_flow, wacc)
-    beach_pi = profitability_index(beach_cash_flow, wacc)
+if selected == "Profitability Index":
+    planet_pi = valuation["planet"]["profitability_index"]
+    beach_pi = valuation["beach"]["profitability_index"]
     fig = go.Figure(
         go.Scatter(x=[0, 1], y=[0, 1], mode="markers", marker=dict(opacity=0))
     )
@@ -332,3 +367,97 @@ with tab4:
         Based on the values calculated above, we can see that **Beach Karaoke Pub** has a slightly 
         higher PI than **Planet Karaoke Pub**. """
     )
+
+if selected == "Monte Carlo Simulation":
+    from util.simulation import run_simulation, stored_simulation
+
+    n_scenarios = st.select_slider(
+        "Number of scenarios", options=[10000, 100000, 1000000], value=100000
+    )
+    store = None
+    if st.checkbox("Store the scenarios for later queries"):
+        from util.result_store import ResultStore
+
+        store = ResultStore()
+    distributions = {
+        "revenue_growth": ("normal", 0.0, 0.02),
+        "patronage_loss": (
+            "uniform",
+            max(patronage_loss_rate - 0.1, 0.0),
+            min(patronage_loss_rate + 0.1, 1.0),
+        ),
+        "fnb_cost": ("triangular", 0.2, 0.25, 0.3),
+        "tax": ("uniform", max(tax - 0.05, 0.0), min(tax + 0.05, 1.0)),
+        "wacc": ("normal", wacc, 0.01),
+    }
+    investments = {
+        "Planet Karaoke Pub": ("planet", planet_investment_amount),
+        "Beach Karaoke Pub": ("beach", beach_investment_amount),
+    }
+    # With a store, each distinct set of inputs is simulated and written once
+    # and later reruns read the stored scenarios back
+    simulate = run_simulation if store is None else partial(stored_simulation, store)
+    simulations = {
+        name: simulate(
+            project,
+            n_scenarios,
+            distributions,
+            base_inputs={"investment": investment},
+            seed=0,
+        )
+        for name, (project, investment) in investments.items()
+    }
+
+    fig = go.Figure()
+    for project, simulation in simulations.items():
+        if "histogram" in simulation:
+            counts, edges = simulation["histogram"]
+            fig.add_trace(
+                go.Bar(
+                    x=(edges[:-1] + edges[1:]) / 2,
+                    y=counts,
+                    width=np.diff(edges),
+                    name=project,
+                    opacity=0.6,
+                )
+            )
+        else:
+            fig.add_trace(
+                go.Histogram(x=simulation["sample"]["npv"], name=project, opacity=0.6)
+            )
+    fig.update_layout(
+        barmode="overlay",
+        title="Simulated NPV Distribution",
+        xaxis_title="Net Present Value (NPV)",
+        yaxis_title="Scenarios",
+    )
+    st.plotly_chart(fig, use_container_width=True, theme="streamlit")
+
+    df_simulation = pd.DataFrame(
+        {
+            project: {
+                "Probability of Loss": simulation["probability_of_loss"],
+                "Mean NPV": simulation["npv"]["mean"],
+                **{
+                    f"NPV P{p}": value
+                    for p, value in simulation["npv"]["percentiles"].items()
+                },
+                "Median IRR": simulation["irr"]["percentiles"][50],
+                "Median Payback": simulation["payback_period"]["percentiles"][50],
+            }
+            for project, simulation in simulations.items()
+        }
+    )
+    st.dataframe(df_simulation, use_container_width=True)
+    if store is not None:
+        st.caption(
+            "Read from stored runs "
+            + ", ".join(simulation["run"] for simulation in simulations.values())
+            + f" in {store.root}."
+        )
+    st.markdown(
+        """Revenue growth, patronage loss, food & beverage cost, tax and WACC are
+        drawn around the sidebar inputs and every scenario is evaluated through the
+        cash-flow model. The probability of loss is the share of scenarios with a
+        negative NPV."""
+    )
@@ -0,0 +1,87 @@
+import json
+import urllib.request
+from pathlib import Path
+
+ASSETS_DIR = Path(__file__).resolve().parent.parent / "assets"
+PICTURES_DIR = Path(__file__).resolve().parent.parent.parent / "pictures"
+
+# Animations shown by the pages, fetched into assets/lottie/<name>.json by
+# running this module
+LOTTIE_ANIMATIONS = {
+    "home": "https://lottie.host/7cf4fc5c-ae1a-44d0-99ee-9eb9230341e8/6xXWRb5Zft.json",
+    "about": "https://lottie.host/9cfe5bca-7b5c-4957-b114-582f81e20201/2idRRfzhi2.json",
+    "evaluation": "https://lottie.host/40f2b045-cfe3-48c1-99fb-8d9d959fad39/HZEetoX5H1.json",
+}
+
+_loaded = {}
+
+
+def _lottie_path(name):
+    return ASSETS_DIR / "lottie" / f"{name}.json"
+
+
+def _download(name, timeout):
+    with urllib.request.urlopen(LOTTIE_ANIMATIONS[name], timeout=timeout) as response:
+        return json.load(response)
+
+
+def _save(name, animation):
+    path = _lottie_path(name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(animation, f, separators=(",", ":"))
+    return path
+
+
+def load_lottie(name):
+    """
+    Read a lottie animation from the assets directory.
+
+    Pages never download animations, so a page run does not wait on the
+    network. An animation that has not been fetched with fetch_assets is
+    not shown.
+
+    Parameters:
+    - name (str): Key of LOTTIE_ANIMATIONS.
+
+    Returns:
+    - dict or None: The animation JSON, or None when it is not available.
+    """
+    if name not in _loaded:
+        try:
+            with open(_lottie_path(name)) as f:
+                _loaded[name] = json.load(f)
+        except (OSError, ValueError):
+            _loaded[name] = None
+    return _loaded[name]
+
+
+def picture_path(filename):
+    """
+    Locate a bundled picture independently of the working directory.
+
+    Parameters:
+    - filename (str): File name inside the pictures directory.
+
+    Returns:
+    - str: Absolute path of the picture.
+    """
+    return str(PICTURES_DIR / filename)
+
+
+def fetch_assets(timeout=30):
+    """
+    Download every animation in LOTTIE_ANIMATIONS into the assets directory.
+
+    Parameters:
+    - timeout (float): Seconds to wait for each download.
+
+    Returns:
+    - list: Paths of the files written.
+    """
+    return [_save(name, _download(name, timeout)) for name in LOTTIE_ANIMATIONS]
+
+
+if __name__ == "__main__":
+    for path in fetch_assets():
+        print(f"Wrote {path}")
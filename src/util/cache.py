@@ -0,0 +1,128 @@
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+
+class LRUCache:
+    """
+    A thread-safe least-recently-used cache with an optional time-to-live.
+
+    Streamlit serves every session from the same process, so a module-level
+    instance is shared across pages and sessions.
+    """
+
+    def __init__(self, maxsize=128, ttl=None, timer=time.monotonic):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._timer = timer
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _lookup(self, key):
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        value, stored_at = entry
+        if self.ttl is not None and self._timer() - stored_at > self.ttl:
+            del self._data[key]
+            self.expirations += 1
+            return None
+        self._data.move_to_end(key)
+        return entry
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = (value, self._timer())
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, key, compute):
+        """
+        Return the cached value for key, computing and storing it on a miss.
+
+        Parameters:
+        - key (hashable): Cache key.
+        - compute (callable): Called without arguments on a miss.
+
+        Returns:
+        - The cached or freshly computed value.
+        """
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is not None:
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        # Compute outside the lock so slow misses do not block other sessions
+        value = compute()
+        self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        """
+        Report cache counters for monitoring.
+
+        Returns:
+        - dict: hits, misses, hit_rate, evictions, expirations, size and maxsize.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+            }
+
+
+def memoize(maxsize=128, ttl=None):
+    """
+    Cache a function's results in an LRUCache keyed on its positional arguments.
+
+    The cache is available as the wrapped function's `cache` attribute.
+
+    Parameters:
+    - maxsize (int): Maximum number of cached results.
+    - ttl (float, optional): Seconds after which a result expires.
+
+    Returns:
+    - callable: The decorator.
+    """
+
+    def decorator(func):
+        cache = LRUCache(maxsize=maxsize, ttl=ttl)
+
+        @wraps(func)
+        def wrapper(*args):
+            return cache.get_or_compute(args, lambda: func(*args))
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
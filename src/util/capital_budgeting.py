@@ -0,0 +1,222 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+# Largest (groups x budget cells) choice table the dynamic program allocates;
+# bigger problems go to the MILP solver
+MAX_DP_CELLS = 20_000_000
+
+
+def _group_members(n_projects, groups):
+    # Projects sharing a group label are mutually exclusive; projects without
+    # a label (None or NaN) form a group of their own
+    if groups is None:
+        return [[i] for i in range(n_projects)]
+    members = {}
+    for i, label in enumerate(groups):
+        if label is None or (isinstance(label, float) and math.isnan(label)):
+            label = ("__independent__", i)
+        members.setdefault(label, []).append(i)
+    return list(members.values())
+
+
+def _dependency_pairs(n_projects, requires):
+    pairs = [
+        (int(project), int(required))
+        for project, required_projects in (requires or {}).items()
+        for required in required_projects
+    ]
+    for pair in pairs:
+        if not all(0 <= i < n_projects for i in pair):
+            raise ValueError(f"dependency {pair} refers to an unknown project")
+    return pairs
+
+
+def _cost_unit(cost, budgets):
+    # Common divisor of integral costs and budgets, so the dynamic program is
+    # exact; None when the values are not integral
+    values = np.concatenate([cost, np.atleast_1d(budgets)])
+    if not np.all(values == np.round(values)) or np.any(np.abs(values) > 2**62):
+        return None
+    return math.gcd(*np.abs(values).astype(np.int64).tolist()) or 1
+
+
+def _knapsack_dp(npv, weights, capacity, members):
+    # best[c] is the largest NPV of a selection weighing at most c units;
+    # choices[g, c] is 1 + the position of the project picked from group g
+    best = np.zeros(capacity + 1)
+    largest = max((len(group) for group in members), default=0)
+    dtype = np.uint8 if largest < 2**8 else np.uint16
+    choices = np.zeros((len(members), capacity + 1), dtype=dtype)
+    for g, group in enumerate(members):
+        updated = best.copy()
+        for k, i in enumerate(group, start=1):
+            w = weights[i]
+            if w > capacity or npv[i] <= 0:
+                continue
+            candidate = best[: capacity + 1 - w] + npv[i]
+            better = candidate > updated[w:]
+            updated[w:][better] = candidate[better]
+            choices[g, w:][better] = k
+        best = updated
+    return best, choices
+
+
+def _backtrack(choices, weights, members, capacity, n_projects):
+    selected = np.zeros(n_projects, dtype=bool)
+    for g in range(len(members) - 1, -1, -1):
+        k = choices[g, capacity]
+        if k:
+            i = members[g][k - 1]
+            selected[i] = True
+            capacity -= weights[i]
+    return selected
+
+
+def _solve_milp(npv, cost, budget, members, pairs):
+    from scipy.optimize import Bounds, LinearConstraint, milp
+    from scipy.sparse import coo_matrix
+
+    n_projects = len(npv)
+    rows, cols, values, upper = [], [], [], []
+    for group in members:
+        if len(group) > 1:
+            rows += [len(upper)] * len(group)
+            cols += group
+            values += [1.0] * len(group)
+            upper.append(1.0)
+    for project, required in pairs:
+        rows += [len(upper), len(upper)]
+        cols += [project, required]
+        values += [1.0, -1.0]
+        upper.append(0.0)
+    rows += [len(upper)] * n_projects
+    cols += list(range(n_projects))
+    values += cost.tolist()
+    upper.append(budget)
+
+    matrix = coo_matrix((values, (rows, cols)), shape=(len(upper), n_projects))
+    result = milp(
+        -npv,
+        integrality=np.ones(n_projects),
+        bounds=Bounds(0, 1),
+        constraints=LinearConstraint(matrix.tocsr(), -np.inf, upper),
+    )
+    if result.x is None:
+        raise RuntimeError(f"project selection failed: {result.message}")
+    return result.x > 0.5, result.status == 0
+
+
+def _selection(npv, cost, selected, method, optimal):
+    return {
+        "selected": selected,
+        "npv": float(npv[selected].sum()),
+        "cost": float(cost[selected].sum()),
+        "method": method,
+        "optimal": optimal,
+    }
+
+
+def select_projects(npv, cost, budget, groups=None, requires=None, method="auto"):
+    """
+    Choose the set of projects with the largest total NPV within a budget.
+
+    The selection is a 0-1 knapsack in which projects sharing a group are
+    mutually exclusive and a project can require other projects. Without
+    dependencies and with integral costs it is solved exactly by a dynamic
+    program over the budget; otherwise, or when the budget grid would be too
+    large, by branch and bound through scipy's MILP solver.
+
+    Parameters:
+    - npv (array): NPV of each project, e.g. from compute_NPV_per_project.
+    - cost (array): Capital each project needs.
+    - budget (float): Capital available.
+    - groups (array, optional): Mutual-exclusion label of each project; None or
+      NaN for independent projects.
+    - requires (dict, optional): Project index -> indices of the projects it
+      depends on.
+    - method (str): "auto", "dp" or "milp".
+
+    Returns:
+    - dict: "selected" (bool array), total "npv" and "cost", the "method" used
+      and whether the solution is proven "optimal".
+    """
+    return _optimize(npv, cost, [budget], groups, requires, method)[0]
+
+
+def efficient_frontier(npv, cost, budgets, groups=None, requires=None, method="auto"):
+    """
+    Compute the best portfolio at every budget level.
+
+    With the dynamic program, a single pass over the largest budget yields the
+    optimum at every smaller budget; with the MILP solver each level is solved
+    separately.
+
+    Parameters:
+    - npv, cost, groups, requires, method: See select_projects.
+    - budgets (array): Budget levels.
+
+    Returns:
+    - pd.DataFrame: One row per budget with the total "npv" and "cost", the
+      number of projects and the indices of the "selected" projects.
+    """
+    solutions = _optimize(npv, cost, budgets, groups, requires, method)
+    return pd.DataFrame(
+        {
+            "budget": np.asarray(budgets, dtype=float),
+            "npv": [solution["npv"] for solution in solutions],
+            "cost": [solution["cost"] for solution in solutions],
+            "n_projects": [solution["selected"].sum() for solution in solutions],
+            "selected": [np.flatnonzero(s["selected"]).tolist() for s in solutions],
+        }
+    )
+
+
+def _optimize(npv, cost, budgets, groups, requires, method):
+    npv = np.asarray(npv, dtype=float)
+    cost = np.asarray(cost, dtype=float)
+    budgets = np.asarray(budgets, dtype=float)
+    if npv.shape != cost.shape or npv.ndim != 1:
+        raise ValueError("npv and cost must be 1-D arrays of the same length")
+    if not (np.all(np.isfinite(npv)) and np.all(np.isfinite(cost))):
+        raise ValueError("npv and cost must be finite")
+    if np.any(cost < 0) or np.any(budgets < 0):
+        raise ValueError("costs and budgets must not be negative")
+    if method not in ("auto", "dp", "milp"):
+        raise ValueError(f"unknown method {method!r}")
+
+    members = _group_members(len(npv), groups)
+    if any(len(group) >= 2**16 for group in members):
+        raise ValueError("a mutual-exclusion group has too many projects")
+    pairs = _dependency_pairs(len(npv), requires)
+
+    unit = None if pairs else _cost_unit(cost, budgets)
+    if budgets.size == 0:
+        return []
+    capacity = int(budgets.max() // unit) if unit else None
+    use_dp = unit is not None and len(members) * (capacity + 1) <= MAX_DP_CELLS
+    if method == "dp" and not use_dp:
+        raise ValueError(
+            "the dynamic program needs integral costs, no dependencies and a "
+            f"choice table of at most {MAX_DP_CELLS} cells"
+        )
+    if method == "milp" or not use_dp:
+        solutions = []
+        for budget in budgets:
+            selected, optimal = _solve_milp(npv, cost, budget, members, pairs)
+            solutions.append(_selection(npv, cost, selected, "milp", optimal))
+        return solutions
+
+    weights = (cost // unit).astype(np.int64)
+    _, choices = _knapsack_dp(npv, weights, capacity, members)
+    return [
+        _selection(
+            npv,
+            cost,
+            _backtrack(choices, weights, members, int(budget // unit), len(npv)),
+            "dp",
+            True,
+        )
+        for budget in budgets
+    ]
@@ -1,27 +1,116 @@
+import json
+
+import numpy as np
 import plotly.graph_objects as go
+from util.cache import LRUCache
+from util.functions import compute_payback_period_batch, discount_table
+
+# Most points drawn per series; longer series are bucketed or decimated
+MAX_POINTS = 500
+
+# Serialized figures keyed on the builder and its inputs
+FIGURE_CACHE = LRUCache(maxsize=128)
+
+
+def _freeze(value):
+    # Hashable form of chart inputs: arrays and lists become bytes
+    if isinstance(value, np.ndarray) and value.dtype != object:
+        return (value.shape, value.dtype.str, value.tobytes())
+    if isinstance(value, (list, tuple, np.ndarray)):
+        if all(isinstance(item, (int, float)) for item in value):
+            return _freeze(np.asarray(value, dtype=float))
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if hasattr(value, "to_numpy"):
+        return _freeze(value.to_numpy())
+    return value
+
+
+def cached_chart(builder, *args, **kwargs):
+    """
+    Build a figure once per distinct set of inputs and reuse its JSON.
+
+    Parameters:
+    - builder (callable): Chart function returning a plotly Figure.
+    - *args, **kwargs: Arguments of the chart function.
+
+    Returns:
+    - dict: The figure as plain data, accepted by st.plotly_chart.
+    """
+    key = (builder.__qualname__, _freeze(args), _freeze(kwargs))
+    figure_json = FIGURE_CACHE.get_or_compute(
+        key, lambda: builder(*args, **kwargs).to_json()
+    )
+    # A fresh dict per call, so callers cannot alter the cached figure
+    return json.loads(figure_json)
+
+
+def bucket_bounds(n_values, max_points=MAX_POINTS):
+    """
+    Split n_values consecutive values into at most max_points buckets.
+
+    Parameters:
+    - n_values (int): Number of values.
+    - max_points (int): Maximum number of buckets.
+
+    Returns:
+    - np.ndarray: Start index of every bucket followed by n_values.
+    """
+    n_buckets = min(n_values, max_points)
+    return np.linspace(0, n_values, n_buckets + 1).round().astype(int)
+
+
+def downsample_line(y, max_points=MAX_POINTS):
+    """
+    Decimate a long series for a line chart, keeping each bucket's extremes.
+
+    Parameters:
+    - y (array): Values at x = 0, 1, 2, ...
+    - max_points (int): Approximate number of points to keep.
+
+    Returns:
+    - tuple: (x, y) arrays of the kept points, including the first and last.
+    """
+    y = np.asarray(y, dtype=float)
+    if y.size <= max_points:
+        return np.arange(y.size), y
+    bounds = bucket_bounds(y.size, max_points // 2)
+    # Positions of the minimum and maximum of every bucket
+    buckets = [(start, y[start:end]) for start, end in zip(bounds[:-1], bounds[1:])]
+    lows = [start + bucket.argmin() for start, bucket in buckets]
+    highs = [start + bucket.argmax() for start, bucket in buckets]
+    x = np.unique(np.concatenate([[0, y.size - 1], lows, highs]))
+    return x, y[x]
 
 
 def compute_discounted_cash_flow(cash_flow, discount_rate):
-    discounted_cash_flows = [cash_flow[0]]
-    for i, cf in enumerate(cash_flow[1:]):
-        dcf = cf / (1 + discount_rate) ** (i + 1)
-        discounted_cash_flows.append(dcf)
-    return discounted_cash_flows
+    factors = discount_table(discount_rate, len(cash_flow)).factors(len(cash_flow))
+    return (np.asarray(cash_flow, dtype=float) * factors).tolist()
 
 
-def create_waterfall_chart(cash_flow, discount_rate, project_name="Project"):
-    discounted_cash_flows = compute_discounted_cash_flow(cash_flow, discount_rate)
-    print(discounted_cash_flows)
-    start_value = 0
-    values = [start_value] + discounted_cash_flows
-    end_value = sum(discounted_cash_flows)
-    values.append(end_value)
+def create_waterfall_chart(
+    cash_flow, discount_rate, project_name="Project", max_points=MAX_POINTS
+):
+    discounted_cash_flows = np.asarray(
+        compute_discounted_cash_flow(cash_flow, discount_rate)
+    )
+    labels = ["Year {}".format(i) for i in range(len(cash_flow))]
+
+    # Long horizons are drawn as buckets of consecutive years; the bars are
+    # relative, so bucket sums keep every running total exact
+    if len(discounted_cash_flows) > max_points:
+        bounds = bucket_bounds(len(discounted_cash_flows), max_points)
+        discounted_cash_flows = np.add.reduceat(discounted_cash_flows, bounds[:-1])
+        labels = [
+            "Years {}-{}".format(start, end - 1)
+            for start, end in zip(bounds[:-1], bounds[1:])
+        ]
 
-    labels = [
-        "Before investment",
-        *["Year {}".format(i) for i in range(len(cash_flow))],
-        "End of project",
-    ]
+    start_value = 0
+    end_value = discounted_cash_flows.sum()
+    values = [start_value, *discounted_cash_flows.tolist(), end_value]
+    labels = ["Before investment", *labels, "End of project"]
 
     fig = go.Figure(
         go.Waterfall(
@@ -44,10 +133,12 @@ def create_waterfall_chart(cash_flow, discount_rate, project_name="Project"):
 
 
 def plot_irr_gauge(irr_value, project_name="Project"):
+    # Cash flows without an IRR give NaN, shown as "n/a" on an empty gauge
+    has_irr = np.isfinite(irr_value)
     fig = go.Figure(
         go.Indicator(
-            mode="gauge+number",
-            value=irr_value * 100,
+            mode="gauge+number" if has_irr else "gauge",
+            value=irr_value * 100 if has_irr else None,
             number={"suffix": "%", "font": {"size": 40}},
             domain={"x": [0, 1], "y": [0, 1]},
             title={"text": "IRR for {}".format(project_name), "font": {"size": 24}},
@@ -69,48 +160,58 @@ def plot_irr_gauge(irr_value, project_name="Project"):
             },
         )
     )
+    if not has_irr:
+        fig.add_annotation(text="n/a", x=0.5, y=0.1, showarrow=False, font={"size": 40})
     fig.update_layout(font={"color": "darkblue", "family": "Arial"})
     return fig
 
 
-def plot_payback_period(cashflows, project_name="Project"):
-    cumulative_cashflows = [sum(cashflows[: i + 1]) for i in range(len(cashflows))]
-
-    payback_period = None
-    for i, val in enumerate(cumulative_cashflows):
-        if val >= 0:
-            payback_period = i
-            break
+def plot_payback_period(
+    cashflows,
+    project_name="Project",
+    cumulative=None,
+    max_points=MAX_POINTS,
+    discount_rate=None,
+):
+    cashflows = np.asarray(cashflows, dtype=float)
+    if cumulative is None:
+        cumulative = np.cumsum(cashflows)
+    lines = [("Cumulative Cash Flow", np.asarray(cumulative, dtype=float), None)]
+    if discount_rate is not None:
+        factors = discount_table(discount_rate, len(cashflows)).factors(len(cashflows))
+        lines.append(
+            ("Cumulative Discounted Cash Flow", np.cumsum(cashflows * factors), "dash")
+        )
 
     fig = go.Figure()
-
-    fig.add_trace(
-        go.Scatter(
-            x=list(range(len(cashflows))),
-            y=cumulative_cashflows,
-            mode="lines+markers",
-            name="Cumulative Cash Flow",
+    for label, cumulative_cashflows, dash in lines:
+        x, y = downsample_line(cumulative_cashflows, max_points)
+        fig.add_trace(
+            go.Scatter(
+                x=x,
+                y=y,
+                mode=(
+                    "lines+markers" if len(x) == len(cumulative_cashflows) else "lines"
+                ),
+                name=label,
+                line=dict(dash=dash),
+            )
         )
-    )
 
-    if payback_period is not None:
-        fig.add_shape(
-            type="line",
-            x0=payback_period,
-            y0=0,
-            x1=payback_period,
-            y1=cumulative_cashflows[payback_period],
-            line=dict(color="red", width=2),
-            name="Payback Period",
-        )
-        fig.add_annotation(
-            x=payback_period,
-            y=cumulative_cashflows[payback_period] / 2,
-            text=f"Payback at year {payback_period}",
-            showarrow=True,
-            arrowhead=4,
-            ax=90,
-            ay=-40,
+    # The same engine as the payback metrics, interpolated within the year
+    rates = None if discount_rate is None else [0.0, discount_rate]
+    paybacks = compute_payback_period_batch(
+        [cashflows] * len(lines), discount_rates=rates, fractional=True
+    )
+    for (label, _, dash), payback in zip(lines, paybacks):
+        if np.isnan(payback):
+            continue
+        kind = "Discounted payback" if dash else "Payback"
+        fig.add_vline(
+            x=payback,
+            line=dict(color="red", width=2, dash=dash),
+            annotation_text=f"{kind} at year {payback:.2f}",
+            annotation_position="top left" if dash else "top right",
         )
 
     fig.update_layout(
@@ -120,3 +221,32 @@ def plot_payback_period(cashflows, project_name="Project"):
     )
 
     return fig
+
+
+def plot_tornado(tornado, base_npv, project_name="Project", max_factors=10):
+    tornado = tornado.head(max_factors).iloc[::-1]
+    fig = go.Figure()
+    for column, label, color in (
+        ("low_npv", "Low value", "indianred"),
+        ("high_npv", "High value", "seagreen"),
+    ):
+        fig.add_trace(
+            go.Bar(
+                y=tornado["factor"],
+                x=tornado[column] - base_npv,
+                base=base_npv,
+                orientation="h",
+                name=label,
+                marker_color=color,
+                customdata=tornado[[column.replace("_npv", ""), column]],
+                hovertemplate="%{y} = %{customdata[0]:.4g}<br>"
+                "NPV: %{customdata[1]:,.0f}<extra></extra>",
+            )
+        )
+    fig.add_vline(x=base_npv, line_width=1, line_color="gray")
+    fig.update_layout(
+        title="NPV Tornado Chart for {}".format(project_name),
+        barmode="overlay",
+        xaxis_title="Net Present Value (NPV)",
+    )
+    return fig
@@ -0,0 +1,113 @@
+import threading
+
+import numpy as np
+
+INTERPOLATIONS = ("linear", "log_discount")
+
+
+class YieldCurve:
+    """
+    Annually compounded zero rates at a set of tenors.
+
+    Rates between tenors are interpolated either linearly in the zero rate or
+    linearly in the log discount factor (flat forward rates); beyond the first
+    and last tenor the nearest zero rate is kept. The discount factors of
+    whole periods are computed once and reused by every valuation against the
+    curve.
+    """
+
+    def __init__(self, tenors, rates, interpolation="linear"):
+        tenors = np.asarray(tenors, dtype=float)
+        rates = np.asarray(rates, dtype=float)
+        if tenors.ndim != 1 or tenors.shape != rates.shape or tenors.size == 0:
+            raise ValueError("tenors and rates must be 1-D arrays of the same length")
+        if np.any(tenors <= 0) or np.any(np.diff(tenors) <= 0):
+            raise ValueError("tenors must be positive and increasing")
+        if np.any(rates <= -1) or not np.all(np.isfinite(rates)):
+            raise ValueError("discount rates must be finite and greater than -1")
+        if interpolation not in INTERPOLATIONS:
+            raise ValueError(f"interpolation must be one of {INTERPOLATIONS}")
+        self.tenors = tenors
+        self.rates = rates
+        self.interpolation = interpolation
+        self._factors = np.ones(1)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_period_rates(cls, period_rates):
+        """
+        Build the curve implied by one-period rates.
+
+        Parameters:
+        - period_rates (array): Rate applying over period t, for t = 1..n.
+
+        Returns:
+        - YieldCurve: A curve whose discount factor at period t is the product
+          of 1 / (1 + rate) over periods 1..t.
+        """
+        period_rates = np.asarray(period_rates, dtype=float)
+        if np.any(period_rates <= -1) or not np.all(np.isfinite(period_rates)):
+            raise ValueError("discount rates must be finite and greater than -1")
+        tenors = np.arange(1, period_rates.size + 1, dtype=float)
+        zero_rates = np.expm1(np.cumsum(np.log1p(period_rates)) / tenors)
+        return cls(tenors, zero_rates, interpolation="log_discount")
+
+    def zero_rates(self, times):
+        """
+        Interpolate the zero rates at the given times.
+
+        Parameters:
+        - times (float or array): Times in years.
+
+        Returns:
+        - np.ndarray: Annually compounded zero rates.
+        """
+        times = np.asarray(times, dtype=float)
+        if self.interpolation == "linear":
+            return np.interp(times, self.tenors, self.rates)
+
+        # Linear in t * log(1 + z), i.e. constant forward rates between tenors
+        log_discount = self.tenors * np.log1p(self.rates)
+        inside = np.clip(times, self.tenors[0], self.tenors[-1])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            zero = np.expm1(np.interp(inside, self.tenors, log_discount) / inside)
+        return np.where(times > self.tenors[-1], self.rates[-1], zero)
+
+    def discount(self, times):
+        """
+        Return the discount factors at arbitrary times.
+
+        Parameters:
+        - times (float or array): Times in years, e.g. fractions from dates.
+
+        Returns:
+        - np.ndarray: Discount factors (1 + z(t)) ** -t.
+        """
+        times = np.asarray(times, dtype=float)
+        return np.exp(-times * np.log1p(self.zero_rates(times)))
+
+    def factors(self, n_periods):
+        """
+        Return the discount factors of periods 0..n_periods-1.
+
+        Parameters:
+        - n_periods (int): Number of periods.
+
+        Returns:
+        - np.ndarray: A read-only array of discount factors.
+        """
+        if n_periods > self._factors.size:
+            with self._lock:
+                if n_periods > self._factors.size:
+                    # Grow to the next power of two so longer series reuse it
+                    size = 1 << max(n_periods - 1, 0).bit_length()
+                    factors = self.discount(np.arange(size, dtype=float))
+                    factors.flags.writeable = False
+                    self._factors = factors
+        return self._factors[:n_periods]
+
+    def __repr__(self):
+        return (
+            f"YieldCurve(tenors={self.tenors.tolist()}, rates={self.rates.tolist()}, "
+            f"interpolation={self.interpolation!r})"
+        )
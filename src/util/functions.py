@@ -1,84 +1,760 @@
 import numpy as np
-from scipy.optimize import fsolve
+from util.cache import LRUCache
+from util.curves import YieldCurve
+
+# Candidate rates scanned to bracket IRR roots: fine steps over the usual
+# range, coarser steps for very high returns
+IRR_RATE_GRID = np.concatenate(
+    [np.linspace(-0.99, 1.0, 200), np.geomspace(1.0, 100.0, 41)[1:]]
+)
 
 
 class Validator:
+    """
+    Input checks of the single-series valuation functions.
+
+    Inputs are converted to one float array whose dtype, shape and finiteness
+    are checked in a single vectorized pass. Trusted internal callers that
+    already hold clean cash flows skip the checks with validate=False, which
+    the batch functions accept as well.
+    """
+
     @staticmethod
-    def validate_cash_flows(cash_flows):
-        if not isinstance(cash_flows, list) or not all(
-            isinstance(i, (int, float)) for i in cash_flows
-        ):
-            raise ValueError("cash_flows must be a list of numbers")
+    def validate_cash_flows(cash_flows, ndim=1):
+        """
+        Check cash flows and return them as a float array.
+
+        Parameters:
+        - cash_flows (list, tuple, np.ndarray, pd.Series or pd.DataFrame): One
+          series, or a (projects x periods) batch when ndim is 2.
+        - ndim (int): Expected number of dimensions.
+
+        Returns:
+        - np.ndarray: The cash flows as floats.
+        """
+        if hasattr(cash_flows, "to_numpy"):
+            cash_flows = cash_flows.to_numpy()
+        try:
+            array = np.asarray(cash_flows)
+        except ValueError:
+            # Ragged nested sequences
+            array = np.empty(0, dtype=object)
+        if array.dtype.kind not in "iuf" or array.ndim != ndim or array.size == 0:
+            shape = "sequence" if ndim == 1 else f"{ndim}-D array"
+            raise ValueError(f"cash_flows must be a non-empty {shape} of numbers")
+        array = array.astype(float, copy=False)
+        if not np.isfinite(array).all():
+            raise ValueError("cash_flows must be finite")
+        return array
+
+    @staticmethod
+    def validate_cash_flow_batch(cash_flows, mask=None):
+        """
+        Check a batch of cash-flow series and pad it into one float array.
+
+        Parameters:
+        - cash_flows (2-D array, pd.DataFrame or list of lists): One series per
+          project; series of different lengths are padded with zeros.
+        - mask (2-D bool array, optional): Marks the valid periods; values
+          outside it, such as NaN padding, are not checked.
+
+        Returns:
+        - tuple: (cash_flows, valid) as returned by pad_cash_flows, with valid
+          restricted to the mask.
+        """
+        if hasattr(cash_flows, "to_numpy"):
+            cash_flows = cash_flows.to_numpy()
+        try:
+            array = np.asarray(cash_flows)
+        except ValueError:
+            # Ragged nested sequences
+            array = np.empty(0, dtype=object)
+
+        if array.dtype.kind in "iuf":
+            if array.ndim != 2 or array.size == 0:
+                raise ValueError("cash_flows must be a non-empty 2-D array of numbers")
+            cash_flows, valid = pad_cash_flows(array)
+        else:
+            # Ragged series, or series holding non-numbers: check each one
+            if len(cash_flows) == 0:
+                raise ValueError("cash_flows must be a non-empty 2-D array of numbers")
+            series = []
+            for values in cash_flows:
+                try:
+                    values = np.asarray(values)
+                except ValueError:
+                    values = np.empty(0, dtype=object)
+                if (
+                    values.dtype.kind not in "iuf"
+                    or values.ndim != 1
+                    or not values.size
+                ):
+                    raise ValueError(
+                        "every cash-flow series must be a non-empty sequence of numbers"
+                    )
+                series.append(values)
+            cash_flows, valid = pad_cash_flows(series)
+
+        if mask is not None:
+            valid = valid & mask
+        if not (np.isfinite(cash_flows) | ~valid).all():
+            raise ValueError("cash_flows must be finite")
+        return cash_flows, valid
 
     @staticmethod
     def validate_discount_rate(discount_rate):
-        if not isinstance(discount_rate, (int, float)):
-            raise ValueError("discount_rate must be a number")
-        if not 0 <= discount_rate <= 1:
-            raise ValueError("discount_rate must be between 0 and 1")
+        """
+        Check a discount rate, a list of period rates or a yield curve.
+
+        Every rate, scalar or not, must be finite and greater than -1; the
+        rates of a YieldCurve are checked when it is built.
+
+        Parameters:
+        - discount_rate (float, list, np.ndarray, pd.Series or YieldCurve): The
+          rate to check.
+        """
+        if isinstance(discount_rate, YieldCurve):
+            return
+        if isinstance(discount_rate, (list, tuple, np.ndarray)) or hasattr(
+            discount_rate, "to_numpy"
+        ):
+            _check_rates(discount_rate)
+            return
+        if isinstance(discount_rate, bool) or not isinstance(
+            discount_rate, (int, float, np.integer, np.floating)
+        ):
+            raise ValueError(
+                "discount_rate must be a number, a list of rates or a curve"
+            )
+        _check_rates(discount_rate)
+
+
+def pad_cash_flows(cash_flow_series):
+    """
+    Stack cash-flow series of possibly different lengths into one 2-D array.
+
+    Parameters:
+    - cash_flow_series (list of lists or 2-D array): One cash-flow series per project.
+
+    Returns:
+    - tuple: (cash_flows, mask) where cash_flows is a (projects x periods) float array
+      padded with zeros and mask is a boolean array marking the real periods.
+    """
+    if isinstance(cash_flow_series, np.ndarray) and cash_flow_series.ndim == 2:
+        cash_flows = cash_flow_series.astype(float, copy=False)
+        return cash_flows, np.ones(cash_flows.shape, dtype=bool)
+
+    lengths = np.array([len(series) for series in cash_flow_series])
+    n_periods = lengths.max() if len(lengths) else 0
+    mask = np.arange(n_periods) < lengths[:, None]
+    cash_flows = np.zeros(mask.shape)
+    cash_flows[mask] = np.concatenate(
+        [np.asarray(series, dtype=float) for series in cash_flow_series]
+    )
+    return cash_flows, mask
+
+
+def _prepare_batch(cash_flows, mask=None, validate=True):
+    # Pad a batch into a float array with the periods outside the mask zeroed,
+    # checking it first unless the caller vouches for it
+    if validate:
+        cash_flows, valid = Validator.validate_cash_flow_batch(cash_flows, mask)
+    else:
+        cash_flows, valid = pad_cash_flows(cash_flows)
+        if mask is not None:
+            valid = valid & mask
+    if mask is not None:
+        cash_flows = np.where(mask, cash_flows, 0.0)
+    return cash_flows, valid
+
 
+def _check_rates(discount_rates):
+    rates = np.asarray(discount_rates, dtype=float)
+    if np.any(rates <= -1) or not np.all(np.isfinite(rates)):
+        raise ValueError("discount rates must be finite and greater than -1")
+    return rates
+
+
+def _cumulative_factors(rates, n_periods):
+    # 1 / (1 + r) ** t for t = 0..n_periods-1 as a running product of the
+    # one-period factor, one column per rate
+    factors = np.empty((n_periods, rates.size))
+    factors[:1] = 1.0
+    factors[1:] = 1 / (1 + rates)
+    return np.cumprod(factors, axis=0)
+
+
+class DiscountTable:
+    """
+    Discount and annuity factors of one rate up to a fixed horizon.
+
+    Tables are shared through discount_table(), so every metric computed for
+    the same rate reuses the same factors.
+    """
+
+    def __init__(self, discount_rate, horizon):
+        self.rate = float(_check_rates(discount_rate))
+        self.horizon = int(horizon)
+        factors = _cumulative_factors(np.array([self.rate]), self.horizon + 1)
+        self._factors = factors[:, 0]
+        # _annuities[n] = sum of the factors of periods 1..n
+        self._annuities = np.concatenate([[0.0], np.cumsum(self._factors[1:])])
+        self._factors.flags.writeable = False
+        self._annuities.flags.writeable = False
+
+    def factors(self, n_periods):
+        """
+        Return the discount factors of periods 0..n_periods-1.
+
+        Parameters:
+        - n_periods (int): Number of periods, at most horizon + 1.
+
+        Returns:
+        - np.ndarray: A read-only array of discount factors.
+        """
+        if n_periods > self.horizon + 1:
+            raise ValueError("n_periods exceeds the horizon of the table")
+        return self._factors[:n_periods]
+
+    def annuity(self, n):
+        """
+        Return the present value of 1 received at the end of each of n periods.
+
+        Parameters:
+        - n (int or array of ints): Number of periods, at most horizon.
+
+        Returns:
+        - float or np.ndarray: The annuity factor(s).
+        """
+        return self._annuities[n]
+
+
+# Tables keyed on (rate, horizon); horizons are rounded up to a power of two
+# so that short and slightly longer series share one table
+DISCOUNT_TABLES = LRUCache(maxsize=64)
+MIN_TABLE_HORIZON = 16
+MAX_TABLE_HORIZON = 1 << 20
+
+
+def discount_table(discount_rate, horizon):
+    """
+    Return the shared DiscountTable of a rate covering at least horizon periods.
+
+    Parameters:
+    - discount_rate (float): Discount rate.
+    - horizon (int): Last period needed.
 
-def compute_NPV(cash_flows: list, discount_rate: float) -> float:
+    Returns:
+    - DiscountTable: A cached table; its arrays are read-only.
+    """
+    rate = float(discount_rate)
+    horizon = max(MIN_TABLE_HORIZON, 1 << max(int(horizon) - 1, 0).bit_length())
+    return DISCOUNT_TABLES.get_or_compute(
+        (rate, horizon), lambda: DiscountTable(rate, horizon)
+    )
+
+
+def _period_rate_factors(period_rates, n_periods):
+    # Running product of 1 / (1 + r_t) along each row of one-period rates,
+    # returned as one column per row
+    period_rates = _check_rates(period_rates)
+    if period_rates.shape[1] < n_periods - 1:
+        raise ValueError(
+            f"{n_periods - 1} period rates are needed, got {period_rates.shape[1]}"
+        )
+    factors = np.empty((n_periods, len(period_rates)))
+    factors[:1] = 1.0
+    factors[1:] = 1 / (1 + period_rates[:, : n_periods - 1].T)
+    return np.cumprod(factors, axis=0)
+
+
+def _is_curve_list(discount_rates):
+    return isinstance(discount_rates, (list, tuple)) and any(
+        isinstance(rate, YieldCurve) for rate in discount_rates
+    )
+
+
+def discount_factors(discount_rates, n_periods):
+    """
+    Build the discount factor matrix of one or more rates or curves.
+
+    Parameters:
+    - discount_rates: One of
+      - a float or 1-D array of flat rates, discounting by 1 / (1 + r) ** t;
+      - a 2-D array of one-period rates, one row per scenario, where column
+        t - 1 applies over period t;
+      - a YieldCurve or a list of YieldCurves.
+    - n_periods (int): Number of periods, starting from t = 0.
+
+    Returns:
+    - np.ndarray: A (periods x rates) matrix of discount factors.
+    """
+    if isinstance(discount_rates, YieldCurve):
+        return discount_rates.factors(n_periods)[:, None]
+    if _is_curve_list(discount_rates):
+        return np.column_stack(
+            [_single_factors(rate, n_periods) for rate in discount_rates]
+        )
+    if np.ndim(discount_rates) == 2:
+        return _period_rate_factors(discount_rates, n_periods)
+
+    rates = np.atleast_1d(_check_rates(discount_rates))
+    if rates.size == 1:
+        return discount_table(rates[0], n_periods).factors(n_periods)[:, None]
+    return _cumulative_factors(rates, n_periods)
+
+
+def _single_factors(discount_rate, n_periods):
+    # Discount factors of a single project: a flat rate, a curve, or a vector
+    # of one-period rates
+    if isinstance(discount_rate, YieldCurve):
+        return discount_rate.factors(n_periods)
+    if np.ndim(discount_rate) == 1:
+        return _period_rate_factors(np.atleast_2d(discount_rate), n_periods)[:, 0]
+    return discount_table(_check_rates(discount_rate), n_periods).factors(n_periods)
+
+
+def _project_factors(discount_rates, n_projects, n_periods):
+    # Discount factors of each project at its own rate or curve, as
+    # (periods x projects), or a single column when they all share one
+    if isinstance(discount_rates, YieldCurve) or np.ndim(discount_rates) == 0:
+        return discount_factors(discount_rates, n_periods)
+    factors = discount_factors(discount_rates, n_periods)
+    if factors.shape[1] not in (1, n_projects):
+        raise ValueError(
+            f"{factors.shape[1]} discount rates given for {n_projects} projects"
+        )
+    return factors
+
+
+def compute_NPV_batch(cash_flows, discount_rates, mask=None, validate=True):
+    """
+    Compute the NPV of many cash-flow series against many discount rates at once.
+
+    Parameters:
+    - cash_flows (2-D array or list of lists): Cash flows as (projects x periods).
+      Series of different lengths are padded with zeros.
+    - discount_rates (float, array or curves): One or more discount rates or
+      curves, in any form accepted by discount_factors.
+    - mask (2-D bool array, optional): Marks the valid periods of a padded array.
+    - validate (bool): Check the cash flows; trusted callers pass False.
+
+    Returns:
+    - np.ndarray: A (projects x rates) matrix of NPVs.
+    """
+    cash_flows, _ = _prepare_batch(cash_flows, mask, validate)
+
+    return cash_flows @ discount_factors(discount_rates, cash_flows.shape[1])
+
+
+def compute_NPV_per_project(cash_flows, discount_rates, mask=None, validate=True):
+    """
+    Compute the NPV of each cash-flow series at its own discount rate.
+
+    Parameters:
+    - cash_flows (2-D array or list of lists): Cash flows as (projects x periods).
+    - discount_rates (float, array or curves): One rate, row of period rates or
+      curve per project, or a single shared one.
+    - mask (2-D bool array, optional): Marks the valid periods of a padded array.
+    - validate (bool): Check the cash flows; trusted callers pass False.
+
+    Returns:
+    - np.ndarray: The NPV of each project.
+    """
+    cash_flows, _ = _prepare_batch(cash_flows, mask, validate)
+    factors = _project_factors(discount_rates, *cash_flows.shape)
+    if factors.shape[1] == 1:
+        return cash_flows @ factors[:, 0]
+    return np.einsum("pt,tp->p", cash_flows, factors)
+
+
+def compute_NPV(cash_flows: list, discount_rate: float, validate=True) -> float:
     """Compute NPV based on cash flows and discount rate.
 
     Args:
         cash_flows (list): a list of annual cash flows
-        discount_rate (float): discount rate applied to cash flows
+        discount_rate (float, list or YieldCurve): discount rate applied to cash
+            flows, the rates of periods 1..n, or a yield curve
+        validate (bool): check the inputs; trusted callers pass False
 
     Returns:
         float: NPV of the cash flows
     """
-    Validator.validate_cash_flows(cash_flows)
-    Validator.validate_discount_rate(discount_rate)
+    if validate:
+        cash_flows = Validator.validate_cash_flows(cash_flows)
+        Validator.validate_discount_rate(discount_rate)
+    else:
+        cash_flows = np.asarray(cash_flows, dtype=float)
 
-    npv = cash_flows[0] + sum(
-        [cf / (1 + discount_rate) ** t for t, cf in enumerate(cash_flows[1:], start=1)]
-    )
-    return npv
+    factors = _single_factors(discount_rate, len(cash_flows))
+    return float(np.dot(cash_flows, factors))
+
+
+def compute_IRR_batch(
+    cash_flows, mask=None, tol=1e-10, max_iter=100, times=None, validate=True
+):
+    """
+    Compute the IRR of many cash-flow series simultaneously.
 
+    Roots are bracketed by scanning the NPV of every series over a grid of
+    candidate rates, then refined with a safeguarded Newton iteration that
+    falls back to bisection whenever a step leaves the bracket. When a series
+    has several sign changes on the grid, the lowest root is returned.
 
-def compute_IRR(cash_flows: list) -> float:
+    Parameters:
+    - cash_flows (2-D array or list of lists): Cash flows as (projects x periods).
+    - mask (2-D bool array, optional): Marks the valid periods of a padded array.
+    - tol (float): Convergence tolerance on the rate.
+    - max_iter (int): Maximum number of refinement iterations.
+    - times (1-D or 2-D array, optional): Time of each cash flow in years, shared
+      or per project, e.g. from year_fractions or period_times; defaults to
+      the period index.
+    - validate (bool): Check the cash flows; trusted callers pass False.
+
+    Returns:
+    - tuple: (irr, converged, n_roots) arrays with one entry per project. irr is
+      NaN where no root was bracketed or the iteration did not converge, and
+      n_roots > 1 flags projects with multiple IRRs.
+    """
+    cash_flows, _ = _prepare_batch(cash_flows, mask, validate)
+    n_projects, n_periods = cash_flows.shape
+    rows = np.arange(n_projects)
+
+    # Bracket the roots by scanning NPV over the candidate rate grid
+    with np.errstate(over="ignore", invalid="ignore"):
+        if times is None:
+            periods = np.arange(n_periods)
+            grid_npv = cash_flows @ discount_factors(IRR_RATE_GRID, n_periods)
+        else:
+            periods = _check_times(times, cash_flows.shape)
+            grid_npv = _timed_present_values(cash_flows, periods, IRR_RATE_GRID)
+    finite = np.isfinite(grid_npv)
+    positive = grid_npv >= 0
+    crossings = (positive[:, :-1] != positive[:, 1:]) & finite[:, :-1] & finite[:, 1:]
+    n_roots = crossings.sum(axis=1)
+
+    first = crossings.argmax(axis=1)
+    lo = IRR_RATE_GRID[first]
+    hi = IRR_RATE_GRID[first + 1]
+    lo_positive = positive[rows, first]
+    irr = (lo + hi) / 2
+    converged = np.zeros(n_projects, dtype=bool)
+    active = n_roots > 0
+
+    for _ in range(max_iter):
+        idx = np.flatnonzero(active)
+        if idx.size == 0:
+            break
+        x = irr[idx]
+        cf = cash_flows[idx]
+        t = periods if periods.ndim == 1 else periods[idx]
+        with np.errstate(over="ignore", invalid="ignore", divide="ignore"):
+            discounted = cf * (1 + x[:, None]) ** -t
+            f = discounted.sum(axis=1)
+            f_prime = -(discounted * t).sum(axis=1) / (1 + x)
+
+            # Shrink the bracket around the sign change
+            moves_lo = (f >= 0) == lo_positive[idx]
+            lo[idx] = np.where(moves_lo, x, lo[idx])
+            hi[idx] = np.where(moves_lo, hi[idx], x)
+
+            # Newton step, replaced by bisection when it leaves the bracket
+            step = x - f / f_prime
+        inside = (step > lo[idx]) & (step < hi[idx])
+        x_new = np.where(inside, step, (lo[idx] + hi[idx]) / 2)
+
+        done = (np.abs(x_new - x) < tol) | (f == 0) | (hi[idx] - lo[idx] < tol)
+        irr[idx] = np.where(f == 0, x, x_new)
+        converged[idx[done]] = True
+        active[idx[done]] = False
+
+    irr = np.where(converged, irr, np.nan)
+    return irr, converged, n_roots
+
+
+def compute_IRR(cash_flows: list, validate=True) -> float:
     """Compute IRR based on cash flows.
 
     Args:
         cash_flows (list): a list of annual cash flows
+        validate (bool): check the inputs; trusted callers pass False
 
     Returns:
         float: IRR of the cash flows
     """
-    Validator.validate_cash_flows(cash_flows)
+    if validate:
+        cash_flows = Validator.validate_cash_flows(cash_flows)
 
-    # Define the NPV function with rate as the variable to solve for
-    npv = lambda rate: np.sum([cf / (1 + rate) ** i for i, cf in enumerate(cash_flows)])
+    irr, converged, _ = compute_IRR_batch(
+        np.array([cash_flows], dtype=float), validate=False
+    )
+    if not converged[0]:
+        raise RuntimeError("Failed to compute IRR")
+    return float(irr[0])
 
-    # Use fsolve to find the root (IRR)
-    try:
-        irr = fsolve(npv, 0.1)[0]  # 0.1 is an initial guess
-    except Exception as e:
-        raise RuntimeError("Failed to compute IRR") from e
-    return irr
 
+def year_fractions(dates, day_count=365.0):
+    """
+    Convert payment dates into years elapsed since each series' first date.
+
+    Parameters:
+    - dates (array-like): Dates as datetime64, strings or date objects; a 1-D
+      series or one series per project (shorter series are padded with NaT).
+    - day_count (float): Days per year, 365 for Actual/365.
+
+    Returns:
+    - np.ndarray: Year fractions of the same shape, NaN where a date is missing.
+    """
+    if len(dates) and not isinstance(dates, np.ndarray) and np.ndim(dates[0]) == 1:
+        width = max(len(series) for series in dates)
+        padded = np.full((len(dates), width), np.datetime64("NaT"), "datetime64[D]")
+        for row, series in zip(padded, dates):
+            row[: len(series)] = np.asarray(series, dtype="datetime64[D]")
+        dates = padded
+    dates = np.asarray(dates, dtype="datetime64[D]")
+    elapsed = (dates - dates[..., :1]) / np.timedelta64(1, "D")
+    return elapsed / day_count
+
+
+def period_times(n_periods, periods_per_year=1, convention="end"):
+    """
+    Time in years of each period of a regularly spaced model.
+
+    Parameters:
+    - n_periods (int): Number of periods, including the investment at period 0.
+    - periods_per_year (int): 1 for annual, 12 for monthly models.
+    - convention (str): "end" for cash flows at the end of each period, "mid"
+      for the mid-period convention. The investment stays at time 0.
+
+    Returns:
+    - np.ndarray: Times in years.
+    """
+    if convention not in ("end", "mid"):
+        raise ValueError("convention must be 'end' or 'mid'")
+    periods = np.arange(n_periods, dtype=float)
+    if convention == "mid":
+        periods[1:] -= 0.5
+    return periods / periods_per_year
+
+
+def _check_times(times, shape):
+    times = np.asarray(times, dtype=float)
+    if times.shape not in (shape, shape[1:]):
+        raise ValueError(
+            f"times of shape {times.shape} do not match cash flows {shape}"
+        )
+    return np.nan_to_num(times, nan=0.0)
+
+
+def _by_time(cash_flows, times):
+    # Cash flows summed per distinct payment time, so every discount factor is
+    # evaluated once per time instead of once per cash flow
+    if times.ndim == 1:
+        return cash_flows, times
+    from scipy.sparse import csr_matrix
+
+    unique, inverse = np.unique(times, return_inverse=True)
+    rows = np.broadcast_to(np.arange(len(cash_flows))[:, None], times.shape)
+    weights = csr_matrix(
+        (cash_flows.ravel(), (rows.ravel(), inverse.ravel())),
+        shape=(len(cash_flows), unique.size),
+    )
+    return weights, unique
+
+
+def _timed_present_values(cash_flows, times, discount_rates):
+    # (projects x rates) present values of cash flows paid at times in years
+    weights, unique = _by_time(cash_flows, times)
+    if isinstance(discount_rates, YieldCurve):
+        return weights @ discount_rates.discount(unique)[:, None]
+    if _is_curve_list(discount_rates):
+        return weights @ np.column_stack(
+            [curve.discount(unique) for curve in discount_rates]
+        )
+    rates = np.atleast_1d(_check_rates(discount_rates))
+    return weights @ np.exp(-np.outer(unique, np.log1p(rates)))
+
+
+def compute_XNPV_batch(cash_flows, times, discount_rates, mask=None, validate=True):
+    """
+    Compute the NPV of many cash-flow series paid at arbitrary times.
+
+    Parameters:
+    - cash_flows (2-D array or list of lists): Cash flows as (projects x periods).
+    - times (1-D or 2-D array): Time of each cash flow in years, shared by all
+      projects or one row per project, from year_fractions or period_times.
+    - discount_rates (float, array or curves): Annually compounded rates or
+      YieldCurves.
+    - mask (2-D bool array, optional): Marks the valid periods of a padded array.
+    - validate (bool): Check the cash flows; trusted callers pass False.
+
+    Returns:
+    - np.ndarray: A (projects x rates) matrix of NPVs.
+    """
+    cash_flows, _ = _prepare_batch(cash_flows, mask, validate)
+    times = _check_times(times, cash_flows.shape)
+    return np.asarray(_timed_present_values(cash_flows, times, discount_rates))
+
+
+def compute_XNPV(cash_flows, dates, discount_rate, day_count=365.0):
+    """
+    Compute the NPV of cash flows paid on given dates, discounted to the first.
+
+    Parameters:
+    - cash_flows (list or array): Cash flows, the investment first.
+    - dates (array-like): Payment date of each cash flow.
+    - discount_rate (float or YieldCurve): Annually compounded discount rate.
+    - day_count (float): Days per year.
+
+    Returns:
+    - float: XNPV of the cash flows.
+    """
+    cash_flows = Validator.validate_cash_flows(cash_flows)
+    if len(dates) != len(cash_flows):
+        raise ValueError("cash_flows and dates must have the same length")
+    times = year_fractions(dates, day_count)
+    npv = compute_XNPV_batch([cash_flows], times, discount_rate, validate=False)
+    return float(npv[0, 0])
+
+
+def compute_XIRR_batch(cash_flows, dates, mask=None, day_count=365.0, **kwargs):
+    """
+    Compute the IRR of many cash-flow series paid on given dates.
+
+    Parameters:
+    - cash_flows (2-D array or list of lists): Cash flows as (projects x periods).
+    - dates (array-like): Payment dates, shared or one series per project.
+    - mask (2-D bool array, optional): Marks the valid periods of a padded array.
+    - day_count (float): Days per year.
+    - **kwargs: tol, max_iter and validate of compute_IRR_batch.
+
+    Returns:
+    - tuple: (xirr, converged, n_roots), see compute_IRR_batch.
+    """
+    times = year_fractions(dates, day_count)
+    if mask is None and times.ndim == 2:
+        mask = ~np.isnan(times)
+    return compute_IRR_batch(cash_flows, mask, times=times, **kwargs)
+
+
+def compute_XIRR(cash_flows, dates, day_count=365.0):
+    """
+    Compute the IRR of cash flows paid on given dates.
 
-def compute_payback_period(cash_flows: list) -> float:
+    Parameters:
+    - cash_flows (list or array): Cash flows, the investment first.
+    - dates (array-like): Payment date of each cash flow.
+    - day_count (float): Days per year.
+
+    Returns:
+    - float: XIRR of the cash flows.
+    """
+    cash_flows = Validator.validate_cash_flows(cash_flows)
+    if len(dates) != len(cash_flows):
+        raise ValueError("cash_flows and dates must have the same length")
+    xirr, converged, _ = compute_XIRR_batch(
+        [cash_flows], dates, day_count=day_count, validate=False
+    )
+    if not converged[0]:
+        raise RuntimeError("Failed to compute XIRR")
+    return float(xirr[0])
+
+
+def payback_from_position(position, cash_flows, fractional=False):
+    """
+    Locate the payback period from the running cash position of each project.
+
+    Parameters:
+    - position (2-D array): Cumulative inflows of periods 1..n minus the initial
+      investment, as (projects x periods).
+    - cash_flows (2-D array): The (possibly discounted) cash flows of periods 0..n.
+    - fractional (bool): Interpolate within the period of recovery, assuming its
+      cash flow arrives evenly.
+
+    Returns:
+    - np.ndarray: The payback period of each project, or NaN where the
+      investment is never recovered.
+    """
+    if position.shape[1] == 0:
+        return np.full(len(position), np.nan)
+    recovered = position >= 0
+    paid_back = recovered.any(axis=1)
+    period = recovered.argmax(axis=1)
+    payback = period + 1.0
+    if fractional:
+        rows = np.arange(len(period))
+        shortfall = -np.where(
+            period > 0, position[rows, period - 1], -np.abs(cash_flows[:, 0])
+        )
+        inflow = cash_flows[rows, period + 1]
+        fraction = np.divide(
+            shortfall,
+            inflow,
+            out=np.zeros(len(period)),
+            where=paid_back & (shortfall > 0),
+        )
+        payback = period + fraction
+    return np.where(paid_back, payback, np.nan)
+
+
+def compute_payback_period(
+    cash_flows: list, discount_rate=None, fractional=False, validate=True
+):
     """
     Compute the payback period given an array of cash flows.
 
     Parameters:
     - cash_flows (list or array): An array of cash flows where the index represents the time period (starting from 0).
+    - discount_rate (float, list or YieldCurve, optional): Discount the cash flows first, giving the discounted
+      payback period.
+    - fractional (bool): Interpolate within the year of recovery.
+    - validate (bool): Check the inputs; trusted callers pass False.
 
     Returns:
-    - int: The payback period rounded to the nearest whole number.
+    - int or float: The first period whose cumulative inflows cover the initial
+      investment (a fraction of years when fractional), or None if never.
+    """
+    if validate:
+        cash_flows = Validator.validate_cash_flows(cash_flows)
+    if np.ndim(discount_rate) == 1:
+        # The rates of periods 1..n of this one project
+        discount_rate = [discount_rate]
+    payback = compute_payback_period_batch(
+        [cash_flows],
+        discount_rates=discount_rate,
+        fractional=fractional,
+        validate=False,
+    )[0]
+    if np.isnan(payback):
+        return None
+    return float(payback) if fractional else int(payback)
+
+
+def compute_payback_period_batch(
+    cash_flows, mask=None, discount_rates=None, fractional=False, validate=True
+):
     """
-    Validator.validate_cash_flows(cash_flows)
-    initial_investment = abs(cash_flows[0])
-    cumulative_cash_flow = 0
+    Compute the simple or discounted payback period of many cash-flow series at once.
+
+    Parameters:
+    - cash_flows (2-D array or list of lists): Cash flows as (projects x periods),
+      where the first period holds the initial investment.
+    - mask (2-D bool array, optional): Marks the valid periods of a padded array.
+    - discount_rates (float, array or curves, optional): One rate or curve per
+      project, or a shared one, for the discounted payback period.
+    - fractional (bool): Interpolate within the period of recovery.
+    - validate (bool): Check the cash flows; trusted callers pass False.
 
-    for period, cash_flow in enumerate(cash_flows[1:], start=1):
-        cumulative_cash_flow += cash_flow
-        if cumulative_cash_flow >= initial_investment:
-            return period
+    Returns:
+    - np.ndarray: The first period in which the cumulative cash inflows cover the
+      initial investment, or NaN where the investment is never recovered.
+    """
+    cash_flows, _ = _prepare_batch(cash_flows, mask, validate)
+    if discount_rates is not None:
+        cash_flows = cash_flows * _project_factors(discount_rates, *cash_flows.shape).T
 
-    return None
+    position = np.cumsum(cash_flows[:, 1:], axis=1) - np.abs(cash_flows[:, :1])
+    return payback_from_position(position, cash_flows, fractional)
 
 
 def extend_cashflows_for_LCM(cash_flows, lcm_duration):
@@ -94,7 +770,12 @@ def extend_cashflows_for_LCM(cash_flows, lcm_duration):
     """
 
     # Find out how many times the project needs to be repeated
-    repetitions = lcm_duration // (len(cash_flows) - 1)
+    repetitions, remainder = divmod(lcm_duration, len(cash_flows) - 1)
+    if remainder:
+        raise ValueError(
+            f"lcm_duration {lcm_duration} is not a multiple of the lifespan "
+            f"{len(cash_flows) - 1}"
+        )
 
     # Extend the cash flows without the initial investment
     extended_cashflows = [cash_flows[0]]  # Include initial investment only once
@@ -117,7 +798,22 @@ def calculate_EAA(npv, discount_rate, n):
     - float: The Effective Annual Annuity (EAA).
     """
 
-    annuity_factor = discount_rate / (1 - (1 + discount_rate) ** -n)
+    periods = np.asarray(n)
+    if (
+        np.ndim(discount_rate) == 0
+        and np.all(periods % 1 == 0)
+        and np.all((periods >= 1) & (periods <= MAX_TABLE_HORIZON))
+    ):
+        # A whole number of periods at one rate: read the shared table
+        table = discount_table(discount_rate, periods.max())
+        annuity_factor = 1 / table.annuity(periods.astype(int))
+    else:
+        # 1 - (1 + r) ** -n, accurate for rates close to zero; at a zero rate
+        # the annuity is spread evenly, as in the discount table
+        rates = np.asarray(discount_rate, dtype=float)
+        discount = -np.expm1(-periods * np.log1p(rates))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            annuity_factor = np.where(rates == 0, 1 / periods, rates / discount)
     eaa = npv * annuity_factor
 
     return eaa
@@ -130,18 +826,76 @@ def profitability_index(cash_flows, discount_rate):
     Parameters:
     - cash_flows (list or array): An array of cash flows where the first value is the initial investment (negative),
       and the subsequent values are expected cash inflows.
-    - discount_rate (float): Discount rate used to calculate the present value of future cash flows.
+    - discount_rate (float, list or YieldCurve): Discount rate used to calculate the present value of future
+      cash flows, the rates of periods 1..n, or a yield curve.
 
     Returns:
     - float: Profitability Index.
     """
 
     # Calculate the present value of each cash inflow
-    discounted_cashflows = [
-        cf / (1 + discount_rate) ** i for i, cf in enumerate(cash_flows)
-    ]
+    factors = _single_factors(discount_rate, len(cash_flows))
+    discounted_cashflows = np.asarray(cash_flows, dtype=float) * factors
 
     # The PV of expected future cash inflows is the sum of discounted cashflows minus the initial investment
     pv_cash_inflows = np.sum(discounted_cashflows) - cash_flows[0]
 
     return pv_cash_inflows / -cash_flows[0]
+
+
+def profitability_index_from_npv(npv, initial_investment):
+    """
+    Compute the Profitability Index from an NPV already computed.
+
+    Parameters:
+    - npv (float or array): NPV including the initial investment.
+    - initial_investment (float or array): Cash flow of period 0 (negative),
+      broadcastable against npv.
+
+    Returns:
+    - float or np.ndarray: PV of the cash inflows per unit of investment; inf
+      or NaN where nothing is invested.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (npv - initial_investment) / -initial_investment
+
+
+def profitability_index_batch(cash_flows, discount_rates, mask=None, validate=True):
+    """
+    Compute the Profitability Index of many cash-flow series against many discount rates.
+
+    Parameters:
+    - cash_flows (2-D array or list of lists): Cash flows as (projects x periods),
+      where the first period holds the (negative) initial investment.
+    - discount_rates (float, array or curves): One or more discount rates or
+      curves, in any form accepted by discount_factors.
+    - mask (2-D bool array, optional): Marks the valid periods of a padded array.
+    - validate (bool): Check the cash flows; trusted callers pass False.
+
+    Returns:
+    - np.ndarray: A (projects x rates) matrix of profitability indices.
+    """
+    cash_flows, _ = _prepare_batch(cash_flows, mask, validate)
+    npv = compute_NPV_batch(cash_flows, discount_rates, validate=False)
+    return profitability_index_from_npv(npv, cash_flows[:, :1])
+
+
+def compute_ROI_batch(cash_flows, mask=None, validate=True):
+    """
+    Compute the yearly and average ROI of many cash-flow series.
+
+    Parameters:
+    - cash_flows (2-D array or list of lists): Cash flows as (projects x periods),
+      where the first period holds the initial investment.
+    - mask (2-D bool array, optional): Marks the valid periods of a padded array.
+    - validate (bool): Check the cash flows; trusted callers pass False.
+
+    Returns:
+    - tuple: (roi_each_year, mean_roi) in percent. roi_each_year is a
+      (projects x periods - 1) array, NaN outside each series; mean_roi has one
+      entry per project.
+    """
+    cash_flows, valid = _prepare_batch(cash_flows, mask, validate)
+    roi_each_year = cash_flows[:, 1:] / np.abs(cash_flows[:, :1]) * 100
+    roi_each_year = np.where(valid[:, 1:], roi_each_year, np.nan)
+    return roi_each_year, np.nanmean(roi_each_year, axis=1)
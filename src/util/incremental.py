@@ -0,0 +1,168 @@
+import numpy as np
+from util.functions import compute_IRR_batch, discount_table, payback_from_position
+from util.model_spec import get_model
+
+
+class IncrementalValuation:
+    """
+    NPV, profitability index, payback period and IRR of one cash-flow series,
+    kept up to date as single periods are edited.
+
+    An edit moves the NPV by the change times the discount factor of its
+    period, shifts the cumulative cash flows from that period on, and refines
+    the IRR with a few Newton steps started from the previous root. A full IRR
+    search is only run when the warm start fails.
+    """
+
+    def __init__(self, cash_flows, discount_rate, tol=1e-10, max_iter=20):
+        self._cash_flows = np.array(cash_flows, dtype=float)
+        self.discount_rate = float(discount_rate)
+        self.tol = tol
+        self.max_iter = max_iter
+
+        n_periods = len(self._cash_flows)
+        self._factors = discount_table(self.discount_rate, n_periods).factors(n_periods)
+        self._periods = np.arange(n_periods)
+        self.npv = float(self._cash_flows @ self._factors)
+        self._cumulative = np.cumsum(self._cash_flows[1:])
+        self.irr = self._search_irr()
+
+    @property
+    def cash_flows(self):
+        """The current cash flows as a list."""
+        return self._cash_flows.tolist()
+
+    @property
+    def profitability_index(self):
+        """PV of the cash inflows per unit of initial investment."""
+        initial_investment = self._cash_flows[0]
+        return (self.npv - initial_investment) / -initial_investment
+
+    @property
+    def payback_period(self):
+        """Years until the cumulative inflows recover the investment, or None."""
+        position = self._cumulative - abs(self._cash_flows[0])
+        payback = payback_from_position(
+            position[None, :], self._cash_flows[None, :], fractional=True
+        )[0]
+        return None if np.isnan(payback) else float(payback)
+
+    def _apply(self, period, value):
+        delta = value - self._cash_flows[period]
+        if delta == 0:
+            return False
+        self._cash_flows[period] = value
+        self.npv += delta * self._factors[period]
+        if period > 0:
+            self._cumulative[period - 1 :] += delta
+        return True
+
+    def _search_irr(self):
+        irr, _, _ = compute_IRR_batch(self._cash_flows[None, :], validate=False)
+        return float(irr[0])
+
+    def _refine_irr(self):
+        # Newton iteration from the previous root; falls back to the full
+        # bracketing search when it diverges or there was no previous root
+        x = self.irr
+        if np.isnan(x):
+            return self._search_irr()
+        with np.errstate(over="ignore", invalid="ignore", divide="ignore"):
+            for _ in range(self.max_iter):
+                discounted = self._cash_flows * (1 + x) ** -self._periods
+                f = discounted.sum()
+                f_prime = -(discounted * self._periods).sum() / (1 + x)
+                step = f / f_prime
+                x = x - step
+                if not np.isfinite(x) or x <= -1:
+                    break
+                if abs(step) < self.tol:
+                    return float(x)
+        return self._search_irr()
+
+    def update(self, period, value):
+        """
+        Set the cash flow of one period and update every metric.
+
+        Parameters:
+        - period (int): Period to change, 0 being the initial investment.
+        - value (float): New cash flow of the period.
+        """
+        if self._apply(period, float(value)):
+            self.irr = self._refine_irr()
+
+    def set_cash_flows(self, cash_flows):
+        """
+        Move to a new series by updating only the periods that differ.
+
+        Parameters:
+        - cash_flows (list or array): The new series, of the same length.
+        """
+        cash_flows = np.asarray(cash_flows, dtype=float)
+        if cash_flows.shape != self._cash_flows.shape:
+            raise ValueError("cash_flows must keep the number of periods")
+        changed = [
+            self._apply(period, cash_flows[period])
+            for period in np.flatnonzero(cash_flows != self._cash_flows)
+        ]
+        if any(changed):
+            self.irr = self._refine_irr()
+
+
+def statement_cash_flows(project, statement, tax_rate):
+    """
+    Recompute the cash flows of an edited financial statement.
+
+    Line items are taken as shown, and EBT, net income and operating cash
+    flow are re-derived from them; an edited operating cash flow cell is used
+    as is.
+
+    Parameters:
+    - project (str): Key of the project spec.
+    - statement (pd.DataFrame): The statement in the layout of
+      transpose_and_format, with a "Category" column and "Year <n>" columns.
+    - tax_rate (float): Tax rate applied to the EBT.
+
+    Returns:
+    - np.ndarray: Cash flows of years 0..lifespan.
+    """
+    model = get_model(project)
+    statement = statement.set_index("Category")
+    years = [f"Year {year}" for year in range(model.lifespan + 1)]
+    values = statement.loc[:, years].to_numpy(dtype=float)
+    rows = dict(zip(statement.index, values))
+
+    derived = model.derive_rows(rows, tax_rate)
+    cash_flows = derived["Operating Cash Flow"]
+    cash_flows[0] = rows[model.investment_name][0]
+    return cash_flows
+
+
+def statement_edits(project, original, edited, tax_rate):
+    """
+    Translate edits of a financial statement into the edited cash flows.
+
+    Only the "Year <n>" columns are compared, so columns a grid component
+    adds to the edited frame are ignored.
+
+    Parameters:
+    - project (str): Key of the project spec.
+    - original (pd.DataFrame): The statement as generated.
+    - edited (pd.DataFrame): The same statement after user edits.
+    - tax_rate (float): Tax rate applied to the EBT.
+
+    Returns:
+    - np.ndarray: Cash flows of years 0..lifespan after the edits.
+    """
+    cash_flows = statement_cash_flows(project, edited, tax_rate)
+    years = [f"Year {year}" for year in range(get_model(project).lifespan + 1)]
+    original_ocf, edited_ocf = (
+        statement.set_index("Category")
+        .loc["Operating Cash Flow", years]
+        .to_numpy(dtype=float)
+        for statement in (original, edited)
+    )
+    for period in np.flatnonzero(edited_ocf != original_ocf):
+        if period > 0:
+            cash_flows[period] = edited_ocf[period]
+    return cash_flows
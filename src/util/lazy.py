@@ -0,0 +1,99 @@
+import threading
+from collections.abc import Mapping
+
+
+class LazyGraph(Mapping):
+    """
+    Named results that are computed on first access.
+
+    Each node is a function of other nodes, listed by name when it is added.
+    Reading a node evaluates its dependencies first and keeps every value, so
+    a result shared by several views is computed once and a result that is
+    never read is never computed. A graph can be shared across threads.
+    """
+
+    def __init__(self):
+        self._nodes = {}
+        self._values = {}
+        self._lock = threading.RLock()
+
+    def add(self, name, func, *dependencies):
+        """
+        Register a node.
+
+        Parameters:
+        - name (hashable): Node name.
+        - func (callable): Called with the values of the dependencies, in order.
+        - *dependencies: Names of nodes that must already be registered.
+
+        Returns:
+        - LazyGraph: The graph, so calls can be chained.
+        """
+        if name in self._nodes:
+            raise ValueError(f"node {name!r} is already defined")
+        missing = [dependency for dependency in dependencies if dependency not in self]
+        if missing:
+            raise KeyError(f"node {name!r} depends on undefined nodes {missing}")
+        self._nodes[name] = (func, dependencies)
+        return self
+
+    def __getitem__(self, name):
+        with self._lock:
+            if name not in self._values:
+                func, dependencies = self._nodes[name]
+                self._values[name] = func(*(self[dep] for dep in dependencies))
+            return self._values[name]
+
+    def __contains__(self, name):
+        return name in self._nodes
+
+    def __iter__(self):
+        return iter(self._nodes)
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def evaluated(self):
+        """
+        List the nodes computed so far.
+
+        Returns:
+        - list: Names of the evaluated nodes, in registration order.
+        """
+        return [name for name in self._nodes if name in self._values]
+
+    def view(self, prefix):
+        """
+        Expose the nodes named (prefix, key) as a mapping keyed on key.
+
+        Parameters:
+        - prefix (hashable): First element of the node names.
+
+        Returns:
+        - GraphView: A read-only view that evaluates nodes on access.
+        """
+        return GraphView(self, prefix)
+
+
+class GraphView(Mapping):
+    """The nodes of a LazyGraph that share a name prefix."""
+
+    def __init__(self, graph, prefix):
+        self._graph = graph
+        self._prefix = prefix
+
+    def __getitem__(self, key):
+        return self._graph[(self._prefix, key)]
+
+    def __contains__(self, key):
+        return (self._prefix, key) in self._graph
+
+    def __iter__(self):
+        return (
+            name[1]
+            for name in self._graph
+            if isinstance(name, tuple) and name[0] == self._prefix
+        )
+
+    def __len__(self):
+        return sum(1 for _ in self)
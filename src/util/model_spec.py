@@ -0,0 +1,382 @@
+import json
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+MODELS_DIR = Path(__file__).resolve().parent.parent / "models"
+
+# Effect of each line item type on EBT and operating cash flow
+LINE_ITEM_TYPES = ("revenue", "expense", "depreciation", "capex", "memo")
+
+
+def _bounds(bounds):
+    low, high = bounds or (None, None)
+    return (
+        -np.inf if low is None else float(low),
+        np.inf if high is None else float(high),
+    )
+
+
+# Label of the net cash-flow series kept below the statement rows
+CASH_FLOW_ROW = "Cash Flow"
+
+
+class FinancialModel:
+    """
+    The yearly financial statement of one scenario as a single float64 array.
+
+    Row i of values holds line item labels[i] for years 0 to lifespan; a last
+    row holds the net cash flows (the investment in year 0, then operating
+    cash flow). Rows are read-only views into the array, and DataFrames are
+    only built when a statement is displayed.
+    """
+
+    __slots__ = ("name", "labels", "index", "values")
+
+    def __init__(self, name, labels, values):
+        self.name = name
+        self.labels = tuple(labels)
+        self.index = {label: i for i, label in enumerate(self.labels)}
+        self.index[CASH_FLOW_ROW] = len(self.labels)
+        if values.shape[0] != len(self.index):
+            raise ValueError("values must have one row per label plus cash flows")
+        self.values = np.ascontiguousarray(values, dtype=float)
+        # Statements are shared between sessions through the valuation cache
+        self.values.flags.writeable = False
+
+    def __getitem__(self, label):
+        return self.values[self.index[label]]
+
+    def __contains__(self, label):
+        return label in self.index
+
+    @property
+    def n_years(self):
+        return self.values.shape[1]
+
+    @property
+    def cash_flows(self):
+        """Net cash flows of years 0..lifespan, a view into values."""
+        return self.values[-1]
+
+    @property
+    def operating_cash_flow(self):
+        """Operating cash flow of years 1..lifespan, a view into values."""
+        return self.values[self.index["Operating Cash Flow"], 1:]
+
+    def to_dataframe(self):
+        """
+        Build the statement with one row per year.
+
+        Returns:
+        - pd.DataFrame: A "Year" column and one column per line item.
+        """
+        df = pd.DataFrame(self.values[:-1].T, columns=list(self.labels))
+        df.insert(0, "Year", np.arange(self.n_years))
+        return df
+
+    def to_statement(self):
+        """
+        Build the statement with one row per line item, as shown on the pages.
+
+        Returns:
+        - pd.DataFrame: A "Category" column and "Year <n>" columns.
+        """
+        years = [f"Year {year}" for year in range(self.n_years)]
+        df = pd.DataFrame(self.values[:-1], columns=years)
+        df.insert(0, "Category", list(self.labels))
+        return df
+
+    def __repr__(self):
+        return f"FinancialModel({self.name!r}, {len(self.labels)} rows x {self.n_years} years)"
+
+
+class CompiledModel:
+    """
+    A project definition compiled into an array-based cash-flow kernel.
+
+    A project is described by a JSON spec with these keys:
+    - name (str): Display name of the project.
+    - lifespan (int): Number of operating years.
+    - inputs (dict): Input name -> {"default": value, "bounds": [low, high]}.
+    - initial_investment (dict): {"name": row label, "amount": terms}, where the
+      terms (numbers or input names) are summed.
+    - line_items (list): Rows evaluated in order. Each row has a "name", a "type"
+      (revenue, expense, depreciation, capex or memo) and one of:
+        - "values": one value per operating year, or "value": a constant;
+        - "start" and "growth": a value compounding at a fixed rate;
+        - "of" and "ratio": a multiple of an earlier row, where the ratio terms
+          (numbers or input names) are multiplied;
+        - "method": "straight_line" for depreciation of the initial investment,
+          with an optional "salvage" value.
+      "grows_with" names an input applied as extra annual growth from year 2.
+    - tax_rate (str or float): Input name or constant tax rate.
+
+    Revenues minus expenses and depreciation give EBT; operating cash flow is
+    net income plus depreciation minus capital expenditure.
+    """
+
+    def __init__(self, spec):
+        self.name = spec["name"]
+        self.lifespan = int(spec["lifespan"])
+        self.inputs = list(spec["inputs"])
+        self.defaults = {
+            name: float(value["default"]) for name, value in spec["inputs"].items()
+        }
+        self.bounds = {
+            name: _bounds(value.get("bounds")) for name, value in spec["inputs"].items()
+        }
+        self.investment_name = spec["initial_investment"]["name"]
+        self._investment_terms = self._terms(spec["initial_investment"]["amount"])
+        self._tax_rate = self._terms(spec["tax_rate"])
+        self._years = np.arange(self.lifespan)
+
+        self.line_items = []
+        self.line_item_types = {}
+        self._steps = []
+        for item in spec["line_items"]:
+            if item.get("type") not in LINE_ITEM_TYPES:
+                raise ValueError(f"{item['name']}: unknown line item type")
+            self._steps.append((item["name"], item["type"], self._compile_item(item)))
+            self.line_items.append(item["name"])
+            self.line_item_types[item["name"]] = item["type"]
+
+    def _terms(self, terms):
+        terms = terms if isinstance(terms, list) else [terms]
+        for term in terms:
+            if isinstance(term, str) and term not in self.inputs:
+                raise ValueError(f"{self.name}: unknown input '{term}'")
+        return terms
+
+    def _compile_item(self, item):
+        growth = item.get("grows_with")
+        if growth is not None:
+            self._terms(growth)
+
+        if "values" in item:
+            base = np.asarray(item["values"], dtype=float)
+            if base.shape != (self.lifespan,):
+                raise ValueError(f"{item['name']}: expected {self.lifespan} values")
+            return ("base", base, growth)
+        if "value" in item:
+            return ("base", np.full(self.lifespan, float(item["value"])), growth)
+        if "start" in item:
+            base = item["start"] * (1 + item.get("growth", 0.0)) ** self._years
+            return ("base", base, growth)
+        if "of" in item:
+            if item["of"] not in self.line_items:
+                raise ValueError(
+                    f"{item['name']}: '{item['of']}' must be defined first"
+                )
+            return ("ratio", item["of"], self._terms(item["ratio"]), growth)
+        if item.get("method") == "straight_line":
+            return ("straight_line", float(item.get("salvage", 0.0)), None)
+        raise ValueError(f"{item['name']}: no values, ratio or method given")
+
+    def _resolve(self, terms, inputs, combine, size):
+        result = None
+        for term in terms:
+            value = inputs[term] if isinstance(term, str) else float(term)
+            result = value if result is None else combine(result, value)
+        return np.broadcast_to(result, (size,))
+
+    def _broadcast_inputs(self, inputs):
+        unknown = set(inputs) - set(self.inputs)
+        if unknown:
+            raise ValueError(f"{self.name}: unknown inputs {sorted(unknown)}")
+        values = {**self.defaults, **inputs}
+        arrays = np.broadcast_arrays(
+            *(np.atleast_1d(np.asarray(v, dtype=float)) for v in values.values())
+        )
+        return dict(zip(values, arrays))
+
+    def evaluate(self, scales=None, **inputs):
+        """
+        Evaluate every line item for a batch of input scenarios.
+
+        Parameters:
+        - scales (dict, optional): Line item name -> multiplier (scalar or one per
+          scenario) applied to that row; rows defined as a ratio of it follow.
+        - **inputs: Scalars or equally sized arrays keyed by input name; missing
+          inputs take their default.
+
+        Returns:
+        - dict: Row label -> (scenarios x operating years) array, plus the derived
+          "EBT", "Net Income" and "Operating Cash Flow" rows and the initial
+          investment amount (one value per scenario).
+        """
+        inputs = self._broadcast_inputs(inputs)
+        scales = scales or {}
+        unknown = set(scales) - set(self.line_items)
+        if unknown:
+            raise ValueError(f"{self.name}: unknown line items {sorted(unknown)}")
+        size = max(
+            (np.size(value) for value in [*inputs.values(), *scales.values()]),
+            default=1,
+        )
+        investment = self._resolve(self._investment_terms, inputs, np.add, size)
+        tax_rate = self._resolve(self._tax_rate, inputs, np.multiply, size)
+
+        rows = {}
+        for name, item_type, step in self._steps:
+            if step[0] == "base":
+                values = np.broadcast_to(step[1], (size, self.lifespan))
+            elif step[0] == "ratio":
+                ratio = self._resolve(step[2], inputs, np.multiply, size)
+                values = rows[step[1]] * ratio[:, None]
+            else:
+                per_year = (investment - step[1]) / self.lifespan
+                values = np.repeat(per_year[:, None], self.lifespan, axis=1)
+
+            # Extra growth driven by an input, compounding from year 2
+            if step[-1] is not None:
+                values = values * (1 + inputs[step[-1]][:, None]) ** self._years
+            if name in scales:
+                values = values * np.reshape(scales[name], (-1, 1))
+            rows[name] = values
+
+        rows.update(self.derive_rows(rows, tax_rate[:, None]))
+        rows[self.investment_name] = investment
+        return rows
+
+    def derive_rows(self, rows, tax_rate):
+        """
+        Aggregate line items into EBT, net income and operating cash flow.
+
+        Parameters:
+        - rows (dict): Line item name -> values (scalars or arrays of one shape).
+        - tax_rate (float or array): Tax rate, broadcastable against the values.
+
+        Returns:
+        - dict: The "EBT", "Net Income" and "Operating Cash Flow" values.
+        """
+        ebt = 0.0
+        capex = 0.0
+        depreciation = 0.0
+        for name, item_type, _ in self._steps:
+            values = rows[name]
+            if item_type == "revenue":
+                ebt = ebt + values
+            elif item_type == "expense":
+                ebt = ebt - values
+            elif item_type == "depreciation":
+                ebt = ebt - values
+                depreciation = depreciation + values
+            elif item_type == "capex":
+                capex = capex + values
+
+        net_income = ebt * (1 - tax_rate)
+        return {
+            "EBT": ebt,
+            "Net Income": net_income,
+            "Operating Cash Flow": net_income + depreciation - capex,
+        }
+
+    def cash_flows(self, scales=None, **inputs):
+        """
+        Compute the cash-flow series for a batch of input scenarios.
+
+        Parameters:
+        - scales (dict, optional): Line item multipliers, see evaluate.
+        - **inputs: Scalars or equally sized arrays keyed by input name.
+
+        Returns:
+        - np.ndarray: A (scenarios x years) array, year 0 holding the investment.
+        """
+        rows = self.evaluate(scales, **inputs)
+        return np.column_stack(
+            [-rows[self.investment_name], rows["Operating Cash Flow"]]
+        )
+
+    def statement_labels(self):
+        """
+        Return the rows of the financial statement in display order.
+
+        Returns:
+        - list: The investment, the line items other than capital expenditure,
+          "EBT", "Net Income", the capital expenditure items and
+          "Operating Cash Flow".
+        """
+        capex_items = [name for name, kind, _ in self._steps if kind == "capex"]
+        labels = [name for name in self.line_items if name not in capex_items]
+        return [
+            self.investment_name,
+            *labels,
+            "EBT",
+            "Net Income",
+            *capex_items,
+            "Operating Cash Flow",
+        ]
+
+    def build(self, **inputs):
+        """
+        Evaluate a single scenario into a FinancialModel.
+
+        Parameters:
+        - **inputs: Scalar inputs keyed by input name.
+
+        Returns:
+        - FinancialModel: The statement of years 0 to lifespan and its cash flows.
+        """
+        rows = self.evaluate(**inputs)
+        labels = self.statement_labels()
+        values = np.zeros((len(labels) + 1, self.lifespan + 1))
+        investment = -rows[self.investment_name][0]
+        values[0, 0] = investment
+        for i, label in enumerate(labels[1:], start=1):
+            values[i, 1:] = rows[label][0]
+        values[-1, 0] = investment
+        values[-1, 1:] = values[len(labels) - 1, 1:]
+        return FinancialModel(self.name, labels, values)
+
+    def to_dataframe(self, **inputs):
+        """
+        Build the yearly financial statement of a single scenario.
+
+        Parameters:
+        - **inputs: Scalar inputs keyed by input name.
+
+        Returns:
+        - pd.DataFrame: One row per year (0 to lifespan) and one column per line item.
+        """
+        return self.build(**inputs).to_dataframe()
+
+
+def load_spec(path):
+    """
+    Read a project definition from a JSON file.
+
+    Parameters:
+    - path (str or Path): Location of the JSON spec.
+
+    Returns:
+    - dict: The parsed project definition.
+    """
+    with open(path) as f:
+        return json.load(f)
+
+
+@lru_cache(maxsize=None)
+def get_model(key):
+    """
+    Load and compile a project definition from the models directory.
+
+    Parameters:
+    - key (str): File name of the spec without the .json suffix, e.g. "planet".
+
+    Returns:
+    - CompiledModel: The compiled project model.
+    """
+    return CompiledModel(load_spec(MODELS_DIR / f"{key}.json"))
+
+
+def available_models():
+    """
+    List the project definitions in the models directory.
+
+    Returns:
+    - list: The keys accepted by get_model.
+    """
+    return sorted(path.stem for path in MODELS_DIR.glob("*.json"))
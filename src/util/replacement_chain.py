@@ -0,0 +1,160 @@
+import math
+
+import numpy as np
+import pandas as pd
+from util.functions import (
+    _check_rates,
+    calculate_EAA,
+    compute_NPV_per_project,
+    pad_cash_flows,
+)
+
+# Relative tolerance of the chain NPV against the EAA over the same horizon
+EAA_RTOL = 1e-9
+
+
+def chain_horizon(lifespans):
+    """
+    Compute the least common multiple of project lifespans.
+
+    Parameters:
+    - lifespans (iterable of int): Lifespan of each project, in periods.
+
+    Returns:
+    - int: The shortest horizon every lifespan divides.
+    """
+    lifespans = [int(lifespan) for lifespan in lifespans]
+    if not lifespans or min(lifespans) < 1:
+        raise ValueError("lifespans must be positive integers")
+    return math.lcm(*lifespans)
+
+
+def chain_cycles(lifespans, horizon):
+    """
+    Count how many times each project is repeated over a horizon.
+
+    Parameters:
+    - lifespans (array of int): Lifespan of each project.
+    - horizon (int): Common horizon.
+
+    Returns:
+    - np.ndarray: Number of cycles of each project.
+    """
+    lifespans = np.asarray(lifespans, dtype=np.int64)
+    if np.any(lifespans < 1):
+        raise ValueError("lifespans must be positive integers")
+    uneven = horizon % lifespans != 0
+    if np.any(uneven):
+        raise ValueError(
+            f"horizon {horizon} is not a multiple of lifespans {lifespans[uneven]}"
+        )
+    return horizon // lifespans
+
+
+def _cycle_sum(rates, lifespans, cycles):
+    # sum_{k < cycles} (1 + r) ** (-k * lifespan), written with expm1/log1p so
+    # it stays accurate for rates close to zero
+    rates, lifespans, cycles = np.broadcast_arrays(rates, lifespans, cycles)
+    log_growth = np.log1p(rates)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.expm1(-cycles * lifespans * log_growth) / np.expm1(
+            -lifespans * log_growth
+        )
+    return np.where(rates == 0, cycles, ratio)
+
+
+def chain_npv(npv, initial_investment, discount_rate, lifespan, cycles, reinvest):
+    """
+    Compute the NPV of a project repeated back to back from its single-cycle NPV.
+
+    Cycle k starts at period k * lifespan, so its value is the single-cycle
+    value discounted by (1 + r) ** (-k * lifespan) and the chain is a
+    geometric series. Without re-investment the initial investment is paid
+    once and only the inflows repeat. Arguments broadcast against each other.
+
+    Parameters:
+    - npv (float or array): NPV of one cycle.
+    - initial_investment (float or array): Cash flow of period 0.
+    - discount_rate (float or array): Discount rate.
+    - lifespan (int or array): Periods per cycle.
+    - cycles (int or array): Number of cycles.
+    - reinvest (bool): Repeat the initial investment at the start of every cycle.
+
+    Returns:
+    - float or np.ndarray: NPV of the chain.
+    """
+    rates = _check_rates(discount_rate)
+    factor = _cycle_sum(rates, lifespan, cycles)
+    if reinvest:
+        return npv * factor
+    return initial_investment + (npv - initial_investment) * factor
+
+
+def chained_npv(cash_flows, discount_rates, horizon=None, reinvest=False):
+    """
+    Compute the NPV of each project repeated over a common horizon.
+
+    Only one cycle of each series is discounted; the extended series are
+    never built.
+
+    Parameters:
+    - cash_flows (2-D array or list of lists): One series per project, the
+      investment first. Series may have different lengths.
+    - discount_rates (float or array): One rate per project, or a shared rate.
+    - horizon (int, optional): Common horizon, a multiple of every lifespan;
+      defaults to their least common multiple.
+    - reinvest (bool): Repeat the initial investment at every cycle.
+
+    Returns:
+    - tuple: (horizon, NPV of each project over the horizon).
+    """
+    cash_flows, mask = pad_cash_flows(cash_flows)
+    lifespans = mask.sum(axis=1) - 1
+    horizon = chain_horizon(lifespans) if horizon is None else int(horizon)
+    cycles = chain_cycles(lifespans, horizon)
+    npv = compute_NPV_per_project(cash_flows, discount_rates, mask)
+    rates = np.broadcast_to(_check_rates(discount_rates), npv.shape)
+    return horizon, chain_npv(npv, cash_flows[:, 0], rates, lifespans, cycles, reinvest)
+
+
+def compare_with_eaa(cash_flows, discount_rates, horizon=None):
+    """
+    Cross-check replacement-chain NPVs against the equivalent annual annuity.
+
+    With re-investment, a chain over the horizon is worth the project's EAA
+    received every period of the horizon, so both methods must agree on the
+    value and on the ranking of projects.
+
+    Parameters:
+    - cash_flows (2-D array or list of lists): One series per project.
+    - discount_rates (float or array): One rate per project, or a shared rate.
+    - horizon (int, optional): Common horizon; defaults to the LCM of the lifespans.
+
+    Returns:
+    - pd.DataFrame: Per project the "lifespan", "cycles", single-cycle "npv",
+      "chain_npv" with re-investment, "eaa", "eaa_npv" (the EAA as an
+      annuity over the horizon) and whether the two NPVs agree.
+    """
+    cash_flows, mask = pad_cash_flows(cash_flows)
+    lifespans = mask.sum(axis=1) - 1
+    horizon = chain_horizon(lifespans) if horizon is None else int(horizon)
+    cycles = chain_cycles(lifespans, horizon)
+    npv = compute_NPV_per_project(cash_flows, discount_rates, mask)
+    rates = np.broadcast_to(_check_rates(discount_rates), npv.shape)
+
+    chained = chain_npv(npv, cash_flows[:, 0], rates, lifespans, cycles, True)
+    eaa = calculate_EAA(npv, rates, lifespans)
+    # Present value of one unit per period over the horizon
+    annuity = _cycle_sum(rates, 1, horizon) / (1 + rates)
+    eaa_npv = eaa * annuity
+    return pd.DataFrame(
+        {
+            "lifespan": lifespans,
+            "cycles": cycles,
+            "npv": npv,
+            "chain_npv": chained,
+            "eaa": eaa,
+            "eaa_npv": eaa_npv,
+            "consistent": np.isclose(chained, eaa_npv, rtol=EAA_RTOL, atol=1e-9),
+        }
+    )
@@ -0,0 +1,353 @@
+import json
+import os
+import time
+import uuid
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+STORE_DIR = Path(__file__).resolve().parent.parent / "results"
+
+# Rows per Arrow record batch; zone maps are kept at this granularity
+BATCH_SIZE = 65_536
+
+
+def _columns(table):
+    # Column name -> float array for structured arrays, DataFrames and dicts
+    if isinstance(table, np.ndarray) and table.dtype.names:
+        return {
+            name: np.asarray(table[name], dtype=float) for name in table.dtype.names
+        }
+    if isinstance(table, pd.DataFrame):
+        return {name: table[name].to_numpy(dtype=float) for name in table.columns}
+    return {name: np.asarray(values, dtype=float) for name, values in table.items()}
+
+
+def _to_json(value):
+    # numpy scalars and arrays in run metadata
+    return value.tolist() if hasattr(value, "tolist") else str(value)
+
+
+def _zone(values):
+    finite = values[np.isfinite(values)]
+    if finite.size == 0:
+        return [None, None]
+    return [float(finite.min()), float(finite.max())]
+
+
+def _overlaps(zone, condition):
+    low, high = condition
+    return zone[0] is not None and zone[0] <= high and zone[1] >= low
+
+
+def _column(batch, name):
+    # get_field_index is -1 for a column the run does not have, and column(-1)
+    # would silently return the last column instead
+    index = batch.schema.get_field_index(name)
+    if index < 0:
+        return np.full(batch.num_rows, np.nan)
+    return batch.column(index).to_numpy()
+
+
+def _conditions(where):
+    # {"wacc": (0.09, 0.11), "tax": 0.2} -> inclusive (low, high) per column
+    return {
+        name: tuple(bounds) if np.ndim(bounds) else (bounds, bounds)
+        for name, bounds in (where or {}).items()
+    }
+
+
+class RunWriter:
+    """
+    Streams the chunks of one run into an Arrow IPC file.
+
+    Use through ResultStore.writer; the run only becomes visible to readers
+    once the writer is closed without an error.
+    """
+
+    def __init__(self, path, sort_by=None, metadata=None, batch_size=BATCH_SIZE):
+        self.path = path
+        self.sort_by = [sort_by] if isinstance(sort_by, str) else list(sort_by or [])
+        self.metadata = metadata or {}
+        self.batch_size = batch_size
+        self.n_rows = 0
+        self._zones = []
+        self._writer = None
+        self._sink = None
+        self._tmp_path = path.with_suffix(".arrow.tmp")
+
+    def write(self, table):
+        """
+        Append scenarios to the run.
+
+        Each chunk is sorted on the sort_by columns before it is split into
+        record batches, so the zone maps of those columns stay narrow and
+        range queries on them skip most batches.
+
+        Parameters:
+        - table (structured array, pd.DataFrame or dict of arrays): Scenario
+          inputs and metrics, one row per scenario, same columns every call.
+        """
+        import pyarrow as pa
+
+        columns = _columns(table)
+        if self.sort_by:
+            order = np.lexsort([columns[name] for name in reversed(self.sort_by)])
+            columns = {name: values[order] for name, values in columns.items()}
+
+        if self._writer is None:
+            schema = pa.schema([(name, pa.float64()) for name in columns])
+            self._sink = pa.OSFile(str(self._tmp_path), "wb")
+            self._writer = pa.ipc.new_file(self._sink, schema)
+
+        n_rows = len(next(iter(columns.values()), []))
+        for start in range(0, n_rows, self.batch_size):
+            batch = {
+                name: values[start : start + self.batch_size]
+                for name, values in columns.items()
+            }
+            self._writer.write_batch(
+                pa.record_batch(
+                    [pa.array(values) for values in batch.values()], names=list(batch)
+                )
+            )
+            self._zones.append({name: _zone(values) for name, values in batch.items()})
+        self.n_rows += n_rows
+
+    def close(self, committed=True):
+        if self._writer is not None:
+            self._writer.close()
+            self._sink.close()
+        if not committed or self._writer is None:
+            self._tmp_path.unlink(missing_ok=True)
+            return
+
+        manifest = {
+            "run": self.path.stem,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "n_rows": self.n_rows,
+            "sort_by": self.sort_by,
+            "metadata": self.metadata,
+            "batches": self._zones,
+        }
+        manifest_path = self.path.with_suffix(".json")
+        tmp_manifest = manifest_path.with_suffix(".json.tmp")
+        with open(tmp_manifest, "w") as f:
+            json.dump(manifest, f, default=_to_json)
+        # The data file is published first; a run without a manifest is ignored
+        os.replace(self._tmp_path, self.path)
+        os.replace(tmp_manifest, manifest_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close(committed=exc_type is None)
+
+
+class ResultStore:
+    """
+    Scenario inputs and metrics persisted as memory-mapped Arrow IPC files.
+
+    Every run is one uncompressed Arrow file under <root>/<project>/ with a
+    JSON manifest holding the min/max of every column per record batch. A
+    query reads the manifests, skips the batches whose ranges cannot match,
+    and memory-maps the file, so only the pages of the selected columns and
+    batches are read and nothing is loaded up front.
+    """
+
+    def __init__(self, root=STORE_DIR, batch_size=BATCH_SIZE):
+        self.root = Path(root)
+        self.batch_size = batch_size
+
+    def _project_dir(self, project):
+        return self.root / project
+
+    def writer(self, project, sort_by=None, metadata=None):
+        """
+        Start a new run of a project.
+
+        Parameters:
+        - project (str): Key of the project spec.
+        - sort_by (str or list, optional): Columns each chunk is sorted on,
+          typically the scenario parameters queried most.
+        - metadata (dict, optional): JSON-serializable description of the run.
+
+        Returns:
+        - RunWriter: A context manager; call write() once per chunk.
+        """
+        directory = self._project_dir(project)
+        directory.mkdir(parents=True, exist_ok=True)
+        run = f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        return RunWriter(directory / f"{run}.arrow", sort_by, metadata, self.batch_size)
+
+    def append(self, project, table, sort_by=None, metadata=None):
+        """
+        Store one table of scenarios as a new run.
+
+        Parameters:
+        - project (str): Key of the project spec.
+        - table (structured array, pd.DataFrame or dict of arrays): Scenarios,
+          e.g. the result of run_scenarios.
+        - sort_by, metadata: See writer.
+
+        Returns:
+        - str: The run id.
+        """
+        with self.writer(project, sort_by, metadata) as writer:
+            writer.write(table)
+        return writer.path.stem
+
+    def runs(self, project):
+        """
+        List the stored runs of a project.
+
+        Parameters:
+        - project (str): Key of the project spec.
+
+        Returns:
+        - list: The manifest of every run, oldest first.
+        """
+        manifests = []
+        for path in sorted(self._project_dir(project).glob("*.json")):
+            if path.with_suffix(".arrow").exists():
+                with open(path) as f:
+                    manifests.append(json.load(f))
+        return manifests
+
+    def find_run(self, project, metadata):
+        """
+        Look up a stored run by the metadata it was written with.
+
+        Parameters:
+        - project (str): Key of the project spec.
+        - metadata (dict): Metadata passed to writer or append.
+
+        Returns:
+        - str or None: The id of the latest matching run, or None.
+        """
+        wanted = json.loads(json.dumps(metadata, default=_to_json))
+        for manifest in reversed(self.runs(project)):
+            if manifest["metadata"] == wanted:
+                return manifest["run"]
+        return None
+
+    def scan(self, project, where=None, columns=None, runs=None):
+        """
+        Iterate over the stored scenarios that match a filter, batch by batch.
+
+        Parameters:
+        - project (str): Key of the project spec.
+        - where (dict, optional): Column -> value or inclusive (low, high) range.
+        - columns (list, optional): Columns to return, default all. A column a
+          run does not have is returned as NaN for that run's rows.
+        - runs (list, optional): Run ids to read, default all.
+
+        Returns:
+        - iterator: A pd.DataFrame per record batch with matching rows; only
+          those rows of the requested columns are copied out of the file.
+        """
+        import pyarrow as pa
+
+        conditions = _conditions(where)
+        for manifest in self.runs(project):
+            if runs is not None and manifest["run"] not in runs:
+                continue
+            selected = [
+                i
+                for i, zones in enumerate(manifest["batches"])
+                if all(
+                    name in zones and _overlaps(zones[name], c)
+                    for name, c in conditions.items()
+                )
+            ]
+            if not selected:
+                continue
+
+            path = self._project_dir(project) / f"{manifest['run']}.arrow"
+            with pa.memory_map(str(path), "r") as source:
+                reader = pa.ipc.open_file(source)
+                for i in selected:
+                    batch = reader.get_batch(i)
+                    names = columns or batch.schema.names
+                    arrays = {
+                        name: _column(batch, name) for name in {*names, *conditions}
+                    }
+                    mask = np.ones(batch.num_rows, dtype=bool)
+                    for name, (low, high) in conditions.items():
+                        mask &= (arrays[name] >= low) & (arrays[name] <= high)
+                    if mask.any():
+                        yield pd.DataFrame(
+                            {name: arrays[name][mask] for name in names}, copy=False
+                        )
+
+    def query(self, project, where=None, columns=None, runs=None):
+        """
+        Collect the matching scenarios into one DataFrame.
+
+        Parameters:
+        - project, where, columns, runs: See scan.
+
+        Returns:
+        - pd.DataFrame: The matching rows.
+        """
+        frames = list(self.scan(project, where, columns, runs))
+        if not frames:
+            return pd.DataFrame(columns=columns)
+        return pd.concat(frames, ignore_index=True)
+
+    def count(self, project, where=None, runs=None):
+        """
+        Count the stored scenarios that match a filter.
+
+        Parameters:
+        - project, where, runs: See scan.
+
+        Returns:
+        - int: Number of matching scenarios.
+        """
+        if not where:
+            return sum(
+                manifest["n_rows"]
+                for manifest in self.runs(project)
+                if runs is None or manifest["run"] in runs
+            )
+        first = next(iter(where))
+        return sum(len(frame) for frame in self.scan(project, where, [first], runs))
+
+    def histogram(self, project, column, bins=50, where=None, runs=None):
+        """
+        Histogram of a stored column, computed batch by batch.
+
+        Parameters:
+        - project (str): Key of the project spec.
+        - column (str): Column to count, e.g. "npv".
+        - bins (int): Number of equal-width bins between the stored extremes.
+        - where, runs: See scan.
+
+        Returns:
+        - tuple: (counts, edges) as returned by np.histogram.
+        """
+        conditions = _conditions(where)
+        zones = [
+            batch[column]
+            for manifest in self.runs(project)
+            if runs is None or manifest["run"] in runs
+            for batch in manifest["batches"]
+            if batch.get(column, [None])[0] is not None
+            and all(
+                name in batch and _overlaps(batch[name], c)
+                for name, c in conditions.items()
+            )
+        ]
+        if not zones:
+            return np.zeros(bins, dtype=np.int64), np.linspace(0.0, 1.0, bins + 1)
+        edges = np.linspace(
+            min(zone[0] for zone in zones), max(zone[1] for zone in zones), bins + 1
+        )
+        counts = np.zeros(bins, dtype=np.int64)
+        for frame in self.scan(project, where, [column], runs):
+            values = frame[column].to_numpy()
+            counts += np.histogram(values[np.isfinite(values)], edges)[0]
+        return counts, edges
@@ -0,0 +1,122 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+from util.model_spec import get_model
+from util.simulation import DEFAULT_WACC, METRICS, evaluate_scenarios
+
+
+def scenario_inputs(project, overrides, base_inputs=None):
+    """
+    Expand per-scenario input overrides into one array per model input.
+
+    Parameters:
+    - project (str): Key of the project spec.
+    - overrides (list of dicts or dict of arrays): Inputs that differ from the
+      base case, e.g. [{"wacc": 0.05}, {"wacc": 0.06, "tax": 0.25}], or the same
+      already in columnar form.
+    - base_inputs (dict, optional): Values for inputs that are not overridden;
+      model defaults and DEFAULT_WACC fill the rest.
+
+    Returns:
+    - dict: One float array per model input and "wacc", one entry per scenario.
+    """
+    defaults = {**get_model(project).defaults, "wacc": DEFAULT_WACC}
+    defaults.update(base_inputs or {})
+
+    if isinstance(overrides, dict):
+        names = set(overrides)
+        n_scenarios = len(next(iter(overrides.values()), []))
+        columns = overrides
+    else:
+        names = {name for override in overrides for name in override}
+        n_scenarios = len(overrides)
+        columns = {
+            name: [override.get(name, defaults[name]) for override in overrides]
+            for name in names & set(defaults)
+        }
+
+    unknown = names - set(defaults)
+    if unknown:
+        raise ValueError(f"unknown inputs for {project}: {sorted(unknown)}")
+    return {
+        name: np.broadcast_to(
+            np.asarray(columns.get(name, default), dtype=float), (n_scenarios,)
+        )
+        for name, default in defaults.items()
+    }
+
+
+def run_scenarios(
+    project, overrides, base_inputs=None, workers=None, chunk_size=10_000
+):
+    """
+    Evaluate many input scenarios of a project across a process pool.
+
+    Scenarios are split into chunks of chunk_size, each chunk is evaluated as
+    one vectorized batch in a worker process, and the results are gathered
+    into a single table.
+
+    Parameters:
+    - project (str): Key of the project spec.
+    - overrides (list of dicts or dict of arrays): Per-scenario inputs, see
+      scenario_inputs.
+    - base_inputs (dict, optional): Values for inputs that are not overridden.
+    - workers (int, optional): Number of worker processes, defaulting to the CPU
+      count. With one worker or one chunk everything runs in this process.
+    - chunk_size (int): Number of scenarios per task.
+
+    Returns:
+    - np.ndarray: A structured array with one record per scenario, holding every
+      input and the metrics in METRICS.
+    """
+    inputs = scenario_inputs(project, overrides, base_inputs)
+    n_scenarios = len(inputs["wacc"])
+    table = np.empty(n_scenarios, dtype=[(name, float) for name in [*inputs, *METRICS]])
+    for name, values in inputs.items():
+        table[name] = values
+
+    results = map_chunks(
+        partial(evaluate_scenarios, project), inputs, n_scenarios, workers, chunk_size
+    )
+    for metric in METRICS:
+        table[metric] = results[metric]
+    return table
+
+
+def map_chunks(func, inputs, n_scenarios, workers=None, chunk_size=10_000):
+    """
+    Apply a batch function to chunks of scenarios, in parallel when possible.
+
+    Parameters:
+    - func (callable): Picklable function taking a dict of input arrays and
+      returning one result row (or value) per scenario, or a dict of such
+      arrays.
+    - inputs (dict): Input name -> one value per scenario.
+    - n_scenarios (int): Number of scenarios.
+    - workers (int, optional): Number of worker processes, defaulting to the CPU
+      count. With one worker or one chunk everything runs in this process.
+    - chunk_size (int): Number of scenarios per task.
+
+    Returns:
+    - np.ndarray or dict: The results of every chunk concatenated in scenario
+      order, per key when func returns dicts.
+    """
+    slices = [
+        slice(start, min(start + chunk_size, n_scenarios))
+        for start in range(0, n_scenarios, chunk_size)
+    ] or [slice(0, 0)]
+    chunks = ({name: values[s] for name, values in inputs.items()} for s in slices)
+    workers = workers or os.cpu_count()
+
+    if workers <= 1 or len(slices) <= 1:
+        return _concatenate(list(map(func, chunks)))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return _concatenate(list(executor.map(func, chunks)))
+
+
+def _concatenate(results):
+    if isinstance(results[0], dict):
+        return {key: np.concatenate([r[key] for r in results]) for key in results[0]}
+    return np.concatenate(results)
@@ -0,0 +1,222 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+from util.functions import compute_NPV_per_project
+from util.model_spec import get_model
+from util.valuation import compute_wacc
+
+# Sidebar defaults of the financing inputs that make up the WACC
+DEFAULT_FINANCING = {"debt": 0.25, "cost_of_equity": 0.12, "interest_rate": 0.10}
+FINANCING_BOUNDS = {
+    "debt": (0.0, 1.0),
+    "cost_of_equity": (0.0, 1.0),
+    "interest_rate": (0.0, 1.0),
+}
+
+# Relative step of the central difference used for elasticities
+ELASTICITY_STEP = 0.01
+
+
+def sensitivity_factors(
+    project, base_inputs=None, financing=None, ranges=None, spread=0.2
+):
+    """
+    List the factors perturbed by the sensitivity analysis.
+
+    Factors are the model inputs, the financing inputs behind the WACC and a
+    multiplier on every line item that is not derived from the investment.
+    Inputs with a base value of zero have no relative range and are skipped
+    unless a range is given for them.
+
+    Parameters:
+    - project (str): Key of the project spec.
+    - base_inputs (dict, optional): Base values of the model inputs.
+    - financing (dict, optional): Base "debt", "cost_of_equity" and "interest_rate".
+    - ranges (dict, optional): Factor name -> (low, high) overriding the default
+      range of base * (1 -/+ spread).
+    - spread (float): Relative half-width of the default ranges.
+
+    Returns:
+    - list: One dict per factor with its "name", "kind" (input, financing or
+      line_item), "base" value and "low"/"high" range.
+    """
+    model = get_model(project)
+    ranges = ranges or {}
+    inputs = {**model.defaults, **(base_inputs or {})}
+    financing = {**DEFAULT_FINANCING, **(financing or {})}
+
+    candidates = [
+        *((name, "input", value, model.bounds[name]) for name, value in inputs.items()),
+        *(
+            (name, "financing", value, FINANCING_BOUNDS[name])
+            for name, value in financing.items()
+        ),
+        *(
+            (name, "line_item", 1.0, (0.0, np.inf))
+            for name, item_type in model.line_item_types.items()
+            if item_type != "depreciation"
+        ),
+    ]
+    unknown = set(ranges) - {name for name, *_ in candidates}
+    if unknown:
+        raise ValueError(f"unknown factors for {project}: {sorted(unknown)}")
+
+    factors = []
+    for name, kind, base, bounds in candidates:
+        if name in ranges:
+            low, high = ranges[name]
+        elif base == 0:
+            continue
+        else:
+            low, high = sorted((base * (1 - spread), base * (1 + spread)))
+        low, high = np.clip([low, high], *bounds).tolist()
+        factors.append(
+            {"name": name, "kind": kind, "base": float(base), "low": low, "high": high}
+        )
+    return factors
+
+
+def _perturbation_table(factors, blocks):
+    # One column per factor holding its base value, overwritten in the rows
+    # of each block by the levels that block perturbs
+    n_rows = sum(len(next(iter(levels.values()))) for levels in blocks)
+    table = {factor["name"]: np.full(n_rows, factor["base"]) for factor in factors}
+    start = 0
+    for levels in blocks:
+        size = len(next(iter(levels.values())))
+        for name, values in levels.items():
+            table[name][start : start + size] = values
+        start += size
+    return table
+
+
+def evaluate_npv(project, factors, table, base_inputs=None, financing=None):
+    """
+    Evaluate the NPV of every row of a perturbation table in one batch.
+
+    Parameters:
+    - project (str): Key of the project spec.
+    - factors (list): Factors as returned by sensitivity_factors.
+    - table (dict): Factor name -> one value per row.
+    - base_inputs, financing (dict, optional): Base values of inputs that are
+      not factors.
+
+    Returns:
+    - np.ndarray: NPV of each row.
+    """
+    model = get_model(project)
+    kinds = {factor["name"]: factor["kind"] for factor in factors}
+    columns = {
+        "input": {**model.defaults, **(base_inputs or {})},
+        "financing": {**DEFAULT_FINANCING, **(financing or {})},
+        "line_item": {},
+    }
+    for name, values in table.items():
+        columns[kinds[name]][name] = values
+
+    financing = columns["financing"]
+    wacc = compute_wacc(
+        financing["debt"],
+        financing["cost_of_equity"],
+        financing["interest_rate"],
+        columns["input"].get("tax", 0.0),
+    )
+    cash_flows = model.cash_flows(scales=columns["line_item"], **columns["input"])
+    wacc = np.broadcast_to(wacc, cash_flows.shape[:1])
+    return compute_NPV_per_project(cash_flows, wacc, validate=False)
+
+
+def run_sensitivity(
+    project,
+    base_inputs=None,
+    financing=None,
+    ranges=None,
+    spread=0.2,
+    n_levels=50,
+    pair_levels=5,
+    pairs=True,
+):
+    """
+    Run one-at-a-time and pairwise NPV sensitivity analysis of a project.
+
+    Every factor is swept across n_levels values of its range and, when pairs
+    is set, every pair of factors across a pair_levels x pair_levels grid. All
+    perturbations, together with the base case and the elasticity steps, are
+    evaluated as a single batch through the cash-flow model.
+
+    Parameters:
+    - project (str): Key of the project spec.
+    - base_inputs (dict, optional): Base values of the model inputs.
+    - financing (dict, optional): Base "debt", "cost_of_equity" and "interest_rate".
+    - ranges (dict, optional): Factor name -> (low, high), see sensitivity_factors.
+    - spread (float): Relative half-width of the default ranges.
+    - n_levels (int): Levels per factor in the one-at-a-time sweep.
+    - pair_levels (int): Levels per factor in the pairwise grids.
+    - pairs (bool): Whether to evaluate the pairwise grids.
+
+    Returns:
+    - dict: "base_npv"; "sweeps", factor name -> {"values", "npv"} arrays;
+      "tornado", a DataFrame with the low/high value and NPV, swing and
+      elasticity of each factor sorted by swing; and "pairs", (factor, factor)
+      -> {"values", "npv"} with the two level arrays and the NPV grid.
+    """
+    factors = sensitivity_factors(project, base_inputs, financing, ranges, spread)
+    names = [factor["name"] for factor in factors]
+
+    blocks = [{names[0]: [factors[0]["base"]]}]
+    sweeps = {}
+    for factor in factors:
+        sweeps[factor["name"]] = np.linspace(factor["low"], factor["high"], n_levels)
+        blocks.append({factor["name"]: sweeps[factor["name"]]})
+    for factor in factors:
+        blocks.append(
+            {factor["name"]: factor["base"] * (1 + np.array([-1, 1]) * ELASTICITY_STEP)}
+        )
+    pair_names = list(itertools.combinations(names, 2)) if pairs else []
+    pair_values = {
+        name: np.linspace(factor["low"], factor["high"], pair_levels)
+        for name, factor in zip(names, factors)
+    }
+    for a, b in pair_names:
+        grid_a, grid_b = np.meshgrid(pair_values[a], pair_values[b], indexing="ij")
+        blocks.append({a: grid_a.ravel(), b: grid_b.ravel()})
+
+    table = _perturbation_table(factors, blocks)
+    npv = evaluate_npv(project, factors, table, base_inputs, financing)
+    base_npv = npv[0]
+    sweep_npv = npv[1 : 1 + len(factors) * n_levels].reshape(len(factors), n_levels)
+    start = 1 + len(factors) * n_levels
+    step_npv = npv[start : start + 2 * len(factors)].reshape(len(factors), 2)
+    pair_npv = npv[start + 2 * len(factors) :].reshape(-1, pair_levels, pair_levels)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        elasticity = (step_npv[:, 1] - step_npv[:, 0]) / (
+            2 * ELASTICITY_STEP * base_npv
+        )
+    tornado = pd.DataFrame(
+        {
+            "factor": names,
+            "kind": [factor["kind"] for factor in factors],
+            "low": [factor["low"] for factor in factors],
+            "high": [factor["high"] for factor in factors],
+            "low_npv": sweep_npv[:, 0],
+            "high_npv": sweep_npv[:, -1],
+            "swing": np.abs(sweep_npv[:, -1] - sweep_npv[:, 0]),
+            "elasticity": np.where(
+                [factor["base"] != 0 for factor in factors], elasticity, np.nan
+            ),
+        }
+    )
+    return {
+        "base_npv": float(base_npv),
+        "sweeps": {
+            name: {"values": sweeps[name], "npv": sweep_npv[i]}
+            for i, name in enumerate(names)
+        },
+        "tornado": tornado.sort_values("swing", ascending=False, ignore_index=True),
+        "pairs": {
+            pair: {"values": (pair_values[pair[0]], pair_values[pair[1]]), "npv": grid}
+            for pair, grid in zip(pair_names, pair_npv)
+        },
+    }
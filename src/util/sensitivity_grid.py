@@ -0,0 +1,233 @@
+import itertools
+import json
+from pathlib import Path
+
+import numpy as np
+from util.model_spec import get_model
+from util.simulation import METRICS, evaluate_scenarios, metrics_from_cash_flows
+from util.valuation import compute_wacc
+
+GRID_DIR = Path(__file__).resolve().parent.parent / "grids"
+
+# (start, stop, number of points) of each uniform grid axis. Rates step by 0.01,
+# the step of the sidebar number inputs, so their values land on grid points.
+DEFAULT_AXES = {
+    "planet": {
+        "investment": (770000, 1000000, 24),
+        "tax": (0.0, 1.0, 101),
+        "patronage_loss": (0.0, 1.0, 101),
+    },
+    "beach": {
+        "investment": (800000, 1200000, 41),
+        "tax": (0.0, 1.0, 101),
+        "patronage_loss": (0.0, 1.0, 101),
+    },
+}
+
+
+class SensitivityGrid:
+    """
+    Precomputed cash flows of one project over a uniform input grid.
+
+    Lookups that land exactly on a grid point read the stored cash flows;
+    other points are multilinearly interpolated between the surrounding grid
+    points, and points outside the grid are evaluated through the model. Cash
+    flows are multilinear in investment, tax and patronage loss, so the
+    interpolation is exact, and every metric is derived from the looked-up
+    cash flows for any WACC without touching the model. The largest errors
+    observed at random off-grid points are recorded in max_error when the
+    grid is built.
+    """
+
+    def __init__(self, project, axes, values, max_error=None):
+        self.project = project
+        self.axes = axes
+        self.values = values
+        self.max_error = max_error or {}
+        self.lifespan = get_model(project).lifespan
+        self._starts = np.array([start for start, _, _ in axes.values()], dtype=float)
+        self._stops = np.array([stop for _, stop, _ in axes.values()], dtype=float)
+        self._sizes = np.array([num for _, _, num in axes.values()])
+        self._steps = (self._stops - self._starts) / (self._sizes - 1)
+
+    @classmethod
+    def build(cls, project, axes=None, chunk_size=200_000, n_check=2000, seed=0):
+        """
+        Evaluate the model on every grid point.
+
+        Parameters:
+        - project (str): Key of the project spec.
+        - axes (dict, optional): Grid axes, defaulting to DEFAULT_AXES[project].
+        - chunk_size (int): Number of grid points evaluated at once.
+        - n_check (int): Random off-grid points used to measure interpolation error.
+        - seed (int): Seed for the error check points.
+
+        Returns:
+        - SensitivityGrid: The populated grid.
+        """
+        model = get_model(project)
+        axes = axes or DEFAULT_AXES[project]
+        grids = [np.linspace(*axis) for axis in axes.values()]
+        shape = tuple(len(grid) for grid in grids)
+        # Last axis holds the cash flows of years 0..lifespan
+        values = np.empty((int(np.prod(shape)), model.lifespan + 1))
+
+        for start in range(0, values.shape[0], chunk_size):
+            flat = np.arange(start, min(start + chunk_size, values.shape[0]))
+            index = np.unravel_index(flat, shape)
+            inputs = {name: grid[i] for name, grid, i in zip(axes, grids, index)}
+            values[flat] = model.cash_flows(**inputs)
+
+        grid = cls(project, axes, values.reshape(*shape, -1))
+        grid.max_error = grid._measure_error(n_check, np.random.default_rng(seed))
+        return grid
+
+    def _measure_error(self, n_check, rng):
+        points = rng.uniform(self._starts, self._stops, size=(n_check, len(self.axes)))
+        wacc = rng.uniform(0.0, 0.3, size=n_check)
+        exact = evaluate_scenarios(
+            self.project,
+            {**dict(zip(self.axes, points.T)), "wacc": wacc},
+            fractional=True,
+        )
+        approx = [self._metrics(self._interpolate(p), w) for p, w in zip(points, wacc)]
+        errors = {
+            metric: np.abs(exact[metric] - [a[metric] for a in approx])
+            for metric in METRICS
+        }
+        return {
+            metric: float(np.nanmax(error))
+            for metric, error in errors.items()
+            if np.isfinite(error).any()
+        }
+
+    def _interpolate(self, point):
+        position = (point - self._starts) / self._steps
+        lower = np.clip(np.floor(position).astype(int), 0, self._sizes - 2)
+        weight = position - lower
+
+        result = 0.0
+        for corner in itertools.product((0, 1), repeat=len(point)):
+            corner = np.array(corner)
+            corner_weight = np.prod(np.where(corner, weight, 1 - weight))
+            if corner_weight:
+                result = result + corner_weight * self.values[tuple(lower + corner)]
+        return result
+
+    def _metrics(self, cash_flows, wacc):
+        metrics = metrics_from_cash_flows(
+            cash_flows[None, :], wacc, self.lifespan, fractional=True
+        )
+        return {metric: float(values[0]) for metric, values in metrics.items()}
+
+    def lookup(self, investment, tax, patronage_loss, wacc):
+        """
+        Look up the metrics of one input point.
+
+        Parameters:
+        - investment, tax, patronage_loss (float): The gridded project inputs.
+        - wacc (float): Discount rate, applied exactly to the looked-up cash flows.
+
+        Returns:
+        - dict: Metric name -> value, for every metric in METRICS. The payback
+          period is fractional, as on the pages, and NaN when never reached.
+        """
+        point = np.array([investment, tax, patronage_loss], dtype=float)
+        if np.any(point < self._starts) or np.any(point > self._stops):
+            inputs = {**dict(zip(self.axes, point[:, None])), "wacc": [wacc]}
+            metrics = evaluate_scenarios(self.project, inputs, fractional=True)
+            return {metric: float(values[0]) for metric, values in metrics.items()}
+        return self._metrics(self._interpolate(point), wacc)
+
+    def save(self, directory=GRID_DIR):
+        """
+        Write the grid values to <project>.npy and its axes to <project>.json.
+
+        Parameters:
+        - directory (str or Path): Target directory.
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        np.save(directory / f"{self.project}.npy", np.asarray(self.values))
+        with open(directory / f"{self.project}.json", "w") as f:
+            json.dump({"axes": self.axes, "max_error": self.max_error}, f, indent=2)
+
+    @classmethod
+    def load(cls, project, directory=GRID_DIR):
+        """
+        Open a saved grid with its values memory-mapped from disk.
+
+        Parameters:
+        - project (str): Key of the project spec.
+        - directory (str or Path): Directory the grid was saved to.
+
+        Returns:
+        - SensitivityGrid: The loaded grid.
+        """
+        directory = Path(directory)
+        with open(directory / f"{project}.json") as f:
+            metadata = json.load(f)
+        axes = {name: tuple(axis) for name, axis in metadata["axes"].items()}
+        values = np.load(directory / f"{project}.npy", mmap_mode="r")
+        if values.shape[-1] != get_model(project).lifespan + 1:
+            raise ValueError(f"{project} grid does not match the project lifespan")
+        return cls(project, axes, values, metadata["max_error"])
+
+
+def lookup_sidebar(grids, sidebar_inputs):
+    """
+    Answer a sidebar change from precomputed grids.
+
+    Parameters:
+    - grids (dict): Project key -> SensitivityGrid, e.g. from load_grids().
+    - sidebar_inputs (tuple): The tuple returned by generate_sidebar().
+
+    Returns:
+    - dict: The metrics of every project in grids plus the "wacc" used; a
+      project without a grid is left out.
+    """
+    (
+        planet_investment_amount,
+        tax,
+        patronage_loss,
+        beach_investment_amount,
+        debt,
+        cost_of_equity,
+        interest_rate,
+    ) = sidebar_inputs
+    wacc = compute_wacc(debt, cost_of_equity, interest_rate, tax)
+    investments = {"planet": planet_investment_amount, "beach": beach_investment_amount}
+    return {
+        "wacc": wacc,
+        **{
+            project: grid.lookup(investments[project], tax, patronage_loss, wacc)
+            for project, grid in grids.items()
+        },
+    }
+
+
+def load_grids(directory=GRID_DIR):
+    """
+    Open every project grid that has been built into a directory.
+
+    Parameters:
+    - directory (str or Path): Directory the grids were saved to.
+
+    Returns:
+    - dict: Project key -> SensitivityGrid, for the projects whose .npy and
+      .json files both exist.
+    """
+    directory = Path(directory)
+    return {
+        project: SensitivityGrid.load(project, directory)
+        for project in DEFAULT_AXES
+        if (directory / f"{project}.npy").exists()
+        and (directory / f"{project}.json").exists()
+    }
+
+
+if __name__ == "__main__":
+    for project in DEFAULT_AXES:
+        grid = SensitivityGrid.build(project)
+        grid.save()
+        print(project, grid.values.shape, grid.max_error)
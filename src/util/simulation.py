@@ -0,0 +1,376 @@
+from contextlib import ExitStack
+
+import numpy as np
+from util.functions import (
+    calculate_EAA,
+    compute_NPV_per_project,
+    compute_IRR_batch,
+    compute_payback_period_batch,
+    profitability_index_from_npv,
+)
+from util.model_spec import get_model
+
+DEFAULT_WACC = 0.1075
+WACC_BOUNDS = (-0.99, np.inf)
+
+METRICS = ("npv", "irr", "payback_period", "profitability_index", "eaa")
+
+
+def draw_inputs(project, n_scenarios, distributions, base_inputs=None, rng=None):
+    """
+    Draw simulated model inputs.
+
+    Parameters:
+    - project (str): Key of the project spec, e.g. "planet" or "beach".
+    - n_scenarios (int): Number of scenarios to draw.
+    - distributions (dict): Maps an input name to a tuple of a numpy Generator method
+      and its parameters, e.g. {"wacc": ("normal", 0.1075, 0.01)}.
+    - base_inputs (dict, optional): Fixed values for inputs without a distribution.
+    - rng (np.random.Generator, optional): Random number generator.
+
+    Returns:
+    - dict: One array of length n_scenarios per model input, plus "wacc".
+    """
+    model = get_model(project)
+    rng = rng or np.random.default_rng()
+    inputs = {**model.defaults, "wacc": DEFAULT_WACC, **(base_inputs or {})}
+    bounds = {**model.bounds, "wacc": WACC_BOUNDS}
+
+    draws = {}
+    for name, base_value in inputs.items():
+        if name in distributions:
+            method, *params = distributions[name]
+            values = getattr(rng, method)(*params, size=n_scenarios)
+        else:
+            values = np.full(n_scenarios, base_value, dtype=float)
+        draws[name] = np.clip(values, *bounds[name])
+    return draws
+
+
+def metrics_from_cash_flows(
+    cash_flows, wacc, lifespan, metrics=METRICS, fractional=False
+):
+    """
+    Derive valuation metrics from a batch of model cash flows.
+
+    Only the requested metrics are computed, so NPV-only callers never run
+    the IRR solver.
+
+    Parameters:
+    - cash_flows (np.ndarray): A (scenarios x years) array of cash flows.
+    - wacc (float or array): Discount rate of each scenario.
+    - lifespan (int): Project lifespan used for the annuity factor.
+    - metrics (tuple): Names from METRICS to compute.
+    - fractional (bool): Interpolate the payback period within the year.
+
+    Returns:
+    - dict: One array per requested metric, one value per scenario.
+    """
+    wacc = np.broadcast_to(np.asarray(wacc, dtype=float), cash_flows.shape[:1])
+    # Model cash flows are clean floats, so the batch checks are skipped
+    npv = None
+    if {"npv", "profitability_index", "eaa"} & set(metrics):
+        npv = compute_NPV_per_project(cash_flows, wacc, validate=False)
+    compute = {
+        "npv": lambda: npv,
+        "irr": lambda: compute_IRR_batch(cash_flows, validate=False)[0],
+        "payback_period": lambda: compute_payback_period_batch(
+            cash_flows, fractional=fractional, validate=False
+        ),
+        "profitability_index": lambda: profitability_index_from_npv(
+            npv, cash_flows[:, 0]
+        ),
+        "eaa": lambda: calculate_EAA(npv, wacc, lifespan),
+    }
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return {metric: compute[metric]() for metric in metrics}
+
+
+def evaluate_scenarios(project, inputs, metrics=METRICS, fractional=False):
+    """
+    Evaluate valuation metrics for a batch of scenarios.
+
+    This is the one scenario evaluator shared by the simulation, the scenario
+    runner, the Sobol analysis and the sensitivity grid.
+
+    Parameters:
+    - project (str): Key of the project spec.
+    - inputs (dict): One array per model input and "wacc", as returned by
+      draw_inputs or scenario_inputs.
+    - metrics (tuple): Names from METRICS to compute.
+    - fractional (bool): Interpolate the payback period within the year.
+
+    Returns:
+    - dict: One array per requested metric, one value per scenario.
+    """
+    model = get_model(project)
+    model_inputs = {name: values for name, values in inputs.items() if name != "wacc"}
+    cash_flows = model.cash_flows(**model_inputs)
+    return metrics_from_cash_flows(
+        cash_flows, inputs["wacc"], model.lifespan, metrics, fractional
+    )
+
+
+class _StreamingSummary:
+    """Running moments of one metric, updated chunk by chunk."""
+
+    def __init__(self):
+        self.count = 0
+        self.missing = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.minimum = np.inf
+        self.maximum = -np.inf
+
+    def update(self, values):
+        finite = values[np.isfinite(values)]
+        self.missing += values.size - finite.size
+        if finite.size == 0:
+            return
+
+        # Chan et al. parallel update of mean and sum of squared deviations
+        n = finite.size
+        chunk_mean = finite.mean()
+        delta = chunk_mean - self.mean
+        total = self.count + n
+        self.m2 += ((finite - chunk_mean) ** 2).sum()
+        self.m2 += delta**2 * self.count * n / total
+        self.mean += delta * n / total
+        self.count = total
+        self.minimum = min(self.minimum, finite.min())
+        self.maximum = max(self.maximum, finite.max())
+
+    def result(self, sample, percentiles):
+        sample = sample[np.isfinite(sample)]
+        return {
+            "mean": self.mean if self.count else np.nan,
+            "std": np.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else np.nan,
+            "min": self.minimum if self.count else np.nan,
+            "max": self.maximum if self.count else np.nan,
+            "missing": self.missing,
+            "percentiles": dict(
+                zip(
+                    percentiles,
+                    (
+                        np.percentile(sample, percentiles)
+                        if sample.size
+                        else [np.nan] * len(percentiles)
+                    ),
+                )
+            ),
+        }
+
+
+def _update_sample(sample_keys, sample, results, sample_size, rng):
+    # Keep the scenarios with the smallest random keys as a uniform sample
+    size = len(results["npv"])
+    sample_keys = np.concatenate([sample_keys, rng.random(size)])
+    sample = {
+        metric: np.concatenate([values, results[metric]])
+        for metric, values in sample.items()
+    }
+    if sample_keys.size > sample_size:
+        keep = np.argpartition(sample_keys, sample_size)[:sample_size]
+        sample_keys = sample_keys[keep]
+        sample = {metric: values[keep] for metric, values in sample.items()}
+    return sample_keys, sample
+
+
+def run_simulation(
+    project,
+    n_scenarios,
+    distributions,
+    base_inputs=None,
+    chunk_size=100_000,
+    sample_size=100_000,
+    percentiles=(5, 25, 50, 75, 95),
+    seed=None,
+    store=None,
+):
+    """
+    Run a Monte Carlo simulation of a project's NPV, IRR and payback period.
+
+    Scenarios are drawn and evaluated in chunks, so memory is bounded by
+    chunk_size and sample_size rather than n_scenarios. Means, standard
+    deviations and the probability of loss are exact; percentiles are taken
+    from a uniform random sample of at most sample_size scenarios.
+
+    Parameters:
+    - project (str): Key of the project spec.
+    - n_scenarios (int): Total number of scenarios.
+    - distributions (dict): Input distributions, see draw_inputs.
+    - base_inputs (dict, optional): Fixed values for inputs without a distribution.
+    - chunk_size (int): Number of scenarios evaluated at once.
+    - sample_size (int): Number of scenarios retained for percentiles and plotting.
+    - percentiles (tuple): Percentiles to report.
+    - seed (int, optional): Seed for reproducible runs.
+    - store (ResultStore, optional): Persist every scenario's inputs and metrics
+      as a new run, sorted on WACC within each chunk.
+
+    Returns:
+    - dict: "n_scenarios", "probability_of_loss", a summary dict per metric
+      ("npv", "irr", "payback_period"), "sample", the retained scenario
+      results, and "run", the id of the stored run or None.
+    """
+    rng = np.random.default_rng(seed)
+    metrics = ("npv", "irr", "payback_period")
+    summaries = {metric: _StreamingSummary() for metric in metrics}
+    sample_keys = np.empty(0)
+    sample = {metric: np.empty(0) for metric in metrics}
+    losses = 0
+
+    with ExitStack() as stack:
+        writer = None
+        if store is not None:
+            metadata = simulation_metadata(
+                n_scenarios, distributions, base_inputs, seed
+            )
+            writer = stack.enter_context(
+                store.writer(project, sort_by="wacc", metadata=metadata)
+            )
+
+        for start in range(0, n_scenarios, chunk_size):
+            size = min(chunk_size, n_scenarios - start)
+            inputs = draw_inputs(project, size, distributions, base_inputs, rng)
+            results = evaluate_scenarios(project, inputs)
+            if writer is not None:
+                writer.write({**inputs, **results})
+
+            losses += np.count_nonzero(results["npv"] < 0)
+            for metric in metrics:
+                summaries[metric].update(results[metric])
+            sample_keys, sample = _update_sample(
+                sample_keys, sample, results, sample_size, rng
+            )
+
+    return {
+        "n_scenarios": n_scenarios,
+        "probability_of_loss": losses / n_scenarios if n_scenarios else np.nan,
+        **{
+            metric: summaries[metric].result(sample[metric], percentiles)
+            for metric in metrics
+        },
+        "sample": sample,
+        "run": None if writer is None else writer.path.stem,
+    }
+
+
+def simulation_metadata(n_scenarios, distributions, base_inputs=None, seed=None):
+    """
+    Describe a simulation run for the result store.
+
+    Parameters:
+    - n_scenarios, distributions, base_inputs, seed: See run_simulation.
+
+    Returns:
+    - dict: The metadata stored with the run and matched by stored_simulation.
+    """
+    return {
+        "n_scenarios": n_scenarios,
+        "distributions": distributions,
+        "base_inputs": base_inputs,
+        "seed": seed,
+    }
+
+
+def summarize_run(
+    store,
+    project,
+    run,
+    percentiles=(5, 25, 50, 75, 95),
+    bins=50,
+    sample_size=100_000,
+    seed=0,
+):
+    """
+    Summarize a stored simulation run without evaluating any scenario.
+
+    The run is read batch by batch, so memory is bounded by the store's batch
+    size and sample_size rather than the number of stored scenarios. Means,
+    standard deviations, the probability of loss and the histogram are exact;
+    percentiles are taken from a uniform random sample of at most sample_size
+    scenarios, as in run_simulation.
+
+    Parameters:
+    - store (ResultStore): Store holding the run.
+    - project (str): Key of the project spec.
+    - run (str): Run id.
+    - percentiles (tuple): Percentiles to report.
+    - bins (int): Number of bins of the NPV histogram.
+    - sample_size (int): Number of scenarios retained for percentiles.
+    - seed (int, optional): Seed of the sample.
+
+    Returns:
+    - dict: "n_scenarios", "probability_of_loss" and a summary dict per metric
+      as returned by run_simulation, plus "run" and "histogram", the
+      (counts, edges) of the NPV.
+    """
+    rng = np.random.default_rng(seed)
+    metrics = ("npv", "irr", "payback_period")
+    summaries = {metric: _StreamingSummary() for metric in metrics}
+    sample_keys = np.empty(0)
+    sample = {metric: np.empty(0) for metric in metrics}
+    n_scenarios = losses = 0
+
+    for frame in store.scan(project, columns=list(metrics), runs=[run]):
+        results = {metric: frame[metric].to_numpy(dtype=float) for metric in metrics}
+        n_scenarios += len(frame)
+        losses += np.count_nonzero(results["npv"] < 0)
+        for metric in metrics:
+            summaries[metric].update(results[metric])
+        sample_keys, sample = _update_sample(
+            sample_keys, sample, results, sample_size, rng
+        )
+
+    return {
+        "n_scenarios": n_scenarios,
+        "probability_of_loss": losses / n_scenarios if n_scenarios else np.nan,
+        **{
+            metric: summaries[metric].result(sample[metric], percentiles)
+            for metric in metrics
+        },
+        "run": run,
+        "histogram": store.histogram(project, "npv", bins, runs=[run]),
+    }
+
+
+def stored_simulation(
+    store,
+    project,
+    n_scenarios,
+    distributions,
+    base_inputs=None,
+    seed=0,
+    percentiles=(5, 25, 50, 75, 95),
+):
+    """
+    Read a simulation from the result store, running and storing it only once.
+
+    A run is reused when one was stored with the same scenarios count,
+    distributions, base inputs and seed, so reruns with unchanged inputs
+    neither evaluate nor write any scenario.
+
+    Parameters:
+    - store (ResultStore): Store to read from and write to.
+    - project, n_scenarios, distributions, base_inputs, percentiles: See
+      run_simulation.
+    - seed (int): Seed of the run; required so that runs are reproducible.
+
+    Returns:
+    - dict: See summarize_run.
+    """
+    if seed is None:
+        raise ValueError("stored simulations need a seed to be reused")
+    metadata = simulation_metadata(n_scenarios, distributions, base_inputs, seed)
+    run = store.find_run(project, metadata)
+    if run is None:
+        run = run_simulation(
+            project,
+            n_scenarios,
+            distributions,
+            base_inputs,
+            percentiles=percentiles,
+            seed=seed,
+            store=store,
+        )["run"]
+    return summarize_run(store, project, run, percentiles)
@@ -0,0 +1,229 @@
+import math
+from functools import lru_cache, partial
+from statistics import mean
+
+from util.cache import memoize
+from util.functions import (
+    compute_NPV,
+    compute_IRR_batch,
+    compute_payback_period,
+    compute_ROI_batch,
+    calculate_EAA,
+    profitability_index,
+)
+from util.lazy import LazyGraph
+from util.model_spec import FinancialModel, get_model
+from util.replacement_chain import chain_horizon, chained_npv
+
+PROJECTS = ("planet", "beach")
+
+# Decimal places kept when canonicalizing sidebar inputs into a cache key
+KEY_PRECISION = 10
+
+# Metrics read from the precomputed sensitivity grid of a project when one is built
+GRID_METRICS = ("npv", "irr", "payback_period", "profitability_index", "eaa")
+
+
+def canonicalize_inputs(sidebar_inputs):
+    """
+    Turn the tuple returned by generate_sidebar() into a stable cache key.
+
+    Parameters:
+    - sidebar_inputs (tuple): (planet_investment_amount, tax, patronage_loss,
+      beach_investment_amount, debt, cost_of_equity, interest_rate).
+
+    Returns:
+    - tuple: The same values as rounded Python floats.
+    """
+    return tuple(round(float(value), KEY_PRECISION) for value in sidebar_inputs)
+
+
+def compute_wacc(debt, cost_of_equity, interest_rate, tax):
+    """
+    Compute the weighted average cost of capital.
+
+    Parameters:
+    - debt (float): Debt proportion of the capital structure.
+    - cost_of_equity (float): Cost of equity.
+    - interest_rate (float): Pre-tax cost of debt.
+    - tax (float): Tax rate.
+
+    Returns:
+    - float: WACC.
+    """
+    return (1 - debt) * cost_of_equity + debt * interest_rate * (1 - tax)
+
+
+def _grid_metric(project, metric, lookup):
+    value = lookup[project][metric]
+    # Like compute_payback_period, a payback that is never reached is None
+    if metric == "payback_period" and math.isnan(value):
+        return None
+    return value
+
+
+def _add_project(graph, project, investment, tax, patronage_loss, from_grid=False):
+    inputs = dict(investment=investment, tax=tax, patronage_loss=patronage_loss)
+    lifespan = get_model(project).lifespan
+
+    def node(name, func, *dependencies):
+        graph.add((project, name), func, *dependencies)
+
+    # The statement is evaluated once into an array; DataFrames are only
+    # built for the views that display them
+    node("model", lambda: get_model(project).build(**inputs))
+    model = (project, "model")
+    node("df", FinancialModel.to_dataframe, model)
+    node("df_transposed", FinancialModel.to_statement, model)
+    node("cash_flow", lambda financials: financials.cash_flows, model)
+    cash_flow = (project, "cash_flow")
+    if from_grid:
+        # Interpolated from the grid, so the statement is only built for the
+        # views that display it
+        for metric in GRID_METRICS:
+            node(metric, partial(_grid_metric, project, metric), "grid")
+    else:
+        _add_model_metrics(node, project, lifespan)
+    node(
+        "discounted_payback_period",
+        lambda cf, wacc: compute_payback_period(
+            cf, wacc, fractional=True, validate=False
+        ),
+        cash_flow,
+        "wacc",
+    )
+    node(
+        "roi_each_year",
+        lambda cf: compute_ROI_batch([cf], validate=False)[0][0].tolist(),
+        cash_flow,
+    )
+    node("mean_roi", mean, (project, "roi_each_year"))
+    node(
+        "npv_lcm",
+        lambda cf, duration, wacc: float(chained_npv([cf], wacc, duration)[1][0]),
+        cash_flow,
+        "lcm_duration",
+        "wacc",
+    )
+    graph.add(project, lambda: graph.view(project))
+
+
+def _add_model_metrics(node, project, lifespan):
+    cash_flow = (project, "cash_flow")
+    # The model's cash flows are already clean floats, so checks are skipped
+    node(
+        "npv", lambda cf, wacc: compute_NPV(cf, wacc, validate=False), cash_flow, "wacc"
+    )
+    # NaN when the cash flows have no IRR, e.g. no inflows at a 100% tax rate
+    node(
+        "irr",
+        lambda cf: float(compute_IRR_batch([cf], validate=False)[0][0]),
+        cash_flow,
+    )
+    node(
+        "payback_period",
+        lambda cf: compute_payback_period(cf, fractional=True, validate=False),
+        cash_flow,
+    )
+    node(
+        "eaa",
+        lambda npv, wacc: calculate_EAA(npv, wacc, lifespan),
+        (project, "npv"),
+        "wacc",
+    )
+    node("profitability_index", profitability_index, cash_flow, "wacc")
+
+
+@lru_cache(maxsize=None)
+def sensitivity_grids():
+    """
+    Open the sensitivity grids built with `python -m util.sensitivity_grid`.
+
+    Grids are memory-mapped, so opening them reads no values. A project
+    without a built grid is valued through its model.
+
+    Returns:
+    - dict: Project key -> SensitivityGrid; empty when no grid is built.
+    """
+    # util.sensitivity_grid imports compute_wacc from this module
+    from util.sensitivity_grid import load_grids
+
+    return load_grids()
+
+
+@memoize(maxsize=256, ttl=3600)
+def _compute_valuation(canonical_inputs):
+    (
+        planet_investment_amount,
+        tax,
+        patronage_loss,
+        beach_investment_amount,
+        debt,
+        cost_of_equity,
+        interest_rate,
+    ) = canonical_inputs
+    graph = LazyGraph()
+    graph.add("wacc", lambda: compute_wacc(debt, cost_of_equity, interest_rate, tax))
+    graph.add(
+        "lcm_duration",
+        lambda: chain_horizon(get_model(project).lifespan for project in PROJECTS),
+    )
+    grids = sensitivity_grids()
+    if grids:
+        from util.sensitivity_grid import lookup_sidebar
+
+        graph.add("grid", lambda: lookup_sidebar(grids, canonical_inputs))
+    _add_project(
+        graph,
+        "planet",
+        planet_investment_amount,
+        tax,
+        patronage_loss,
+        from_grid="planet" in grids,
+    )
+    _add_project(
+        graph,
+        "beach",
+        beach_investment_amount,
+        tax,
+        patronage_loss,
+        from_grid="beach" in grids,
+    )
+    return graph
+
+
+def get_valuation(sidebar_inputs):
+    """
+    Return the financial statements and metrics of both projects.
+
+    The results form a LazyGraph: each value is computed when a page first
+    reads it, together with what it depends on, and then kept. Graphs are
+    shared across pages and sessions and keyed on the canonicalized sidebar
+    inputs, so a rerun with unchanged inputs does no model work and a page
+    only pays for the values it displays. The returned values are shared and
+    must not be modified in place. "irr" is NaN when the cash flows have no
+    IRR and "payback_period" None when the investment is never recovered.
+    When the sensitivity grids are built, the NPV, IRR, payback period,
+    profitability index and EAA are interpolated from them instead of
+    computed from the statement.
+
+    Parameters:
+    - sidebar_inputs (tuple): The tuple returned by generate_sidebar().
+
+    Returns:
+    - LazyGraph: "wacc", "lcm_duration" and, under "planet" and "beach", the
+      project's "model", "df", "df_transposed", "cash_flow", "npv", "irr",
+      "payback_period", "discounted_payback_period", "roi_each_year",
+      "mean_roi", "eaa", "profitability_index" and "npv_lcm".
+    """
+    return _compute_valuation(canonicalize_inputs(sidebar_inputs))
+
+
+def cache_stats():
+    """
+    Report hit/miss counters of the valuation cache.
+
+    Returns:
+    - dict: See LRUCache.stats.
+    """
+    return _compute_valuation.cache.stats()
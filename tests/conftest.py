@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The app imports its helpers as `util.*` from the src directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
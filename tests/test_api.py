@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+from api import app
+from fastapi.testclient import TestClient
+from util.functions import compute_NPV, compute_XIRR, extend_cashflows_for_LCM
+
+CASH_FLOWS = [[-1000, 300, 400, 500], [-700, 450, 450]]
+
+
+@pytest.fixture(scope="module")
+def client():
+    return TestClient(app)
+
+
+def test_health(client):
+    assert client.get("/health").json() == {"status": "ok"}
+
+
+def test_npv_is_projects_by_rates(client):
+    response = client.post(
+        "/npv", json={"cash_flows": CASH_FLOWS, "discount_rates": [0.05, 0.1]}
+    )
+    assert response.status_code == 200
+    expected = [[compute_NPV(cf, r) for r in (0.05, 0.1)] for cf in CASH_FLOWS]
+    np.testing.assert_allclose(response.json()["npv"], expected)
+
+
+def test_flat_curves_match_flat_rates(client):
+    curves = [{"tenors": [1, 10], "rates": [0.1, 0.1]}]
+    by_curve = client.post(
+        "/npv/curves", json={"cash_flows": CASH_FLOWS, "curves": curves}
+    )
+    by_rate = client.post(
+        "/npv", json={"cash_flows": CASH_FLOWS, "discount_rates": [0.1]}
+    )
+    np.testing.assert_allclose(by_curve.json()["npv"], by_rate.json()["npv"])
+
+
+def test_missing_irr_is_null(client):
+    response = client.post("/irr", json={"cash_flows": [[-100, 60, 60], [100, 50]]})
+    body = response.json()
+    assert body["irr"][0] == pytest.approx(0.130662, abs=1e-6)
+    assert body["irr"][1] is None
+    assert body["converged"] == [True, False]
+    assert body["multiple_irr"] == [False, False]
+
+
+def test_xirr_matches_single_series(client):
+    cash_flows = [-10000, 2750, 4250, 3250, 2750]
+    dates = ["2008-01-01", "2008-03-01", "2008-10-30", "2009-02-15", "2009-04-01"]
+    response = client.post("/xirr", json={"cash_flows": [cash_flows], "dates": [dates]})
+    assert response.json()["irr"][0] == pytest.approx(compute_XIRR(cash_flows, dates))
+
+
+def test_payback_and_eaa(client):
+    payback = client.post("/payback", json={"cash_flows": CASH_FLOWS}).json()
+    assert payback["payback_period"] == [3.0, 2.0]
+
+    eaa = client.post(
+        "/eaa", json={"npv": [100.0, 200.0], "discount_rate": 0.1, "lifespans": [3, 2]}
+    ).json()["eaa"]
+    annuities = [sum(1.1**-t for t in range(1, n + 1)) for n in (3, 2)]
+    np.testing.assert_allclose(np.multiply(eaa, annuities), [100.0, 200.0])
+
+
+def test_lcm_repeats_each_project_to_the_common_horizon(client):
+    response = client.post(
+        "/lcm", json={"cash_flows": CASH_FLOWS, "discount_rates": [0.1]}
+    ).json()
+    assert response["lcm_duration"] == 6
+    expected = [compute_NPV(extend_cashflows_for_LCM(cf, 6), 0.1) for cf in CASH_FLOWS]
+    np.testing.assert_allclose(np.ravel(response["npv"]), expected)
+
+
+def test_portfolio_respects_budget_and_groups(client):
+    body = {
+        "cash_flows": [[-100, 80, 80], [-100, 70, 70], [-50, 40, 40]],
+        "discount_rates": [0.1],
+        "budget": 150,
+        "groups": ["site", "site", None],
+    }
+    response = client.post("/portfolio", json=body).json()
+    assert response["selected"] == [0, 2]
+    assert response["total_cost"] == 150
+    assert response["optimal"]
+
+
+def test_invalid_input_is_a_client_error(client):
+    mismatched = client.post(
+        "/xirr", json={"cash_flows": [[-100, 110]], "dates": [["2020-01-01"]]}
+    )
+    assert mismatched.status_code == 400
+    empty = client.post("/npv", json={"cash_flows": [[]], "discount_rates": [0.1]})
+    assert empty.status_code == 422
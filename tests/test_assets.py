@@ -0,0 +1,26 @@
+import json
+
+import pytest
+from util import assets
+
+
+@pytest.fixture
+def assets_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(assets, "ASSETS_DIR", tmp_path)
+    monkeypatch.setattr(assets, "_loaded", {})
+    return tmp_path
+
+
+def test_load_lottie_reads_fetched_animation(assets_dir):
+    (assets_dir / "lottie").mkdir()
+    (assets_dir / "lottie" / "home.json").write_text(json.dumps({"v": "5.7.4"}))
+    assert assets.load_lottie("home") == {"v": "5.7.4"}
+
+
+def test_load_lottie_never_downloads(assets_dir, monkeypatch):
+    def download(name, timeout):
+        raise AssertionError("load_lottie must not download")
+
+    monkeypatch.setattr(assets, "_download", download)
+    assert assets.load_lottie("home") is None
+    assert not (assets_dir / "lottie").exists()
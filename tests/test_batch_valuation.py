@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+from batch_valuation import complete_projects, run, value_projects
+from util.functions import compute_IRR, compute_NPV
+
+CASH_FLOWS = {
+    "a": [-1000, 300, 400, 500],
+    "b": [-700, 450, 450],
+    "c": [-1500, 300, 400, 500, 600, 200],
+    "d": [-400, 100, 150, 200, 250],
+}
+COLUMNS = {"id": "project_id", "period": "period", "amount": "amount"}
+
+
+def long_format(cash_flows):
+    return pd.DataFrame(
+        [
+            {"project_id": project, "period": period, "amount": amount}
+            for project, series in cash_flows.items()
+            for period, amount in enumerate(series)
+        ]
+    )
+
+
+def test_value_projects_matches_single_series():
+    results = value_projects(long_format(CASH_FLOWS), COLUMNS, 0.1)
+    assert results["project_id"].tolist() == list(CASH_FLOWS)
+    np.testing.assert_allclose(
+        results["npv"], [compute_NPV(cf, 0.1) for cf in CASH_FLOWS.values()]
+    )
+    np.testing.assert_allclose(
+        results["irr"], [compute_IRR(cf) for cf in CASH_FLOWS.values()]
+    )
+    assert not results["missing_amounts"].any()
+
+
+def test_missing_amount_flags_only_its_project():
+    rows = long_format(CASH_FLOWS)
+    rows.loc[(rows["project_id"] == "b") & (rows["period"] == 1), "amount"] = np.nan
+    results = value_projects(rows, COLUMNS, 0.1).set_index("project_id")
+    assert results["missing_amounts"].tolist() == [False, True, False, False]
+    assert results.loc["b", ["npv", "irr", "payback_period"]].isna().all()
+    assert results.loc["a", "npv"] == pytest.approx(compute_NPV(CASH_FLOWS["a"], 0.1))
+
+
+def test_complete_projects_never_splits_a_project():
+    rows = long_format(CASH_FLOWS)
+    chunks = [rows.iloc[start : start + 4] for start in range(0, len(rows), 4)]
+    regrouped = list(complete_projects(chunks, "project_id"))
+    assert pd.concat(regrouped, ignore_index=True).equals(rows)
+    seen = [set(chunk["project_id"]) for chunk in regrouped]
+    for i, ids in enumerate(seen):
+        assert not ids & set().union(*seen[:i])
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".parquet"])
+def test_run_in_small_chunks_matches_one_chunk(tmp_path, suffix):
+    rows = long_format(CASH_FLOWS)
+    rows["rate"] = rows["project_id"].map({"a": 0.05, "b": 0.1, "c": 0.08, "d": 0.12})
+    input_path = tmp_path / f"cash_flows{suffix}"
+    if suffix == ".csv":
+        rows.to_csv(input_path, index=False)
+    else:
+        rows.to_parquet(input_path, index=False)
+
+    columns = {**COLUMNS, "rate": "rate"}
+    output_path = tmp_path / f"results{suffix}"
+    assert run(input_path, output_path, columns=columns, chunk_size=3) == 4
+    read = pd.read_csv if suffix == ".csv" else pd.read_parquet
+    expected = value_projects(rows, columns)
+    pd.testing.assert_frame_equal(read(output_path), expected, check_dtype=False)
+
+
+def test_run_requires_a_rate(tmp_path):
+    with pytest.raises(ValueError):
+        run(tmp_path / "in.csv", tmp_path / "out.csv")
@@ -0,0 +1,73 @@
+import pytest
+from util.cache import LRUCache, memoize
+from util.valuation import cache_stats, canonicalize_inputs, get_valuation
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert (stats["hits"], stats["misses"]) == (3, 1)
+    assert stats["size"] == 2
+
+
+def test_entries_expire_after_ttl():
+    timer = FakeTimer()
+    cache = LRUCache(maxsize=4, ttl=10, timer=timer)
+    cache.put("a", 1)
+    timer.now = 10
+    assert cache.get("a") == 1
+    timer.now = 10.5
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_get_or_compute_computes_on_miss_only():
+    cache = LRUCache()
+    calls = []
+    for _ in range(3):
+        assert cache.get_or_compute("key", lambda: calls.append(1) or 42) == 42
+    assert calls == [1]
+
+
+def test_memoize_keys_on_positional_arguments():
+    calls = []
+
+    @memoize(maxsize=8)
+    def square(x):
+        calls.append(x)
+        return x * x
+
+    assert [square(3), square(3), square(4)] == [9, 9, 16]
+    assert calls == [3, 4]
+    assert square.cache.stats()["hits"] == 1
+
+
+def test_maxsize_must_be_positive():
+    with pytest.raises(ValueError):
+        LRUCache(maxsize=0)
+
+
+def test_equivalent_sidebar_inputs_share_one_valuation():
+    inputs = (770000, 0.3, 0.25, 800000, 0.25, 0.12, 0.1)
+    assert canonicalize_inputs(inputs) == canonicalize_inputs(
+        (770000.0, 0.30000000000000004, 0.25, 800000, 0.25, 0.12, 0.1)
+    )
+    before = cache_stats()["hits"]
+    first = get_valuation(inputs)
+    assert get_valuation(tuple(map(float, inputs))) is first
+    assert cache_stats()["hits"] >= before + 1
@@ -0,0 +1,74 @@
+import itertools
+
+import numpy as np
+import pytest
+from util.capital_budgeting import efficient_frontier, select_projects
+
+
+def brute_force(npv, cost, budget, groups=None, requires=None):
+    best = 0.0
+    for selected in itertools.product([False, True], repeat=len(npv)):
+        selected = np.array(selected)
+        if cost[selected].sum() > budget:
+            continue
+        if groups is not None:
+            labels = [g for g, s in zip(groups, selected) if s and g is not None]
+            if len(labels) != len(set(labels)):
+                continue
+        if requires and any(
+            selected[i] and not selected[list(needed)].all()
+            for i, needed in requires.items()
+        ):
+            continue
+        best = max(best, npv[selected].sum())
+    return best
+
+
+def random_portfolio(seed, n_projects=10):
+    rng = np.random.default_rng(seed)
+    npv = rng.normal(20.0, 30.0, n_projects)
+    cost = rng.integers(1, 40, n_projects).astype(float)
+    groups = [f"site {i // 3}" if i < 6 else None for i in range(n_projects)]
+    return npv, cost, groups
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_dp_and_milp_match_brute_force(seed):
+    npv, cost, groups = random_portfolio(seed)
+    budget = float(cost.sum() // 3)
+    expected = brute_force(npv, cost, budget, groups)
+
+    for method in ("dp", "milp"):
+        result = select_projects(npv, cost, budget, groups, method=method)
+        assert result["method"] == method
+        assert result["npv"] == pytest.approx(expected, abs=1e-6)
+        assert result["cost"] <= budget
+        assert npv[result["selected"]].sum() == pytest.approx(result["npv"])
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_dependencies_match_brute_force(seed):
+    npv, cost, groups = random_portfolio(seed)
+    requires = {6: [7], 8: [7, 9]}
+    budget = float(cost.sum() // 2)
+    result = select_projects(npv, cost, budget, groups, requires)
+
+    assert result["method"] == "milp"
+    assert result["npv"] == pytest.approx(
+        brute_force(npv, cost, budget, groups, requires), abs=1e-6
+    )
+
+
+def test_frontier_matches_single_selections():
+    npv, cost, groups = random_portfolio(0)
+    budgets = [0.0, 25.0, 50.0, 100.0]
+    frontier = efficient_frontier(npv, cost, budgets, groups)
+
+    expected = [select_projects(npv, cost, b, groups)["npv"] for b in budgets]
+    np.testing.assert_allclose(frontier["npv"], expected)
+    assert frontier["npv"].is_monotonic_increasing
+
+
+def test_rejects_negative_costs():
+    with pytest.raises(ValueError):
+        select_projects([1.0, 2.0], [-1.0, 1.0], 5.0)
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+from numpy.testing import assert_allclose
+from util.curves import YieldCurve
+from util.functions import Validator, compute_NPV
+
+CASH_FLOWS = [-1000.0, 300.0, 400.0, 500.0, 200.0]
+
+
+def test_flat_curve_matches_scalar_rate():
+    curve = YieldCurve([1.0, 10.0], [0.08, 0.08])
+    assert compute_NPV(CASH_FLOWS, curve) == pytest.approx(
+        compute_NPV(CASH_FLOWS, 0.08), rel=1e-12
+    )
+
+
+def test_period_rates_compound_one_period_at_a_time():
+    period_rates = [0.05, 0.06, 0.07, 0.08]
+    curve = YieldCurve.from_period_rates(period_rates)
+    expected = np.concatenate([[1.0], np.cumprod(1 / (1 + np.array(period_rates)))])
+    assert_allclose(curve.factors(5), expected, rtol=1e-12)
+    assert compute_NPV(CASH_FLOWS, curve) == pytest.approx(
+        compute_NPV(CASH_FLOWS, period_rates), rel=1e-12
+    )
+
+
+def test_interpolation_between_tenors():
+    linear = YieldCurve([1.0, 3.0], [0.04, 0.06])
+    assert linear.zero_rates(2.0) == pytest.approx(0.05)
+    # Outside the tenors the nearest rate is kept
+    assert_allclose(linear.zero_rates([0.5, 5.0]), [0.04, 0.06])
+
+    flat_forward = YieldCurve([1.0, 3.0], [0.04, 0.06], interpolation="log_discount")
+    forward = (flat_forward.discount(1.0) / flat_forward.discount(3.0)) ** 0.5
+    assert flat_forward.discount(1.0) / flat_forward.discount(2.0) == pytest.approx(
+        forward
+    )
+
+
+def test_factors_are_shared_and_read_only():
+    curve = YieldCurve([1.0, 5.0], [0.03, 0.05])
+    factors = curve.factors(3)
+    assert_allclose(curve.factors(6)[:3], factors)
+    assert_allclose(curve.factors(6), curve.discount(np.arange(6.0)))
+    with pytest.raises(ValueError):
+        factors[0] = 2.0
+
+
+@pytest.mark.parametrize(
+    "tenors, rates",
+    [([1.0, 2.0], [0.05]), ([2.0, 1.0], [0.05, 0.06]), ([1.0, 2.0], [0.05, -1.0])],
+)
+def test_invalid_curves_are_rejected(tenors, rates):
+    with pytest.raises(ValueError):
+        YieldCurve(tenors, rates)
+
+
+@pytest.mark.parametrize(
+    "discount_rate", [0.09, -0.02, 1.5, np.float64(0.1), [0.05, -0.5], (0.1, 2.0)]
+)
+def test_rates_above_minus_one_are_valid(discount_rate):
+    Validator.validate_discount_rate(discount_rate)
+
+
+@pytest.mark.parametrize(
+    "discount_rate",
+    [-1.0, -2, np.nan, np.inf, [0.05, -1.0], [0.05, np.nan], "0.1", None, True],
+)
+def test_scalar_and_vector_rates_follow_the_same_rule(discount_rate):
+    with pytest.raises(ValueError):
+        Validator.validate_discount_rate(discount_rate)
@@ -0,0 +1,206 @@
+import datetime
+
+import numpy as np
+import pytest
+from scipy.optimize import brentq
+from util.create_df import normalize_values
+from util.functions import (
+    calculate_EAA,
+    compute_IRR,
+    compute_IRR_batch,
+    compute_NPV,
+    compute_NPV_batch,
+    compute_XIRR,
+    compute_XIRR_batch,
+    compute_XNPV,
+    compute_XNPV_batch,
+    compute_payback_period,
+    compute_payback_period_batch,
+    discount_table,
+    period_times,
+)
+from util.valuation import _compute_valuation, canonicalize_inputs
+
+# Example of the Excel XIRR and XNPV documentation
+EXCEL_CASH_FLOWS = [-10000, 2750, 4250, 3250, 2750]
+EXCEL_DATES = [
+    datetime.date(2008, 1, 1),
+    datetime.date(2008, 3, 1),
+    datetime.date(2008, 10, 30),
+    datetime.date(2009, 2, 15),
+    datetime.date(2009, 4, 1),
+]
+
+
+def npv_reference(cash_flows, rate):
+    return sum(cf / (1 + rate) ** t for t, cf in enumerate(cash_flows))
+
+
+def conventional_cash_flows(n_projects, n_periods, seed=0):
+    rng = np.random.default_rng(seed)
+    inflows = rng.uniform(100.0, 400.0, size=(n_projects, n_periods))
+    investment = -inflows.sum(axis=1, keepdims=True) * rng.uniform(0.3, 0.9)
+    return np.hstack([investment, inflows])
+
+
+def test_npv_matches_discounting_formula():
+    cash_flows = [-1000, 300, 400, 500, 200]
+    assert compute_NPV(cash_flows, 0.08) == pytest.approx(
+        npv_reference(cash_flows, 0.08), rel=1e-12
+    )
+
+
+def test_npv_batch_is_projects_by_rates():
+    cash_flows = conventional_cash_flows(5, 8)
+    rates = [0.0, 0.05, 0.12]
+    expected = [[npv_reference(cf, r) for r in rates] for cf in cash_flows]
+    np.testing.assert_allclose(compute_NPV_batch(cash_flows, rates), expected)
+
+
+def test_npv_batch_of_padded_series_matches_single_series():
+    cash_flows = [[-100, 60, 60], [-100, 30, 30, 30, 30]]
+    npv = compute_NPV_batch(cash_flows, [0.1])[:, 0]
+    np.testing.assert_allclose(npv, [compute_NPV(cf, 0.1) for cf in cash_flows])
+
+
+def test_irr_matches_brentq():
+    cash_flows = conventional_cash_flows(50, 12)
+    irr, converged, n_roots = compute_IRR_batch(cash_flows)
+
+    expected = [brentq(lambda r: npv_reference(cf, r), -0.99, 10) for cf in cash_flows]
+    assert converged.all()
+    np.testing.assert_array_equal(n_roots, 1)
+    np.testing.assert_allclose(irr, expected, rtol=1e-9)
+
+
+def test_irr_of_padded_series_matches_single_series():
+    cash_flows = [[-100, 60, 60], [-100, 30, 30, 30, 30]]
+    irr, _, _ = compute_IRR_batch(cash_flows)
+    assert irr.tolist() == [compute_IRR(cf) for cf in cash_flows]
+
+
+def test_irr_flags_multiple_roots():
+    # -100 + 230 / (1 + r) - 132 / (1 + r)^2 is zero at 10% and at 20%
+    irr, converged, n_roots = compute_IRR_batch([[-100, 230, -132]])
+    assert converged[0]
+    assert n_roots[0] == 2
+    assert irr[0] == pytest.approx(0.1, abs=1e-9)
+
+
+def test_irr_without_root_is_nan():
+    irr, converged, n_roots = compute_IRR_batch([[100, 50, 25]])
+    assert not converged[0]
+    assert n_roots[0] == 0
+    assert np.isnan(irr[0])
+    with pytest.raises(RuntimeError):
+        compute_IRR([100, 50, 25])
+
+
+@pytest.mark.parametrize("tax, patronage_loss", [(1.0, 0.25), (0.3, 1.0)])
+def test_valuation_without_irr_is_nan(tax, patronage_loss):
+    # A 100% tax rate leaves Beach no inflows; a full patronage loss leaves
+    # neither project one
+    graph = _compute_valuation.__wrapped__(
+        canonicalize_inputs((770000, tax, patronage_loss, 800000, 0.25, 0.12, 0.1))
+    )
+    assert np.isnan(graph["beach"]["irr"])
+    assert graph["beach"]["payback_period"] is None
+
+
+def test_normalize_values_without_irr_or_payback():
+    df = normalize_values(1.0, 2.0, np.nan, 0.2, None, 3.0, 0.1, 0.2)
+    assert np.isnan(df["IRR"][0]) and df["IRR"][1] == 1.0
+    assert df["Payback"].tolist() == [0.0, 1.0]
+
+
+@pytest.mark.parametrize("rate", [0.0, 1e-12, 0.07, np.array([0.03, 0.07])])
+def test_eaa_annuity_recovers_npv(rate):
+    npv, n = 1000.0, 7
+    eaa = calculate_EAA(npv, rate, n)
+    annuity = sum((1 + np.asarray(rate)) ** -t for t in range(1, n + 1))
+    np.testing.assert_allclose(eaa * annuity, npv, rtol=1e-9)
+
+
+def test_discount_tables_are_shared_and_read_only():
+    table = discount_table(0.07, 10)
+    assert discount_table(0.07, 12) is table
+    np.testing.assert_allclose(table.factors(11), 1.07 ** -np.arange(11.0))
+    assert table.annuity(10) == pytest.approx(table.factors(11)[1:].sum())
+    with pytest.raises(ValueError):
+        table.factors(11)[0] = 2.0
+
+
+def test_payback_period():
+    cash_flows = [-1000, 300, 400, 500]
+    assert compute_payback_period(cash_flows) == 3
+    assert compute_payback_period(cash_flows, fractional=True) == pytest.approx(2.6)
+    assert compute_payback_period([-1000, 100, 100]) is None
+
+
+def test_payback_batch_matches_single_series():
+    cash_flows = [[-1000, 300, 400, 500], [-1000, 100, 100], [-500, 600]]
+    for discount_rate in (None, 0.1):
+        for fractional in (False, True):
+            batch = compute_payback_period_batch(
+                cash_flows, discount_rates=discount_rate, fractional=fractional
+            )
+            single = [
+                compute_payback_period(cf, discount_rate, fractional=fractional)
+                for cf in cash_flows
+            ]
+            np.testing.assert_allclose(
+                batch, [np.nan if p is None else p for p in single]
+            )
+
+
+def test_discounted_payback_discounts_before_accumulating():
+    # Discounted at 10%, the inflows are worth 500, 500 and 500
+    inflows = [550, 605, 665.5]
+    assert compute_payback_period([-1000, *inflows], 0.1) == 2
+    payback = compute_payback_period([-1200, *inflows], 0.1, fractional=True)
+    assert payback == pytest.approx(2.4)
+
+
+def test_xnpv_and_xirr_match_excel():
+    assert compute_XNPV(EXCEL_CASH_FLOWS, EXCEL_DATES, 0.09) == pytest.approx(
+        2086.647602, abs=1e-6
+    )
+    # Excel reports the rate rounded to nine decimals
+    assert compute_XIRR(EXCEL_CASH_FLOWS, EXCEL_DATES) == pytest.approx(
+        0.373362535, abs=1e-8
+    )
+
+
+def test_xirr_zeroes_xnpv():
+    xirr = compute_XIRR(EXCEL_CASH_FLOWS, EXCEL_DATES)
+    assert compute_XNPV(EXCEL_CASH_FLOWS, EXCEL_DATES, xirr) == pytest.approx(
+        0.0, abs=1e-6
+    )
+
+
+def test_xirr_batch_of_series_with_different_dates():
+    dates = [EXCEL_DATES, EXCEL_DATES[:3]]
+    cash_flows = [EXCEL_CASH_FLOWS, [-10000, 2750, 9000]]
+    xirr, converged, _ = compute_XIRR_batch(cash_flows, dates)
+    assert converged.all()
+    assert xirr[0] == pytest.approx(compute_XIRR(EXCEL_CASH_FLOWS, EXCEL_DATES))
+    assert xirr[1] == pytest.approx(compute_XIRR(cash_flows[1], EXCEL_DATES[:3]))
+
+
+def test_annual_period_times_match_npv():
+    cash_flows = conventional_cash_flows(4, 6)
+    times = period_times(cash_flows.shape[1])
+    np.testing.assert_allclose(
+        compute_XNPV_batch(cash_flows, times, [0.1]),
+        compute_NPV_batch(cash_flows, [0.1]),
+    )
+
+
+def test_mid_period_convention_shifts_inflows_half_a_period():
+    np.testing.assert_allclose(period_times(3, convention="mid"), [0.0, 0.5, 1.5])
+    np.testing.assert_allclose(period_times(3, 12), [0.0, 1 / 12, 2 / 12])
+    cash_flows = [[-100.0, 60.0, 60.0]]
+    mid = compute_XNPV_batch(cash_flows, period_times(3, convention="mid"), 0.1)
+    end = compute_NPV_batch(cash_flows, 0.1)
+    # Every inflow arrives half a year earlier
+    assert mid[0, 0] + 100 == pytest.approx((end[0, 0] + 100) * 1.1**0.5)
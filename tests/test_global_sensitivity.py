@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+from util.global_sensitivity import _sobol_estimates, saltelli_sample, sobol_indices
+
+# Ishigami function with a = 7 and b = 0.1, whose Sobol indices are known
+# analytically (Sobol' and Levitan, 1999)
+ISHIGAMI_S1 = [0.3139, 0.4424, 0.0]
+ISHIGAMI_ST = [0.5576, 0.4424, 0.2437]
+
+
+def ishigami(x):
+    return (
+        np.sin(x[..., 0])
+        + 7 * np.sin(x[..., 1]) ** 2
+        + 0.1 * x[..., 2] ** 4 * np.sin(x[..., 0])
+    )
+
+
+def test_estimators_recover_ishigami_indices():
+    ranges = {name: (-np.pi, np.pi) for name in ("x1", "x2", "x3")}
+    A, B, AB = saltelli_sample(ranges, 2**15, seed=0)
+    first_order, total_effect = _sobol_estimates(ishigami(A), ishigami(B), ishigami(AB))
+
+    np.testing.assert_allclose(first_order, ISHIGAMI_S1, atol=0.02)
+    np.testing.assert_allclose(total_effect, ISHIGAMI_ST, atol=0.02)
+
+
+def test_saltelli_sample_shapes_and_ranges():
+    ranges = {"a": (0.0, 1.0), "b": (10.0, 20.0)}
+    A, B, AB = saltelli_sample(ranges, 100, seed=0)
+    assert A.shape == B.shape == (128, 2)
+    assert AB.shape == (2, 128, 2)
+    np.testing.assert_array_equal(AB[0][:, 0], B[:, 0])
+    np.testing.assert_array_equal(AB[0][:, 1], A[:, 1])
+    assert (A[:, 1] >= 10).all() and (A[:, 1] <= 20).all()
+
+
+def test_single_factor_explains_all_variance():
+    result = sobol_indices(
+        "planet", {"wacc": (0.08, 0.13)}, n_samples=2**10, n_resamples=50, workers=1
+    )
+    indices = result["indices"].iloc[0]
+    assert indices["factor"] == "wacc"
+    assert indices["S1"] == pytest.approx(1.0, abs=0.02)
+    assert indices["ST"] == pytest.approx(1.0, abs=0.02)
+    assert indices["S1_low"] <= indices["S1"] <= indices["S1_high"]
+    assert result["n_evaluations"] == 2**10 * 3
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+from util.create_df import compute_financials, transpose_and_format
+from util.functions import (
+    compute_IRR,
+    compute_NPV,
+    compute_payback_period,
+    profitability_index,
+)
+from util.incremental import IncrementalValuation, statement_edits
+
+RATE = 0.09
+
+
+def assert_matches_recompute(valuation):
+    cash_flows = valuation.cash_flows
+    assert valuation.npv == pytest.approx(compute_NPV(cash_flows, RATE), rel=1e-10)
+    assert valuation.irr == pytest.approx(compute_IRR(cash_flows), abs=1e-9)
+    assert valuation.profitability_index == pytest.approx(
+        profitability_index(cash_flows, RATE), rel=1e-10
+    )
+    assert valuation.payback_period == pytest.approx(
+        compute_payback_period(cash_flows, fractional=True)
+    )
+
+
+def test_updates_match_full_recompute():
+    rng = np.random.default_rng(0)
+    cash_flows = [-5000.0, *rng.uniform(500, 1500, 10)]
+    valuation = IncrementalValuation(cash_flows, RATE)
+    assert_matches_recompute(valuation)
+
+    for _ in range(50):
+        period = int(rng.integers(0, len(cash_flows)))
+        value = -rng.uniform(3000, 8000) if period == 0 else rng.uniform(0, 2000)
+        valuation.update(period, value)
+        assert_matches_recompute(valuation)
+
+
+def test_set_cash_flows_matches_full_recompute():
+    valuation = IncrementalValuation([-1000, 300, 300, 300, 300], RATE)
+    valuation.set_cash_flows([-1200, 300, 500, 300, 100])
+    assert valuation.cash_flows == [-1200, 300, 500, 300, 100]
+    assert_matches_recompute(valuation)
+
+    with pytest.raises(ValueError):
+        valuation.set_cash_flows([-1000, 300])
+
+
+def test_payback_is_none_until_recovered():
+    valuation = IncrementalValuation([-1000, 100, 100], RATE)
+    assert valuation.payback_period is None
+    valuation.update(2, 950)
+    assert valuation.payback_period == pytest.approx(1 + 900 / 950)
+
+
+def test_statement_edits_ignore_columns_added_by_the_grid():
+    original = transpose_and_format(compute_financials("planet", tax=0.3))
+    edited = original.copy()
+    edited["::auto_unique_id::"] = [str(i) for i in range(len(edited))]
+    base = statement_edits("planet", original, original, 0.3)
+    np.testing.assert_allclose(statement_edits("planet", original, edited, 0.3), base)
+
+    # An edited operating cash flow cell is used as is
+    row = edited.index[edited["Category"] == "Operating Cash Flow"][0]
+    edited.loc[row, "Year 2"] = 12345.0
+    cash_flows = statement_edits("planet", original, edited, 0.3)
+    assert cash_flows[2] == 12345.0
+    np.testing.assert_allclose(np.delete(cash_flows, 2), np.delete(base, 2))
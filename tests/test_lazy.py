@@ -0,0 +1,80 @@
+import threading
+
+import pytest
+from util.lazy import LazyGraph
+
+
+def counting_graph():
+    calls = []
+
+    def node(name, value):
+        def func(*dependencies):
+            calls.append(name)
+            return value + sum(dependencies)
+
+        return func
+
+    graph = LazyGraph()
+    graph.add("a", node("a", 1))
+    graph.add("b", node("b", 10), "a")
+    graph.add("c", node("c", 100), "a", "b")
+    graph.add("unused", node("unused", 1000))
+    return graph, calls
+
+
+def test_nodes_are_computed_on_first_access_only():
+    graph, calls = counting_graph()
+    assert calls == []
+
+    assert graph["c"] == 100 + 1 + 11
+    assert graph["c"] == 112
+    assert graph["b"] == 11
+    assert calls == ["a", "b", "c"]
+    assert graph.evaluated() == ["a", "b", "c"]
+
+
+def test_add_rejects_redefinitions_and_unknown_dependencies():
+    graph, _ = counting_graph()
+    with pytest.raises(ValueError):
+        graph.add("a", lambda: 0)
+    with pytest.raises(KeyError):
+        graph.add("d", lambda x: x, "missing")
+    with pytest.raises(KeyError):
+        graph["missing"]
+
+
+def test_view_exposes_prefixed_nodes():
+    graph = LazyGraph()
+    graph.add(("planet", "npv"), lambda: 1.0)
+    graph.add(("planet", "irr"), lambda: 0.1)
+    graph.add(("beach", "npv"), lambda: 2.0)
+    graph.add("wacc", lambda: 0.09)
+
+    planet = graph.view("planet")
+    assert list(planet) == ["npv", "irr"]
+    assert len(planet) == 2
+    assert "irr" in planet and "eaa" not in planet
+    assert planet["npv"] == 1.0
+    assert graph.evaluated() == [("planet", "npv")]
+
+
+def test_shared_graph_computes_each_node_once():
+    calls = []
+    barrier = threading.Barrier(8)
+
+    def slow():
+        calls.append(1)
+        return 42
+
+    graph = LazyGraph().add("value", slow)
+
+    def read():
+        barrier.wait()
+        assert graph["value"] == 42
+
+    threads = [threading.Thread(target=read) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert calls == [1]
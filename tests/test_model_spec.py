@@ -0,0 +1,156 @@
+import numpy as np
+import pandas as pd
+import pytest
+from util.create_df import (
+    compute_financials_beach,
+    compute_financials_planet,
+    transpose_and_format,
+)
+from util.model_spec import FinancialModel, get_model
+
+INPUTS = [(770000, 0.3), (500000, 0.0), (1200000, 0.45)]
+
+
+def baseline_planet(investment, tax):
+    # The statement as it was built before the models moved to JSON specs
+    df = pd.DataFrame(
+        {
+            "Year": [0, 1, 2, 3, 4],
+            "Initial Investment": [-investment, 0, 0, 0, 0],
+            "Net Room Revenue": [0, 13200000, 13464000, 14137000, 14844000],
+            "Rental Revenue": [0, *[170000 * 12] * 2, *[170000 * 1.05 * 12] * 2],
+            "25% Patronage Rate": [0, 1650000, 1683000, 1767125, 1855500],
+            "Repair/Maintenance Cost": [0, *[10000] * 4],
+            "Depreciation": [0, *[investment / 4] * 4],
+        }
+    )
+    df["EBT"] = (
+        df["Rental Revenue"]
+        - df["Repair/Maintenance Cost"]
+        - df["Depreciation"]
+        - df["25% Patronage Rate"]
+    )
+    df["Net Income"] = df["EBT"] * (1 - tax)
+    df["Operating Cash Flow"] = df["Net Income"] + df["Depreciation"]
+    return df
+
+
+def baseline_beach(investment, tax):
+    df = pd.DataFrame(
+        {
+            "Year": [0, 1, 2, 3, 4, 5, 6],
+            "Initial Investment (Renovation & Capital)": [
+                -investment - 900000,
+                *[0] * 6,
+            ],
+            "Net Room Revenue": [
+                0,
+                *[13200000, 13464000, 14137000, 14844000, 15140000, 15443000],
+            ],
+            "Sales Revenue": [
+                0,
+                *[4672000, 4905600, 5150880, 5408424, 5678845, 5962787.46],
+            ],
+            "25% Patronage Rate": [
+                0,
+                *[1650000, 1683000, 1767125, 1855500, 1892500, 1930375],
+            ],
+            "Food & Beverage Cost": [
+                0,
+                *[1168000, 1226400, 1287720, 1352106, 1419711.3, 1490696.87],
+            ],
+            "Other Expenses": [
+                0,
+                *[1027840, 1079232, 1133192.6, 1189853.3, 1249345.9, 1311813.24],
+            ],
+            "Repair/Maintenance": [0, *[10000] * 6],
+            "Depreciation": [0, *[(investment + 900000) / 6] * 6],
+        }
+    )
+    df["EBT"] = (
+        df["Sales Revenue"]
+        - df["Food & Beverage Cost"]
+        - df["Other Expenses"]
+        - df["25% Patronage Rate"]
+        - df["Repair/Maintenance"]
+        - df["Depreciation"]
+    )
+    df["Net Income"] = df["EBT"] * (1 - tax)
+    df["Capital Expenditure"] = df["Depreciation"]
+    df["Operating Cash Flow"] = (
+        df["Net Income"] + df["Depreciation"] - df["Capital Expenditure"]
+    )
+    return df
+
+
+@pytest.mark.parametrize("investment, tax", INPUTS)
+def test_planet_statement_matches_baseline(investment, tax):
+    pd.testing.assert_frame_equal(
+        compute_financials_planet(investment, tax),
+        baseline_planet(investment, tax),
+        check_dtype=False,
+    )
+
+
+@pytest.mark.parametrize("investment, tax", INPUTS)
+def test_beach_statement_matches_baseline(investment, tax):
+    # F&B cost and other expenses are now exact shares of sales; the old
+    # hard-coded values were rounded, and one was off by one baht
+    pd.testing.assert_frame_equal(
+        compute_financials_beach(investment, tax),
+        baseline_beach(investment, tax),
+        check_dtype=False,
+        check_exact=False,
+        atol=1.0,
+        rtol=0,
+    )
+
+
+@pytest.mark.parametrize("project", ["planet", "beach"])
+def test_batched_cash_flows_match_single_statements(project):
+    model = get_model(project)
+    scenarios = {
+        "investment": np.array([500000.0, 800000.0, 1100000.0]),
+        "tax": np.array([0.2, 0.3, 0.4]),
+        "patronage_loss": np.array([0.1, 0.25, 0.5]),
+    }
+    batch = model.cash_flows(**scenarios)
+    for i, row in enumerate(batch):
+        df = model.to_dataframe(**{name: v[i] for name, v in scenarios.items()})
+        assert row[0] == df[model.investment_name].iloc[0]
+        np.testing.assert_allclose(row[1:], df["Operating Cash Flow"].iloc[1:])
+
+
+def test_unknown_inputs_are_rejected():
+    with pytest.raises(ValueError):
+        get_model("planet").cash_flows(growth=0.1)
+
+
+@pytest.mark.parametrize("project", ["planet", "beach"])
+def test_financial_model_matches_its_dataframe(project):
+    model = get_model(project).build(investment=900000, tax=0.25)
+    df = model.to_dataframe()
+    assert model.n_years == len(df)
+    for label in model.labels:
+        np.testing.assert_array_equal(model[label], df[label])
+    np.testing.assert_array_equal(
+        model.to_statement().iloc[:, 1:].to_numpy(dtype=float),
+        transpose_and_format(df).iloc[:, 1:].to_numpy(dtype=float),
+    )
+    assert model.to_statement()["Category"].tolist() == list(model.labels)
+
+
+def test_financial_model_rows_are_read_only_views():
+    model = get_model("beach").build(investment=800000, tax=0.3)
+    assert np.shares_memory(model.cash_flows, model.values)
+    assert model.cash_flows[0] == model["Initial Investment (Renovation & Capital)"][0]
+    np.testing.assert_array_equal(
+        model.operating_cash_flow, model["Operating Cash Flow"][1:]
+    )
+    with pytest.raises(ValueError):
+        model.cash_flows[0] = 0.0
+
+
+def test_financial_model_needs_a_cash_flow_row():
+    with pytest.raises(ValueError):
+        FinancialModel("planet", ["EBT"], np.zeros((1, 5)))
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+from util.functions import compute_NPV, extend_cashflows_for_LCM
+from util.replacement_chain import chained_npv, compare_with_eaa
+
+CASH_FLOWS = [
+    [-1000, 400, 500, 300],
+    [-700, 450, 450],
+    [-1500, 300, 400, 500, 600, 200],
+]
+
+
+def repeated(cash_flows, horizon):
+    # Every cycle pays the investment again at the end of the previous one
+    lifespan = len(cash_flows) - 1
+    series = np.zeros(horizon + 1)
+    for start in range(0, horizon, lifespan):
+        series[start : start + lifespan + 1] += cash_flows
+    return series
+
+
+@pytest.mark.parametrize("rate", [0.0, 0.08])
+def test_chain_npv_matches_repeated_series(rate):
+    horizon, npv = chained_npv(CASH_FLOWS, rate, reinvest=True)
+    assert horizon == 30
+    expected = [compute_NPV(repeated(cf, horizon), rate) for cf in CASH_FLOWS]
+    np.testing.assert_allclose(npv, expected, rtol=1e-10)
+
+
+def test_chain_without_reinvestment_matches_extended_series():
+    horizon, npv = chained_npv(CASH_FLOWS, 0.08)
+    expected = [
+        compute_NPV(extend_cashflows_for_LCM(cf, horizon), 0.08) for cf in CASH_FLOWS
+    ]
+    np.testing.assert_allclose(npv, expected, rtol=1e-10)
+
+
+@pytest.mark.parametrize("rates", [0.0, 1e-9, 0.08, [0.05, 0.08, 0.12]])
+def test_chain_npv_equals_eaa_annuity(rates):
+    comparison = compare_with_eaa(CASH_FLOWS, rates)
+    assert comparison["consistent"].all()
+    np.testing.assert_allclose(
+        comparison["chain_npv"], comparison["eaa_npv"], rtol=1e-9
+    )
+    # Both methods rank the projects the same way
+    assert comparison["chain_npv"].rank().tolist() == comparison["eaa"].rank().tolist()
@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+from util.result_store import ResultStore
+from util.scenarios import run_scenarios
+from util.simulation import run_simulation, stored_simulation, summarize_run
+
+DISTRIBUTIONS = {"wacc": ("normal", 0.1075, 0.01)}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ResultStore(tmp_path, batch_size=100)
+
+
+def test_round_trip(store):
+    table = {"wacc": np.linspace(0.05, 0.15, 250), "npv": np.arange(250.0)}
+    run = store.append("planet", table, sort_by="wacc", metadata={"seed": 1})
+
+    frame = store.query("planet")
+    np.testing.assert_array_equal(frame["wacc"], table["wacc"])
+    np.testing.assert_array_equal(frame["npv"], table["npv"])
+    assert store.count("planet") == 250
+    assert store.find_run("planet", {"seed": 1}) == run
+    assert store.find_run("planet", {"seed": 2}) is None
+
+
+def test_range_query_matches_filter(store):
+    rng = np.random.default_rng(0)
+    table = {"wacc": rng.uniform(0.05, 0.15, 1000), "npv": rng.normal(0, 1, 1000)}
+    store.append("planet", table, sort_by="wacc")
+
+    frame = store.query("planet", where={"wacc": (0.09, 0.11)}, columns=["npv"])
+    inside = (table["wacc"] >= 0.09) & (table["wacc"] <= 0.11)
+    assert list(frame.columns) == ["npv"]
+    np.testing.assert_array_equal(np.sort(frame["npv"]), np.sort(table["npv"][inside]))
+    assert store.count("planet", where={"wacc": (0.09, 0.11)}) == inside.sum()
+
+
+def test_histogram_counts_every_finite_value(store):
+    values = np.append(np.random.default_rng(0).normal(size=999), np.nan)
+    store.append("planet", {"npv": values})
+
+    counts, edges = store.histogram("planet", "npv", bins=20)
+    expected, _ = np.histogram(values[np.isfinite(values)], edges)
+    np.testing.assert_array_equal(counts, expected)
+
+
+def test_missing_column_reads_as_nan(store):
+    store.append("planet", {"wacc": [0.1, 0.2], "npv": [1.0, 2.0]})
+    store.append("planet", {"wacc": [0.3], "npv": [3.0], "irr": [0.4]})
+
+    frame = store.query("planet", columns=["npv", "irr"]).sort_values("npv")
+    np.testing.assert_array_equal(frame["irr"], [np.nan, np.nan, 0.4])
+    # A range on a missing column matches none of that run's rows
+    frame = store.query("planet", where={"irr": (0, 1)}, columns=["npv"])
+    np.testing.assert_array_equal(frame["npv"], [3.0])
+    counts, _ = store.histogram("planet", "irr", bins=2)
+    assert counts.sum() == 1
+
+
+def test_simulation_and_scenario_runs_share_metric_names(store):
+    simulation = run_simulation("planet", 300, DISTRIBUTIONS, seed=0, store=store)
+    store.append("planet", run_scenarios("planet", {"wacc": [0.08, 0.1]}, workers=1))
+
+    frame = store.query("planet", columns=["payback_period"])
+    assert len(frame) == 302
+    assert frame["payback_period"].notna().all()
+    assert frame["payback_period"].max() <= 4
+    runs = [manifest["run"] for manifest in store.runs("planet")]
+    assert simulation["run"] in runs
+
+
+def test_stored_simulation_is_written_once(store):
+    first = stored_simulation(store, "planet", 1000, DISTRIBUTIONS, seed=3)
+    second = stored_simulation(store, "planet", 1000, DISTRIBUTIONS, seed=3)
+    assert len(store.runs("planet")) == 1
+    assert first["run"] == second["run"]
+
+    direct = run_simulation("planet", 1000, DISTRIBUTIONS, seed=3)
+    assert first["n_scenarios"] == 1000
+    assert first["probability_of_loss"] == direct["probability_of_loss"]
+    assert first["npv"]["mean"] == pytest.approx(direct["npv"]["mean"])
+    assert first["npv"]["std"] == pytest.approx(direct["npv"]["std"])
+    # Runs smaller than the sample give exact percentiles
+    for p, value in direct["npv"]["percentiles"].items():
+        assert first["npv"]["percentiles"][p] == pytest.approx(value)
+    assert first["histogram"][0].sum() == 1000
+
+
+def test_summary_percentiles_come_from_a_bounded_sample(store):
+    run = run_simulation("planet", 5000, DISTRIBUTIONS, seed=0, store=store)["run"]
+    summary = summarize_run(store, "planet", run, sample_size=1000)
+    exact = np.percentile(store.query("planet")["npv"], 50)
+    assert summary["n_scenarios"] == 5000
+    assert summary["npv"]["percentiles"][50] == pytest.approx(exact, rel=0.05)
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+from util.scenarios import map_chunks, run_scenarios, scenario_inputs
+from util.simulation import METRICS, draw_inputs, evaluate_scenarios
+
+OVERRIDES = {"wacc": np.linspace(0.02, 0.2, 23), "tax": np.linspace(0.0, 0.5, 23)}
+
+
+def test_parallel_run_matches_serial():
+    serial = run_scenarios("beach", OVERRIDES, workers=1)
+    parallel = run_scenarios("beach", OVERRIDES, workers=2, chunk_size=5)
+    for name in serial.dtype.names:
+        np.testing.assert_array_equal(serial[name], parallel[name])
+
+
+def test_run_matches_shared_evaluator():
+    table = run_scenarios("planet", [{"wacc": 0.05}, {"wacc": 0.1, "tax": 0.25}])
+    inputs = scenario_inputs("planet", [{"wacc": 0.05}, {"wacc": 0.1, "tax": 0.25}])
+    expected = evaluate_scenarios("planet", inputs)
+    assert table["tax"].tolist() == [inputs["tax"][0], 0.25]
+    for metric in METRICS:
+        np.testing.assert_array_equal(table[metric], expected[metric])
+
+
+def test_evaluator_computes_only_requested_metrics():
+    inputs = draw_inputs("planet", 50, {"wacc": ("uniform", 0.05, 0.15)}, rng=None)
+    full = evaluate_scenarios("planet", inputs)
+    npv_only = evaluate_scenarios("planet", inputs, metrics=("npv",))
+    assert list(npv_only) == ["npv"]
+    np.testing.assert_array_equal(npv_only["npv"], full["npv"])
+
+
+def test_map_chunks_concatenates_dicts_in_order():
+    inputs = {"x": np.arange(10.0)}
+    result = map_chunks(lambda chunk: {"y": chunk["x"] * 2}, inputs, 10, 1, 3)
+    np.testing.assert_array_equal(result["y"], np.arange(10.0) * 2)
+
+
+def test_unknown_input_is_rejected():
+    with pytest.raises(ValueError):
+        scenario_inputs("planet", [{"discount": 0.1}])
@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+from util import valuation
+from util.sensitivity_grid import SensitivityGrid, load_grids, lookup_sidebar
+from util.simulation import METRICS, evaluate_scenarios
+
+AXES = {
+    "planet": {
+        "investment": (770000, 1000000, 3),
+        "tax": (0.0, 1.0, 11),
+        "patronage_loss": (0.0, 1.0, 11),
+    },
+    "beach": {
+        "investment": (800000, 1200000, 3),
+        "tax": (0.0, 1.0, 11),
+        "patronage_loss": (0.0, 1.0, 11),
+    },
+}
+SIDEBAR = (912345.0, 0.27, 0.13, 1012345.0, 0.25, 0.12, 0.1)
+
+
+@pytest.fixture(scope="module")
+def grids(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("grids")
+    for project, axes in AXES.items():
+        SensitivityGrid.build(project, axes, n_check=100).save(directory)
+    return load_grids(directory)
+
+
+def exact(project, investment, tax, patronage_loss, wacc):
+    inputs = dict(
+        investment=[investment], tax=[tax], patronage_loss=[patronage_loss], wacc=[wacc]
+    )
+    metrics = evaluate_scenarios(project, inputs, fractional=True)
+    return {metric: float(values[0]) for metric, values in metrics.items()}
+
+
+@pytest.mark.parametrize(
+    "point",
+    [
+        (800000, 0.3, 0.1, 0.1075),  # between grid points
+        (1000000, 0.0, 1.0, 0.05),  # on the upper edge
+        (1500000, 0.3, 0.1, 0.1075),  # outside, valued through the model
+    ],
+)
+def test_lookup_matches_model(grids, point):
+    looked_up = grids["planet"].lookup(*point)
+    expected = exact("planet", *point)
+    for metric in METRICS:
+        assert looked_up[metric] == pytest.approx(
+            expected[metric], rel=1e-9, nan_ok=True
+        )
+
+
+def test_grid_is_memory_mapped(grids):
+    assert isinstance(grids["beach"].values, np.memmap)
+    assert set(grids["beach"].max_error) <= set(METRICS)
+
+
+def test_lookup_sidebar_skips_projects_without_grid(grids):
+    result = lookup_sidebar({"beach": grids["beach"]}, SIDEBAR)
+    assert set(result) == {"wacc", "beach"}
+    assert result["wacc"] == pytest.approx(0.75 * 0.12 + 0.25 * 0.1 * (1 - 0.27))
+
+
+def test_valuation_reads_metrics_from_grids(grids, monkeypatch):
+    key = valuation.canonicalize_inputs(SIDEBAR)
+    model_graph = valuation._compute_valuation.__wrapped__(key)
+    monkeypatch.setattr(valuation, "sensitivity_grids", lambda: grids)
+    grid_graph = valuation._compute_valuation.__wrapped__(key)
+
+    for project in ("planet", "beach"):
+        for metric in valuation.GRID_METRICS:
+            assert grid_graph[project][metric] == pytest.approx(
+                model_graph[project][metric], rel=1e-9
+            )
+        # The statement is not built to read the metrics
+        assert (project, "model") not in grid_graph.evaluated()
+
+
+def test_valuation_falls_back_to_model_without_grid(grids, monkeypatch):
+    monkeypatch.setattr(
+        valuation, "sensitivity_grids", lambda: {"beach": grids["beach"]}
+    )
+    graph = valuation._compute_valuation.__wrapped__(
+        valuation.canonicalize_inputs(SIDEBAR)
+    )
+    graph["planet"]["npv"]
+    graph["beach"]["npv"]
+    assert ("planet", "model") in graph.evaluated()
+    assert ("beach", "model") not in graph.evaluated()